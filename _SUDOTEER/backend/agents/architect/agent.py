@@ -1,11 +1,11 @@
 import logging
 import json
 import dspy
-import asyncio
 from typing import Any, Dict, List, Optional
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.protocol import A2AMessage
 from backend.core.memory.dspy_signatures import ArchitectPlan
+from backend.core.llm.gateway import inference_gateway
 
 logger = logging.getLogger("_SUDOTEER")
 
@@ -16,12 +16,12 @@ class ArchitectAgent(BaseAgent):
 
 	USES DSPY: ChainOfThought with ArchitectPlan signature for structured planning.
 	"""
+	# DSPy Module - ChainOfThought for architectural planning
+	planner = lazy_module(lambda self: dspy.ChainOfThought(ArchitectPlan))
+
 	def __init__(self, agent_id: str = "architect_01", role: str = "Architect"):
 		super().__init__(agent_id, role)
 
-		# DSPy Module - ChainOfThought for architectural planning
-		self.planner = dspy.ChainOfThought(ArchitectPlan)
-
 	async def forward(self, goal: str, constraints: str = None) -> Dict[str, Any]:
 		"""
 		Create architectural plan using DSPy.
@@ -37,7 +37,7 @@ class ArchitectAgent(BaseAgent):
 			constraints = "Budget: 2 hours, Tech: Python+DSPy+FastAPI, Quality: Production-ready"
 
 		# DSPy Planning
-		plan_result = await asyncio.to_thread(
+		plan_result = await inference_gateway.offload(
 			self.planner,
 			goal=goal,
 			constraints=constraints
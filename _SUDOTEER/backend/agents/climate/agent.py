@@ -32,19 +32,20 @@ class ClimateAgent(BaseAgent):
         vpd = latent.get("vpd", 1.0)
 
         # Calculate Transpiration Potential (TP)
-        # Using mock light if not in raw data (should be in raw from sensory_engine)
-        light = data.get("raw", {}).get("lux", [15000])[-1]
+        # Using mock light if the sensory engine has no lux channel
+        light = data.get("stats", {}).get("lux", {}).get("last", 15000)
         tp = (vpd * light) / 1000.0
 
         # LOGIC: Preemptive Fan Control (The Discovery Plan)
+        # Submitted, not awaited: the bus delivers the next frame only after this returns
         from backend.core.industrial_bridge import industrial_bridge
 
         if tp > self.tp_threshold_high:
             logger.info(f"[{self.agent_id}] High TP Detected ({tp:.2f}). Preemptive Cooling/Airflow: ON")
-            await industrial_bridge.write_setpoint("fan", True)
+            industrial_bridge.submit_setpoint("fan", True)
         elif tp < self.tp_threshold_low:
             logger.info(f"[{self.agent_id}] Low TP Detected ({tp:.2f}). Conservation Mode: fan OFF")
-            await industrial_bridge.write_setpoint("fan", False)
+            industrial_bridge.submit_setpoint("fan", False)
 
     async def handle_request(self, message: A2AMessage):
         # Handle manual override requests or goal changes
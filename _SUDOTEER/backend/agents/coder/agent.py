@@ -1,11 +1,12 @@
 import logging
 import json
 import dspy
-import asyncio
 from typing import Dict, Any, Union, Optional, List
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.protocol import A2AMessage
 from backend.core.memory.dspy_signatures import GenerateCode
+from backend.core.llm.router import route
+from backend.core.llm.gateway import inference_gateway
 
 from .rules import CodingRulesEngine
 from .validator import CodeValidator
@@ -19,14 +20,14 @@ class CoderAgent(BaseAgent):
 
 	USES DSPY: ChainOfThought with GenerateCode signature for structured code generation.
 	"""
+	# DSPy Module - ChainOfThought for code generation
+	code_generator = lazy_module(lambda self: dspy.ChainOfThought(GenerateCode))
+
 	def __init__(self, agent_id: str = "coder_01", role: str = "Coder"):
 		super().__init__(agent_id, role)
 		self.rules_engine = CodingRulesEngine()
 		self.validator = CodeValidator()
 
-		# DSPy Module - ChainOfThought for code generation
-		self.code_generator = dspy.ChainOfThought(GenerateCode)
-
 	async def forward(self, task: Union[str, Dict[str, Any]], architecture_plan: str = None) -> Dict[str, Any]:
 		"""
 		Generate production-quality code using DSPy with memory-enhanced learning.
@@ -51,12 +52,13 @@ class CoderAgent(BaseAgent):
 		context = await self.get_context(task_desc, extra_context=str(past_lessons))
 
 		# 3. GENERATION - DSPy Code Generation
-		code_result = await asyncio.to_thread(
-			self.code_generator,
-			task_description=task_desc,
-			architecture_plan=architecture_plan,
-			context=context
-		)
+		with route(GenerateCode):
+			code_result = await inference_gateway.offload(
+				self.code_generator,
+				task_description=task_desc,
+				architecture_plan=architecture_plan,
+				context=context
+			)
 
 		# Log DSPy reasoning
 		self.log_interaction(
@@ -1,7 +1,7 @@
 import logging
 import dspy
 from typing import Dict, Any, Union, Optional
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.memory.dspy_signatures import ManageCropCycle
 
 logger = logging.getLogger("_SUDOTEER")
@@ -12,12 +12,12 @@ class CropAgent(BaseAgent):
 	Manages the overall crop lifecycle and milestones.
 	Uses DSPy to track progress and predict harvest.
 	"""
+	# DSPy Modules
+	cycle_manager = lazy_module(lambda self: dspy.ChainOfThought(ManageCropCycle))
+
 	def __init__(self, agent_id: str = "crop_01", role: str = "Crop Cycle Manager"):
 		super().__init__(agent_id, role)
 
-		# DSPy Modules
-		self.cycle_manager = dspy.ChainOfThought(ManageCropCycle)
-
 	async def forward(self, crop_data: Dict[str, Any], env_history: str = "") -> Dict[str, Any]:
 		"""
 		Reasoning path for crop management.
@@ -1,10 +1,10 @@
 import logging
 import dspy
-import asyncio
 from typing import Dict, Any, Union, Optional
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.protocol import A2AMessage
 from backend.core.memory.dspy_signatures import GenerateDocumentation
+from backend.core.llm.gateway import inference_gateway, LLMPriority
 
 from .generator import DocGenerator
 
@@ -17,13 +17,13 @@ class DocumenterAgent(BaseAgent):
 
 	USES DSPY: ChainOfThought with GenerateDocumentation signature.
 	"""
+	# DSPy Module
+	doc_generator = lazy_module(lambda self: dspy.ChainOfThought(GenerateDocumentation))
+
 	def __init__(self, agent_id: str = "documenter_01", role: str = "Documenter"):
 		super().__init__(agent_id, role)
 		self.generator = DocGenerator()
 
-		# DSPy Module
-		self.doc_generator = dspy.ChainOfThought(GenerateDocumentation)
-
 	async def forward(self, bundle: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
 		"""
 		Reasoning path for documentation generation.
@@ -40,13 +40,14 @@ class DocumenterAgent(BaseAgent):
 
 		self.log_interaction("Analyzing code and architecture context for documentation", event_type="thought")
 
-		# 1. DSPy Documentation Generation
-		result = await asyncio.to_thread(
-			self.doc_generator,
-			code=code,
-			architecture=architecture,
-			test_results=test_results
-		)
+		# 1. DSPy Documentation Generation (bulk priority on the inference gateway)
+		with inference_gateway.priority(LLMPriority.BULK):
+			result = await inference_gateway.offload(
+				self.doc_generator,
+				code=code,
+				architecture=architecture,
+				test_results=test_results
+			)
 
 		# 2. Apply JSDoc standards using local utility
 		enriched_code = self.generator.apply_jsdoc(code)
@@ -34,7 +34,7 @@ class NutrientAgent(BaseAgent):
             logger.info(f"[{self.agent_id}] pH Low ({current_ph}). Dosing base...")
             # Trigger hardware
             from backend.core.industrial_bridge import industrial_bridge
-            await industrial_bridge.write_actuator("ph_up", True)
+            await industrial_bridge.write_setpoint("ph_up", True)
 
     def handle_intent(self, intent_data: dict):
         action = intent_data.get("action")
@@ -31,7 +31,10 @@ class SeekerAgent(BaseAgent):
 			}
 		else:
 			self.log_interaction("No local nodes found. Searching wider network...", event_type="thought")
-			# Wider scan placeholder
+			nodes = await llm_seeker.scan_network()
+			if nodes:
+				self.log_interaction(f"Found {len(nodes)} nodes on the network.", event_type="result")
+				return {"status": "connected", "nodes": nodes, "primary_node": nodes[0]["url"]}
 			return {"status": "searching", "nodes": []}
 
 	async def handle_request(self, message: 'A2AMessage') -> Any:
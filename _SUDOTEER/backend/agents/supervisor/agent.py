@@ -1,13 +1,15 @@
 import logging
 import json
 import dspy
+import time
 import asyncio
 from typing import Any, Dict, List, Optional
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.protocol import A2AMessage
 from backend.core.memory.dspy_signatures import (
 	DecomposeUserGoal,
 	RouteToAgent,
+	RouteSubtasks,
 	NarrateResults,
 	RiskAssessment
 )
@@ -15,6 +17,8 @@ from backend.core.agent_challenges import trigger_level_up
 from backend.core.gamification import matryoshka_engine
 from backend.core.memory.dspy_modules.calibration import confidence_monitor
 from backend.core.memory.manager import memory_manager
+from backend.core.llm.gateway import inference_gateway, LLMPriority
+from backend.core.llm.router import route
 
 logger = logging.getLogger("_SUDOTEER")
 
@@ -27,15 +31,18 @@ class SupervisorAgent(BaseAgent):
 
 	USES DSPY: ChainOfThought with typed signatures for reasoning.
 	"""
-	def __init__(self, agent_id: str = "supervisor_01", role: str = "Supervisor"):
+	# DSPy Modules - Using Predict for faster, direct responses
+	decomposer = lazy_module(lambda self: dspy.Predict(DecomposeUserGoal))
+	router = lazy_module(lambda self: dspy.Predict(RouteToAgent))
+	batch_router = lazy_module(lambda self: dspy.Predict(RouteSubtasks))
+	narrator = lazy_module(lambda self: dspy.Predict(NarrateResults))
+	risk_assessor = lazy_module(lambda self: dspy.Predict(RiskAssessment))
+
+	def __init__(self, agent_id: str = "supervisor_01", role: str = "Supervisor", delegation_timeout: float = 120.0, partial_after: float = 15.0):
 		super().__init__(agent_id, role)
 		self.active_delegations: Dict[str, Any] = {}
-
-		# DSPy Modules - Using Predict for faster, direct responses
-		self.decomposer = dspy.Predict(DecomposeUserGoal)
-		self.router = dspy.Predict(RouteToAgent)
-		self.narrator = dspy.Predict(NarrateResults)
-		self.risk_assessor = dspy.Predict(RiskAssessment)
+		self.delegation_timeout = delegation_timeout  # Per-delegation cap (seconds)
+		self.partial_after = partial_after  # Narrate partial results if agents are still busy after this
 
 	async def perform_risk_assessment(self, action: str) -> Dict[str, Any]:
 		"""Mechanical Humility: Hard check before high-stakes actions."""
@@ -43,7 +50,8 @@ class SupervisorAgent(BaseAgent):
 			return {"recommendation": "PROCEED", "risk_score": 0.0}
 
 		context = await self.get_context(action, extra_context=self._get_system_context())
-		result = await asyncio.to_thread(self.risk_assessor, proposed_action=action, context=context)
+		with inference_gateway.priority(LLMPriority.SAFETY), route(RiskAssessment):
+			result = await inference_gateway.offload(self.risk_assessor, proposed_action=action, context=context)
 
 		score = float(result.risk_score)
 		recommendation = result.recommendation
@@ -59,7 +67,7 @@ class SupervisorAgent(BaseAgent):
 	async def forward(self, user_goal: str) -> Dict[str, Any]:
 		"""
 		Main reasoning path for the Supervisor using DSPy.
-		1. Check for DIRECT COMMANDS first (instant response)
+		1. Check for DIRECT COMMANDS first (instant response), then admission
 		2. Risk Assessment (Human Gavel)
 		3. Calibration (Ambiguity Check)
 		4. Decompose & Route
@@ -71,6 +79,13 @@ class SupervisorAgent(BaseAgent):
 		if direct_result:
 			return direct_result
 
+		# Admission: an overloaded agency answers now instead of queueing LLM work
+		from backend.core.orchestrator import orchestrator
+		blocked = orchestrator.admission_block()
+		if blocked:
+			self.log_interaction(f"Deferring mission, agency busy: {blocked}", event_type="observation")
+			return {"status": "busy", "reason": blocked, "load": orchestrator.get_load()}
+
 		# 1. Risk Assessment (Level 2+)
 		assessment = await self.perform_risk_assessment(user_goal)
 		if assessment["recommendation"] == "PAUSE":
@@ -84,7 +99,8 @@ class SupervisorAgent(BaseAgent):
 		# 2. Confidence Calibration (Level 3+)
 		if matryoshka_engine.check_unlocked("confidence_calibration", self.agent_id):
 			context = await self.get_context(user_goal, extra_context=self._get_system_context())
-			draft = await asyncio.to_thread(self.decomposer, user_goal=user_goal, context=context)
+			with inference_gateway.priority(LLMPriority.INTERACTIVE):
+				draft = await inference_gateway.offload(self.decomposer, user_goal=user_goal, context=context)
 
 			calibration = await confidence_monitor.verify_plan(user_goal, str(draft.subtasks))
 			if not calibration["is_confident"]:
@@ -98,11 +114,12 @@ class SupervisorAgent(BaseAgent):
 		# 3. Standard DSPy Decomposition with Context Sandwich
 		context = await self.get_context(user_goal, extra_context=self._get_system_context())
 
-		decompose_result = await asyncio.to_thread(
-			self.decomposer,
-			user_goal=user_goal,
-			context=context
-		)
+		with inference_gateway.priority(LLMPriority.INTERACTIVE), route(DecomposeUserGoal):
+			decompose_result = await inference_gateway.offload(
+				self.decomposer,
+				user_goal=user_goal,
+				context=context
+			)
 
 		subtasks = decompose_result.subtasks if isinstance(decompose_result.subtasks, list) else [decompose_result.subtasks]
 		self.log_interaction(
@@ -113,19 +130,16 @@ class SupervisorAgent(BaseAgent):
 		# Step 4: DSPy Routing
 		delegation_plan = await self._dspy_route_tasks(subtasks)
 
-		# Step 5: Execute delegations
-		results = {}
-		for agent_id, task_data in delegation_plan.items():
-			self.log_interaction(f"Delegating to {agent_id}", event_type="action")
-			result = await self.send_a2a(agent_id, task_data, message_type="request")
-			results[agent_id] = result
+		# Step 5: Execute delegations (independent ones concurrently)
+		results = await self._execute_delegations(delegation_plan)
 
-		# Step 6: DSPy Narration
-		narrative_result = await asyncio.to_thread(
-			self.narrator,
-			original_goal=user_goal,
-			agent_results=json.dumps(results, indent=2)
-		)
+		# Step 6: DSPy Narration (bulk work: yields to safety/interactive calls)
+		with inference_gateway.priority(LLMPriority.BULK):
+			narrative_result = await inference_gateway.offload(
+				self.narrator,
+				original_goal=user_goal,
+				agent_results=json.dumps(results, indent=2)
+			)
 
 		self.log_interaction(f"Supervision complete.", event_type="observation")
 
@@ -133,7 +147,8 @@ class SupervisorAgent(BaseAgent):
 		await memory_manager.sifter_session_end(self.agent_id)
 
 		# Mastery Loop: Trigger Level Up challenge if mission complete
-		final_status = "complete"
+		failed = [a for a, r in results.items() if isinstance(r, dict) and r.get("status") in ("timeout", "error")]
+		final_status = "partial" if failed else "complete"
 		await trigger_level_up(self.agent_id)
 
 		return {
@@ -173,50 +188,154 @@ class SupervisorAgent(BaseAgent):
 	async def _dspy_route_tasks(self, subtasks: List[str]) -> Dict[str, Any]:
 		"""
 		Use DSPy to intelligently route subtasks to agents.
-		This replaces the hardcoded keyword matching with LLM reasoning.
+		All subtasks go out in one batched prompt (with dependency hints); if the
+		batch answer is unusable, each subtask is routed individually, concurrently.
 		"""
-		plan = {}
 		available_agents_json = self._get_system_context()
 
-		for subtask in subtasks:
-			try:
-				# DSPy decides the routing
-				route_result = await asyncio.to_thread(
+		assignments = await self._batch_route(subtasks, available_agents_json)
+		if assignments is None:
+			routed = await asyncio.gather(*(self._route_one(s, available_agents_json) for s in subtasks))
+			assignments = [(agent_id, []) for agent_id in routed]
+
+		plan = {}
+		for subtask, (agent_id, _) in zip(subtasks, assignments):
+			if agent_id not in plan:
+				plan[agent_id] = {"goals": []}
+			plan[agent_id]["goals"].append(subtask)
+
+		# Lift subtask dependencies to agents. Only edges pointing at an agent that
+		# appears earlier in the plan are kept, so the delegation graph stays acyclic.
+		order = list(plan)
+		for agent_id, deps in assignments:
+			for dep_index in deps:
+				dep_agent = assignments[dep_index][0]
+				if dep_agent != agent_id and order.index(dep_agent) < order.index(agent_id):
+					needs = plan[agent_id].setdefault("depends_on", [])
+					if dep_agent not in needs:
+						needs.append(dep_agent)
+
+		return plan
+
+	async def _batch_route(self, subtasks: List[str], available_agents_json: str) -> Optional[List[tuple]]:
+		"""Route every subtask with a single LLM call. Returns [(agent_id, depends_on)] or None."""
+		try:
+			with inference_gateway.priority(LLMPriority.INTERACTIVE):
+				result = await inference_gateway.offload(
+					self.batch_router,
+					subtasks=[f"{i}. {s}" for i, s in enumerate(subtasks)],
+					available_agents=available_agents_json
+				)
+			agent_ids = list(result.agent_ids)
+			depends_on = list(getattr(result, "depends_on", None) or [])
+		except Exception as e:
+			logger.warning(f"Batched routing failed, routing per subtask: {e}")
+			return None
+
+		if len(agent_ids) != len(subtasks) or not all(isinstance(a, str) and a for a in agent_ids):
+			logger.warning("Batched routing returned a mismatched plan, routing per subtask.")
+			return None
+
+		assignments = []
+		for i, agent_id in enumerate(agent_ids):
+			deps = depends_on[i] if i < len(depends_on) and isinstance(depends_on[i], list) else []
+			# Dependency hints may only point backwards
+			deps = sorted({d for d in deps if isinstance(d, int) and 0 <= d < i})
+			assignments.append((agent_id.strip(), deps))
+			self.log_interaction(f"Routed '{subtasks[i]}' -> {agent_id}" + (f" (after {deps})" if deps else ""), event_type="thought")
+		return assignments
+
+	async def _route_one(self, subtask: str, available_agents_json: str) -> str:
+		"""Route a single subtask with the per-subtask router."""
+		try:
+			# DSPy decides the routing (user-facing: ahead of normal and bulk calls)
+			with inference_gateway.priority(LLMPriority.INTERACTIVE):
+				route_result = await inference_gateway.offload(
 					self.router,
 					subtask=subtask,
 					available_agents=available_agents_json
 				)
 
-				# Handle both Prediction objects and raw strings
-				if hasattr(route_result, 'agent_id'):
-					agent_id = route_result.agent_id
-					reasoning = getattr(route_result, 'reasoning', 'No reasoning provided')
-				elif isinstance(route_result, str):
-					# Fallback: extract agent from response text
-					agent_id = "nutrient_agent" if "water" in subtask.lower() or "pump" in subtask.lower() else "climate_agent"
-					reasoning = f"Fallback routing (raw response): {route_result[:100]}"
-				else:
-					agent_id = "supervisor_01"
-					reasoning = "Unable to parse routing result"
-
-				self.log_interaction(
-					f"Routed '{subtask}' -> {agent_id}\nReasoning: {reasoning}",
-					event_type="thought"
-				)
+			# Handle both Prediction objects and raw strings
+			if hasattr(route_result, 'agent_id'):
+				agent_id = route_result.agent_id
+				reasoning = getattr(route_result, 'reasoning', 'No reasoning provided')
+			elif isinstance(route_result, str):
+				# Fallback: extract agent from response text
+				agent_id = "nutrient_agent" if "water" in subtask.lower() or "pump" in subtask.lower() else "climate_agent"
+				reasoning = f"Fallback routing (raw response): {route_result[:100]}"
+			else:
+				agent_id = "supervisor_01"
+				reasoning = "Unable to parse routing result"
+
+			self.log_interaction(
+				f"Routed '{subtask}' -> {agent_id}\nReasoning: {reasoning}",
+				event_type="thought"
+			)
+			return agent_id
+
+		except Exception as e:
+			logger.warning(f"Routing failed for '{subtask}': {e}")
+			# Default to supervisor handling
+			return "supervisor_01"
+
+	async def _execute_delegations(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+		"""
+		Run every delegation as soon as the agents it depends on have answered.
+		Each delegation is capped by `delegation_timeout`; if some are still running
+		after `partial_after`, the results so far are narrated to the user.
+		"""
+		results: Dict[str, Any] = {}
+		tasks: Dict[str, asyncio.Task] = {}
 
-				# Store in delegation plan
-				if agent_id not in plan:
-					plan[agent_id] = {"goals": []}
-				plan[agent_id]["goals"].append(subtask)
+		async def delegate(agent_id: str, task_data: Dict[str, Any]):
+			deps = task_data.get("depends_on", [])
+			if deps:
+				await asyncio.gather(*(tasks[d] for d in deps), return_exceptions=True)
+			payload = {k: v for k, v in task_data.items() if k != "depends_on"}
+			if deps:
+				payload["upstream"] = {d: results.get(d) for d in deps}
 
+			self.log_interaction(f"Delegating to {agent_id}", event_type="action")
+			started = time.perf_counter()
+			try:
+				result = await asyncio.wait_for(
+					self.send_a2a(agent_id, payload, message_type="request"),
+					timeout=self.delegation_timeout
+				)
+			except asyncio.TimeoutError:
+				logger.warning(f"Delegation to {agent_id} timed out after {self.delegation_timeout}s")
+				result = {"status": "timeout", "timeout_s": self.delegation_timeout}
 			except Exception as e:
-				logger.warning(f"Routing failed for '{subtask}': {e}")
-				# Default to supervisor handling
-				if "supervisor_01" not in plan:
-					plan["supervisor_01"] = {"goals": []}
-				plan["supervisor_01"]["goals"].append(subtask)
+				logger.warning(f"Delegation to {agent_id} failed: {e}")
+				result = {"status": "error", "error": str(e)}
+			self.active_delegations.pop(agent_id, None)
+			results[agent_id] = result
+			self.log_interaction(f"{agent_id} answered in {time.perf_counter() - started:.1f}s", event_type="observation")
 
-		return plan
+		# Dependencies always name agents earlier in the plan, so their tasks exist first
+		for agent_id, task_data in plan.items():
+			tasks[agent_id] = asyncio.create_task(delegate(agent_id, task_data))
+			self.active_delegations[agent_id] = task_data
+
+		if not tasks:
+			return results
+
+		_, pending = await asyncio.wait(tasks.values(), timeout=self.partial_after)
+		if pending:
+			self._narrate_partial(results, [a for a, t in tasks.items() if t in pending])
+			await asyncio.wait(pending)
+
+		# Keep plan order in the returned results
+		return {agent_id: results.get(agent_id) for agent_id in plan}
+
+	def _narrate_partial(self, results: Dict[str, Any], waiting_on: List[str]):
+		"""Tell the user what is already in while slow agents finish (no LLM call)."""
+		done = ", ".join(results) or "none yet"
+		self.log_interaction(
+			f"Progress: results in from {done}. Still waiting on {', '.join(waiting_on)}.",
+			event_type="observation"
+		)
 
 	async def handle_request(self, message: A2AMessage) -> Any:
 		"""
@@ -1,10 +1,11 @@
 import logging
 import dspy
-import asyncio
 from typing import Dict, Any, Union, Optional
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.protocol import A2AMessage
 from backend.core.memory.dspy_signatures import GenerateTests, ValidateLogic
+from backend.core.llm.router import route
+from backend.core.llm.gateway import inference_gateway
 
 from .generator import TestGenerator
 from .runner import TestRunner
@@ -20,15 +21,15 @@ class TesterAgent(BaseAgent):
 	1. GenerateTests signature to build the test suite.
 	2. ValidateLogic signature to check for edge cases and logical consistency.
 	"""
+	# DSPy Modules
+	test_generator = lazy_module(lambda self: dspy.ChainOfThought(GenerateTests))
+	logic_validator = lazy_module(lambda self: dspy.ChainOfThought(ValidateLogic))
+
 	def __init__(self, agent_id: str = "tester_01", role: str = "Tester"):
 		super().__init__(agent_id, role)
 		self.generator = TestGenerator()
 		self.runner = TestRunner()
 
-		# DSPy Modules
-		self.test_generator = dspy.ChainOfThought(GenerateTests)
-		self.logic_validator = dspy.ChainOfThought(ValidateLogic)
-
 	async def forward(self, code: Union[str, Dict[str, Any]], requirements: str = None) -> Dict[str, Any]:
 		"""
 		Execute the testing reasoning path.
@@ -47,7 +48,8 @@ class TesterAgent(BaseAgent):
 		self.log_interaction(f"Analyzing code for validation: {preview}", event_type="thought")
 
 		# 1. DSPy Test Generation
-		test_result = await asyncio.to_thread(self.test_generator, code=code_str, requirements=requirements)
+		with route(GenerateTests):
+			test_result = await inference_gateway.offload(self.test_generator, code=code_str, requirements=requirements)
 		self.log_interaction("Generated comprehensive test suite with DSPy", event_type="action")
 
 		# 2. Run Tests (Simulated Runner integration)
@@ -55,7 +57,7 @@ class TesterAgent(BaseAgent):
 		report = await self.runner.run_suite(test_result.test_code)
 
 		# 3. DSPy Logic Validation (Deep Reasoning)
-		validation = await asyncio.to_thread(
+		validation = await inference_gateway.offload(
 			self.logic_validator,
 			code=code_str,
 			test_results=f"Pass Status: {report['status']}, Coverage: {report['coverage']}%"
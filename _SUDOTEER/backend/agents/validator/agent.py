@@ -1,10 +1,10 @@
 import logging
 import dspy
-import asyncio
 from typing import Dict, Any, Union, Optional
-from backend.core.agent_base import BaseAgent
+from backend.core.agent_base import BaseAgent, lazy_module
 from backend.core.protocol import A2AMessage
 from backend.core.memory.dspy_signatures import AuditCodeBundle
+from backend.core.llm.gateway import inference_gateway
 
 from .scanner import SecurityScanner
 from .enforcer import StandardsEnforcer
@@ -18,14 +18,14 @@ class ValidatorAgent(BaseAgent):
 
 	USES DSPY: ChainOfThought with AuditCodeBundle signature for the final quality gate.
 	"""
+	# DSPy Module
+	auditor = lazy_module(lambda self: dspy.ChainOfThought(AuditCodeBundle))
+
 	def __init__(self, agent_id: str = "validator_01", role: str = "Validator"):
 		super().__init__(agent_id, role)
 		self.scanner = SecurityScanner()
 		self.enforcer = StandardsEnforcer()
 
-		# DSPy Module
-		self.auditor = dspy.ChainOfThought(AuditCodeBundle)
-
 	async def forward(self, bundle: Dict[str, Any], quality_standards: str = None) -> Dict[str, Any]:
 		"""
 		Perform comprehensive final audit of the implementation package.
@@ -47,7 +47,7 @@ class ValidatorAgent(BaseAgent):
 		violations = self.enforcer.verify(str(code))
 
 		# 3. DSPy Cognitive Audit (The Brain)
-		audit_result = await asyncio.to_thread(
+		audit_result = await inference_gateway.offload(
 			self.auditor,
 			code=str(code),
 			tests=str(tests),
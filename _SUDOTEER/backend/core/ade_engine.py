@@ -1,26 +1,66 @@
 import os
 import json
+import hashlib
 import logging
 import importlib.util
-from typing import Dict, Any, Callable, Optional
+from types import ModuleType
+from typing import Dict, Any, Callable, List
 
 logger = logging.getLogger("_SUDOTEER")
 
+REGISTRY_VERSION = 2
+
+def code_hash(code: str) -> str:
+	return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+class DynamicTool:
+	"""
+	Callable handle for a registered tool. The source is compiled on the first
+	call (not at agent spawn) and resolved through the engine's cache, so every
+	agent shares one module per code version and picks up re-registered code.
+	"""
+	__slots__ = ("tool_id", "engine")
+
+	def __init__(self, tool_id: str, engine: "ADEEngine"):
+		self.tool_id = tool_id
+		self.engine = engine
+
+	def __call__(self, *args, **kwargs):
+		return self.engine.resolve(self.tool_id)(*args, **kwargs)
+
+	def __repr__(self):
+		return f"<DynamicTool {self.tool_id}>"
+
 class ADEEngine:
 	"""
 	Agent Development Environment (ADE) Engine.
 	Allows dynamic creation, registration, and assignment of tools to agents.
+	Tool modules are compiled once per code hash and shared; the registry keeps
+	an index by target agent so assignment does not scan every tool.
 	"""
 	def __init__(self, registry_path: str = "backend/core/tool_registry.json"):
 		self.registry_path = registry_path
+		self._modules: Dict[str, ModuleType] = {}   # code hash -> executed module
+		self._compiled: Dict[str, Callable] = {}    # tool_id -> run() of its current code
+		self.by_agent: Dict[str, List[str]] = {}
+		self.stats = {"compiles": 0, "cache_hits": 0}
 		self.tools: Dict[str, Dict[str, Any]] = self._load_registry()
 
 	def _load_registry(self) -> Dict[str, Any]:
-		"""Load the tool registry from disk."""
+		"""Load the tool registry from disk (flat legacy files are upgraded on the next save)."""
 		if os.path.exists(self.registry_path):
 			try:
 				with open(self.registry_path, 'r') as f:
-					return json.load(f)
+					data = json.load(f)
+				if data.get("version") == REGISTRY_VERSION:
+					tools = data.get("tools", {})
+					self.by_agent = {agent: list(ids) for agent, ids in data.get("by_agent", {}).items()}
+				else:
+					tools = data
+					self.by_agent = self._build_index(tools)
+				for info in tools.values():
+					info.setdefault("code_hash", code_hash(info.get("code", "")))
+				return tools
 			except Exception as e:
 				logger.error(f"Failed to load tool registry: {e}")
 		return {}
@@ -28,7 +68,15 @@ class ADEEngine:
 	def _save_registry(self):
 		"""Save the tool registry to disk."""
 		with open(self.registry_path, 'w') as f:
-			json.dump(self.tools, f, indent='\t')
+			json.dump({"version": REGISTRY_VERSION, "tools": self.tools, "by_agent": self.by_agent}, f, indent='\t')
+
+	@staticmethod
+	def _build_index(tools: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+		index: Dict[str, List[str]] = {}
+		for tool_id, info in tools.items():
+			for agent_id in info.get("metadata", {}).get("target_agents", []):
+				index.setdefault(agent_id, []).append(tool_id)
+		return index
 
 	def register_tool(self, tool_id: str, code: str, metadata: Dict[str, Any]):
 		"""
@@ -38,29 +86,57 @@ class ADEEngine:
 		logger.info(f"Registering dynamic tool: {tool_id}")
 		tool_entry = {
 			"code": code,
+			"code_hash": code_hash(code),
 			"metadata": metadata, # e.g., {"description": "...", "target_agents": ["coder"]}
 			"status": "pending_validation"
 		}
+		old = self.tools.get(tool_id)
 		self.tools[tool_id] = tool_entry
+		self._compiled.pop(tool_id, None)  # Recompiled (or shared by hash) on next call
+		if old is not None and old.get("code_hash") != tool_entry["code_hash"]:
+			if not any(info.get("code_hash") == old.get("code_hash") for info in self.tools.values()):
+				self._modules.pop(old.get("code_hash"), None)
+		self.by_agent = self._build_index(self.tools)
 		self._save_registry()
 
+	def _compile(self, tool_id: str, info: Dict[str, Any]) -> ModuleType:
+		digest = info.get("code_hash") or code_hash(info["code"])
+		module = self._modules.get(digest)
+		if module is not None:
+			self.stats["cache_hits"] += 1
+			return module
+		# Dynamically compile the tool code
+		spec = importlib.util.spec_from_loader(tool_id, loader=None)
+		module = importlib.util.module_from_spec(spec)
+		exec(compile(info["code"], f"<ade:{tool_id}>", "exec"), module.__dict__)
+		self._modules[digest] = module
+		self.stats["compiles"] += 1
+		logger.info(f"Tool {tool_id} compiled ({digest})")
+		return module
+
+	def resolve(self, tool_id: str) -> Callable:
+		"""The tool's run() function, compiling it on first use."""
+		fn = self._compiled.get(tool_id)
+		if fn is not None:
+			return fn
+		info = self.tools.get(tool_id)
+		if info is None:
+			raise KeyError(f"Unknown dynamic tool: {tool_id}")
+		try:
+			module = self._compile(tool_id, info)
+		except Exception as e:
+			logger.error(f"Failed to compile tool {tool_id}: {e}")
+			raise
+		fn = getattr(module, "run", None)
+		if fn is None:
+			raise AttributeError(f"Tool {tool_id} does not define run()")
+		self._compiled[tool_id] = fn
+		return fn
+
 	def get_agent_tools(self, agent_id: str) -> Dict[str, Callable]:
-		"""Compile and return tools assigned to a specific agent."""
-		agent_tools = {}
-		for tool_id, info in self.tools.items():
-			target_agents = info.get("metadata", {}).get("target_agents", [])
-			if agent_id in target_agents or "*" in target_agents:
-				try:
-					# Dynamically compile the tool code
-					spec = importlib.util.spec_from_loader(tool_id, loader=None)
-					module = importlib.util.module_from_spec(spec)
-					exec(info["code"], module.__dict__)
-					if hasattr(module, 'run'):
-						agent_tools[tool_id] = module.run
-						logger.info(f"Tool {tool_id} compiled and assigned to {agent_id}")
-				except Exception as e:
-					logger.error(f"Failed to compile tool {tool_id}: {e}")
-		return agent_tools
+		"""Return tools assigned to a specific agent (compiled lazily on first call)."""
+		tool_ids = self.by_agent.get(agent_id, []) + self.by_agent.get("*", [])
+		return {tool_id: DynamicTool(tool_id, self) for tool_id in tool_ids if tool_id in self.tools}
 
 # Global ADE instance
 ade_engine = ADEEngine()
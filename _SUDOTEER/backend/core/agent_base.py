@@ -3,14 +3,37 @@ import json
 import logging
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import dspy
+from .llm.gateway import inference_gateway
 
 # Delayed imports to avoid circular dependency
 # These will be imported inside methods or after class definition
 
 logger = logging.getLogger("_SUDOTEER")
 
+class lazy_module:
+	"""
+	Class-level attribute that builds a DSPy module on first access and caches it
+	on the instance, so agents that never reason never construct predictors.
+	Assigning the attribute (e.g. a stub in tests) replaces it as usual.
+	Until accessed the module is not in the instance __dict__, which is what
+	DSPy walks; BaseAgent builds the pending ones before it is introspected
+	(named_parameters/named_sub_modules: optimizers, save and load).
+	"""
+	def __init__(self, factory: Callable[[Any], Any]):
+		self.factory = factory
+
+	def __set_name__(self, owner, name):
+		self.name = name
+
+	def __get__(self, instance, owner=None):
+		if instance is None:
+			return self
+		module = self.factory(instance)
+		instance.__dict__[self.name] = module  # Shadows this descriptor from now on
+		return module
+
 class DVRModule(dspy.Module):
 	"""Standardized DURABLE reasoning module for all agents."""
 	def __init__(self, role: str):
@@ -26,16 +49,32 @@ class BaseAgent(dspy.Module):
 	Lean & Durable Base class for all _SUDOTEER agents.
 	Enforces workstation isolation and standardizes communication/memory.
 	"""
+	dvr = lazy_module(lambda self: DVRModule(self.role))
+
 	def __init__(self, agent_id: str, role: str):
 		super().__init__()
 		self.agent_id = agent_id
 		self.role = role
-		self.dvr = DVRModule(role)
 
 		# Workstation Isolation
 		self.workstation_path = f"sandbox/workstations/{agent_id}"
 		os.makedirs(self.workstation_path, exist_ok=True)
 
+	def materialize_modules(self):
+		"""Build every lazy_module not accessed yet."""
+		for klass in type(self).__mro__:
+			for name, attr in vars(klass).items():
+				if isinstance(attr, lazy_module) and name not in self.__dict__:
+					getattr(self, name)
+
+	def named_parameters(self):
+		self.materialize_modules()  # Optimizers and save/load must see every predictor
+		return super().named_parameters()
+
+	def named_sub_modules(self, *args, **kwargs):
+		self.materialize_modules()
+		return super().named_sub_modules(*args, **kwargs)
+
 	def log_interaction(self, message: str, event_type: str = "thought"):
 		"""Standardized logging and monologue recording."""
 		from .monologue import recorder
@@ -85,25 +124,30 @@ class BaseAgent(dspy.Module):
 
 	async def decompose(self, task: str) -> List[str]:
 		context = await self.get_context(task)
-		result = await asyncio.to_thread(self.dvr.decomposer, task=task, role=self.role, context=context)
+		result = await inference_gateway.offload(self.dvr.decomposer, task=task, role=self.role, context=context)
 		self.log_interaction(f"Decomposed task into {len(result.subtasks)} steps", "thought")
 		return result.subtasks
 
 	async def validate(self, requirements: str, result: Any) -> bool:
-		val = await asyncio.to_thread(self.dvr.validator, requirements=requirements, result=str(result))
+		val = await inference_gateway.offload(self.dvr.validator, requirements=requirements, result=str(result))
 		if not val.is_valid:
 			self.log_interaction(f"Validation failed: {val.feedback}", "error")
 		return val.is_valid
 
 	async def recompose(self, original_task: str, subtask_results: List[Dict]) -> str:
-		output = await asyncio.to_thread(self.dvr.recomposer, original_task=original_task, subtask_results=subtask_results)
+		output = await inference_gateway.offload(self.dvr.recomposer, original_task=original_task, subtask_results=subtask_results)
 		return output.final_output
 
-	async def send_a2a(self, to_agent: str, content: Any, message_type: str = "request") -> Any:
+	async def send_a2a(self, to_agent: str, content: Any, message_type: str = "request", timeout: float = None, retries: int = 0, priority: Any = None) -> Any:
 		from .bus import bus
-		from .protocol import A2AMessage
-		msg = A2AMessage(from_agent=self.agent_id, to_agent=to_agent, content=content, message_type=message_type)
-		return await bus.send_request(msg)
+		from .protocol import A2AMessage, MessagePriority
+		msg = A2AMessage(from_agent=self.agent_id, to_agent=to_agent, content=content, message_type=message_type, priority=priority or MessagePriority.NORMAL)
+		return await bus.send_request(msg, timeout=timeout, retries=retries)
+
+	async def escalate(self, reason: str, **details) -> Any:
+		"""Raise an issue with the Supervisor; URGENT, so it jumps every queue."""
+		from .protocol import MessagePriority
+		return await self.send_a2a("supervisor_01", {"escalation": {"reason": reason, **details}}, priority=MessagePriority.URGENT)
 
 	@abstractmethod
 	async def handle_request(self, message: Any) -> Any:
@@ -5,8 +5,8 @@ Handles system initialization, agent registration, and environment setup.
 
 import logging
 import asyncio
-from backend.core.factory import agent_factory
-from backend.core.dspy_config import initialize_dspy
+from backend.core.factory import agent_factory, LazyAgent
+from backend.core.dspy_config import initialize_dspy_async
 from backend.core.memory.vector_db import initialize_vector_db
 from backend.core.industrial_bridge import industrial_bridge
 from backend.core.ui_bridge import ui_bridge
@@ -37,13 +37,24 @@ class SudoBootstrapper:
 		logger.info("Initializing _SUDOTEER Subsystems...")
 
 		# 1. DSPy
-		if not initialize_dspy(auto=True):
+		if not await initialize_dspy_async(auto=True):
 			logger.error("DSPy initialization failed!")
 
+		# 1.1 LLM discovery feeds extra endpoints to the router (periodic, non-blocking)
+		SudoBootstrapper.discover_llm_endpoints()
+
 		# 2. Vector DB
 		if not initialize_vector_db(backend="auto"):
 			logger.warning("Vector DB initialization failed.")
 
+		# 2.1 Sifter fast path (learn from past sift decisions)
+		try:
+			from backend.core.memory.splitter import memory_splitter
+			from backend.core.monologue import recorder
+			memory_splitter.router.train_from_monologues(recorder.base_path)
+		except Exception as e:
+			logger.warning(f"Sifter fast path training skipped: {e}")
+
 		# 3. UI Bridge
 		ui_bridge.start_heartbeat(interval_seconds=2.0)
 
@@ -69,6 +80,16 @@ class SudoBootstrapper:
 
 		logger.info("✓ All Subsystems online.")
 
+	@staticmethod
+	def discover_llm_endpoints():
+		"""Periodically scan for local LLM backends and register them with the DSPy router."""
+		try:
+			from backend.core.llm.seeker import llm_seeker
+			from backend.core.dspy_config import dspy_config
+			llm_seeker.start_periodic(on_update=dspy_config.apply_discovery)
+		except Exception as e:
+			logger.warning(f"LLM discovery skipped: {e}")
+
 	@staticmethod
 	async def setup_constitution(manager):
 		"""
@@ -152,9 +173,12 @@ class SudoBootstrapper:
 			("financial", "financial_01"),
 			("forensic", "forensic_01")
 		]
+		# Reactive agents (initialize() hooks) and the Supervisor (every user goal enters
+		# there) start now; the rest are built on first request and evicted when idle
 		for role, agent_id in baseline_agents:
-			agent = agent_factory.spawn_agent(role, agent_id)
-			if hasattr(agent, "initialize"):
+			agent = agent_factory.spawn_agent(role, agent_id, lazy=role != "supervisor")
+			if not isinstance(agent, LazyAgent) and hasattr(agent, "initialize"):
 				await agent.initialize()
+		agent_factory.start_idle_eviction()
 
 		logger.info("Baseline agency spawned and initialized.")
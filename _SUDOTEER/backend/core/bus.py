@@ -1,29 +1,106 @@
+import os
+import time
+import bisect
 import logging
 import asyncio
-from typing import Dict, List, Any, Callable, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from .protocol import A2AMessage
 from .monologue import recorder
+from .inbox import AgentInbox, AdmissionError, A2ATimeoutError, PRIORITY_RANK, _deadline, _priority
+from .topics import TopicPolicy, TelemetryAggregator, DEFAULT_POLICIES, FULL, SUMMARY, SAMPLED
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Metadata keys understood by send_request
+DEADLINE_KEY = "deadline"  # absolute epoch seconds
+IDEMPOTENCY_KEY = "idempotency_key"
+
+class LatencyHistogram:
+	"""Fixed log-spaced buckets (ms) with count/sum/max; cheap enough to update per request."""
+	BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+	def __init__(self):
+		self.buckets = [0] * (len(self.BOUNDS_MS) + 1)
+		self.count = 0
+		self.total_ms = 0.0
+		self.max_ms = 0.0
+		self.errors = 0
+
+	def observe(self, ms: float, ok: bool = True):
+		self.buckets[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+		self.count += 1
+		self.total_ms += ms
+		self.max_ms = max(self.max_ms, ms)
+		if not ok: self.errors += 1
+
+	def quantile(self, q: float) -> float:
+		"""Upper bound of the bucket holding the q-quantile."""
+		target, seen = q * self.count, 0
+		for i, n in enumerate(self.buckets):
+			seen += n
+			if n and seen >= target:
+				return float(self.BOUNDS_MS[i]) if i < len(self.BOUNDS_MS) else self.max_ms
+		return 0.0
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {
+			"count": self.count,
+			"errors": self.errors,
+			"mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+			"p50_ms": self.quantile(0.5),
+			"p95_ms": self.quantile(0.95),
+			"max_ms": round(self.max_ms, 2),
+			"buckets": dict(zip([f"<={b}" for b in self.BOUNDS_MS] + ["inf"], self.buckets))
+		}
+
 class A2ABus:
 	"""
 	Standardized A2A Communication Bus.
 	Supports peer-to-peer requests, broadcasting, and state synchronization.
-	Every message is logged for forensic auditing and training datasets.
+	Every message is logged for forensic auditing and training datasets; high-rate
+	telemetry topics are summarised instead (see topics.py).
+	Requests are delivered through a per-agent inbox (see inbox.py) as RPCs:
+	correlated by message_id, bounded by a deadline, cancellable, retryable.
 	"""
-	def __init__(self):
+	def __init__(self, default_timeout: float = None):
 		self.subscribers: Dict[str, List[Callable]] = {}
 		self.agent_registry: Dict[str, Any] = {}
+		self.inboxes: Dict[str, AgentInbox] = {}
+		self.default_timeout = default_timeout or float(os.getenv("SUDOTEER_A2A_TIMEOUT", "300"))
+		self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+		self._in_flight: Dict[str, str] = {}  # message_id -> target agent
+		# idempotency key -> in-flight future / completed result
+		self._idempotent: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+		self.idempotency_cache_size = 1024
+		self.topic_policies: Dict[str, TopicPolicy] = dict(DEFAULT_POLICIES)
+		self._policy_cache: Dict[str, TopicPolicy] = {}
+		self._aggregators: Dict[str, TelemetryAggregator] = {}
+		self._published: Dict[str, int] = {}
 
-	def register_agent(self, agent_id: str, agent_instance: Any, capabilities: List[str] = None):
+	def register_agent(self, agent_id: str, agent_instance: Any, capabilities: List[str] = None, workers: int = None, max_depth: int = None):
 		"""Register an agent and its capabilities on the bus."""
 		self.agent_registry[agent_id] = {
 			"instance": agent_instance,
 			"capabilities": capabilities or []
 		}
+		old = self.inboxes.get(agent_id)
+		if old: old.stop()
+		self.inboxes[agent_id] = AgentInbox(agent_id, agent_instance.handle_request, workers=workers, max_depth=max_depth)
 		logger.info(f"Agent {agent_id} registered on A2A Bus with capabilities: {capabilities}")
 
+	def set_workers(self, agent_id: str, workers: int):
+		"""Scale the number of concurrent handlers serving an agent's inbox."""
+		if agent_id in self.inboxes:
+			self.inboxes[agent_id].resize(workers)
+
+	def queue_depth(self) -> int:
+		"""Requests waiting across all inboxes (used for admission control)."""
+		return sum(inbox.depth for inbox in self.inboxes.values())
+
+	def get_inbox_stats(self) -> Dict[str, Dict[str, Any]]:
+		return {agent_id: inbox.get_stats() for agent_id, inbox in self.inboxes.items()}
+
 	async def subscribe(self, topic: str, callback: Callable):
 		"""Subscribe an agent/tool to a data stream or topic."""
 		if topic not in self.subscribers:
@@ -31,10 +108,42 @@ class A2ABus:
 		self.subscribers[topic].append(callback)
 		logger.info(f"Subscription added for topic: {topic}")
 
+	def set_topic_policy(self, topic: str, recording: str = FULL, window_s: float = 1.0, sample_every: int = 10):
+		"""
+		Choose how a topic (or every topic under a prefix ending in '/') is recorded:
+		'full', 'summary' (per-window min/max/mean), 'sampled' (every Nth frame) or 'off'.
+		"""
+		self.flush_telemetry()
+		self.topic_policies[topic] = TopicPolicy(recording, window_s=window_s, sample_every=sample_every)
+		self._policy_cache.clear()
+
+	def topic_policy(self, topic: str) -> TopicPolicy:
+		"""Exact topic match first, then the longest matching prefix."""
+		policy = self._policy_cache.get(topic)
+		if policy is None:
+			policy = self.topic_policies.get(topic)
+			if policy is None:
+				prefixes = [p for p in self.topic_policies if p.endswith("/") and topic.startswith(p)]
+				policy = self.topic_policies[max(prefixes, key=len)] if prefixes else TopicPolicy(FULL)
+			self._policy_cache[topic] = policy
+		return policy
+
 	async def publish(self, topic: str, message_data: Any):
 		"""Publish a message to all subscribers of a topic."""
 		if topic in self.subscribers:
-			logger.info(f"Publishing to topic: {topic} ({len(self.subscribers[topic])} targets)")
+			callbacks = self.subscribers[topic]
+			policy = self.topic_policy(topic)
+
+			if policy.fast_lane:
+				# Telemetry fast lane: no message wrapper, no per-frame log line or recorder write
+				self._record_telemetry(topic, message_data, policy)
+				if len(callbacks) == 1:
+					await callbacks[0](message_data)
+				else:
+					await asyncio.gather(*(callback(message_data) for callback in callbacks))
+				return
+
+			logger.info(f"Publishing to topic: {topic} ({len(callbacks)} targets)")
 
 			# Wrap in a generic message for the recorder if it's raw sensor data
 			if not isinstance(message_data, A2AMessage):
@@ -50,33 +159,154 @@ class A2ABus:
 				metadata={"topic": topic}
 			)
 
-			tasks = [callback(message_data) for callback in self.subscribers[topic]]
+			tasks = [callback(message_data) for callback in callbacks]
 			await asyncio.gather(*tasks)
 
-	async def send_request(self, message: A2AMessage) -> Any:
-		"""Peer-to-peer request between agents."""
+	def _record_telemetry(self, topic: str, frame: Any, policy: TopicPolicy):
+		content = frame.content if isinstance(frame, A2AMessage) else frame
+		if policy.recording == SUMMARY:
+			aggregator = self._aggregators.get(topic)
+			if aggregator is None:
+				aggregator = self._aggregators[topic] = TelemetryAggregator(topic, policy.window_s)
+			now = time.time()
+			aggregator.add(content, now)
+			if aggregator.due(now):
+				self._record_summary(aggregator.flush(now))
+		elif policy.recording == SAMPLED:
+			count = self._published.get(topic, 0)
+			self._published[topic] = count + 1
+			if count % policy.sample_every == 0:
+				recorder.record_event(
+					agent_id="system",
+					role="system",
+					event_type="broadcast",
+					content=content,
+					metadata={"topic": topic, "sampled": f"1/{policy.sample_every}"}
+				)
+
+	def _record_summary(self, summary: Optional[Dict[str, Any]]):
+		if summary:
+			recorder.record_event(
+				agent_id="system",
+				role="system",
+				event_type="telemetry_summary",
+				content=summary["fields"],
+				metadata={"topic": summary["topic"], "frames": summary["frames"], "window_s": summary["window_s"]}
+			)
+
+	def flush_telemetry(self):
+		"""Record the partial summary window of every telemetry topic (e.g. on shutdown)."""
+		for aggregator in self._aggregators.values():
+			self._record_summary(aggregator.flush())
+		self._aggregators.clear()
+
+	async def send_request(self, message: A2AMessage, timeout: float = None, retries: int = 0) -> Any:
+		"""
+		Peer-to-peer request between agents.
+		Each attempt gets `timeout` seconds (default SUDOTEER_A2A_TIMEOUT), capped by
+		metadata["deadline"] and by the deadline of the request being handled.
+		Timeouts and full inboxes are retried `retries` times with backoff.
+		Requests sharing metadata["idempotency_key"] execute once; later calls
+		get the same result.
+		"""
 		if not message.validate():
 			logger.error(f"Invalid A2A message format from {message.from_agent}")
 			return None
 
 		target_agent = message.to_agent
-		if target_agent in self.agent_registry:
-			logger.info(f"A2A REQ: {message.from_agent} -> {target_agent}")
-
-			# Record for digital-twin training
-			recorder.record_event(
-				agent_id=message.from_agent,
-				role="agent",
-				event_type="message",
-				content=message.content,
-				metadata=message.to_dict()
-			)
-
-			agent_data = self.agent_registry[target_agent]
-			return await agent_data["instance"].handle_request(message)
-		else:
+		if target_agent not in self.agent_registry:
 			logger.warning(f"Target agent {target_agent} not found.")
 			return None
 
+		key = message.metadata.get(IDEMPOTENCY_KEY)
+		if key is not None:
+			existing = self._idempotent.get(key)
+			if existing is not None and not (existing.done() and (existing.cancelled() or existing.exception())):
+				logger.info(f"A2A REQ: {message.from_agent} -> {target_agent} (idempotent replay {key})")
+				return await asyncio.shield(existing)
+			shared = asyncio.get_running_loop().create_future()
+			self._remember(key, shared)
+
+		logger.info(f"A2A REQ: {message.from_agent} -> {target_agent}")
+
+		# Record for digital-twin training
+		recorder.record_event(
+			agent_id=message.from_agent,
+			role="agent",
+			event_type="message",
+			content=message.content,
+			metadata=message.to_dict()
+		)
+
+		try:
+			result = await self._call(message, timeout, retries)
+		except asyncio.CancelledError:
+			if key is not None and not shared.done(): shared.cancel()
+			raise
+		except Exception as e:
+			# Failed keyed requests are not remembered: the next call with the key runs again
+			if key is not None and not shared.done():
+				shared.set_exception(e)
+				shared.exception()  # Mark retrieved so an unawaited failure is not logged
+			raise
+		if key is not None and not shared.done():
+			shared.set_result(result)
+		return result
+
+	async def _call(self, message: A2AMessage, timeout: Optional[float], retries: int) -> Any:
+		inbox = self.inboxes[message.to_agent]
+		histogram = self.latency.setdefault((message.from_agent, message.to_agent), LatencyHistogram())
+		fixed_deadline = message.metadata.get(DEADLINE_KEY)
+		parent_deadline = _deadline.get()
+
+		# Work done on behalf of an urgent request is urgent too (no priority inversion)
+		parent_priority = _priority.get()
+		if PRIORITY_RANK[parent_priority] < PRIORITY_RANK[message.priority]:
+			message.priority = parent_priority
+
+		attempt = 0
+		while True:
+			deadline = time.time() + (timeout or self.default_timeout)
+			capped = False  # Deadline set by the caller or parent request, not by this attempt
+			for bound in (fixed_deadline, parent_deadline):
+				if bound is not None and bound <= deadline:
+					deadline, capped = bound, True
+			message.metadata[DEADLINE_KEY] = deadline
+			message.metadata["attempt"] = attempt
+
+			started = time.perf_counter()
+			self._in_flight[message.message_id] = message.to_agent
+			try:
+				result = await inbox.submit(message, deadline)
+				histogram.observe((time.perf_counter() - started) * 1000)
+				return result
+			except (A2ATimeoutError, AdmissionError) as e:
+				histogram.observe((time.perf_counter() - started) * 1000, ok=False)
+				# A caller-fixed or inherited deadline cannot be extended by retrying
+				if attempt >= retries or (capped and isinstance(e, A2ATimeoutError)):
+					logger.warning(f"A2A {message.from_agent} -> {message.to_agent} failed: {e}")
+					raise
+				attempt += 1
+				await asyncio.sleep(min(0.05 * 2 ** attempt, 2.0))
+			except Exception:
+				histogram.observe((time.perf_counter() - started) * 1000, ok=False)
+				raise
+			finally:
+				self._in_flight.pop(message.message_id, None)
+
+	def _remember(self, key: str, future: asyncio.Future):
+		self._idempotent[key] = future
+		self._idempotent.move_to_end(key)
+		while len(self._idempotent) > self.idempotency_cache_size:
+			self._idempotent.popitem(last=False)
+
+	def cancel(self, message_id: str) -> bool:
+		"""Cancel an in-flight request by message_id (handler and its nested requests stop)."""
+		target = self._in_flight.get(message_id)
+		return bool(target and self.inboxes[target].cancel(message_id))
+
+	def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+		return {f"{src}->{dst}": h.to_dict() for (src, dst), h in self.latency.items()}
+
 # Global bus instance for the agency
 bus = A2ABus()
@@ -0,0 +1,123 @@
+"""
+_SUDOTEER Workflow Checkpoints
+Durable record of workflow progress so a crashed run can resume from its last
+completed node, plus an input-addressed cache of node outputs for cheap reruns.
+SQLite (WAL), same layout conventions as the LLM response cache.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("_SUDOTEER")
+
+class WorkflowCheckpointStore:
+	"""
+	checkpoints: workflow_id -> (workflow name, initial data, completed node executions, status)
+	node_outputs: sha256(workflow, node, input data) -> data keys the node wrote
+	Values are JSON; objects that are not JSON-native are stored as their str().
+	"""
+	def __init__(self, path: str = None):
+		self.path = path or os.getenv("SUDOTEER_WORKFLOW_STORE", "sandbox/workflows/checkpoints.sqlite")
+		self._conn: Optional[sqlite3.Connection] = None
+		self._lock = threading.Lock()
+
+	def _connect(self) -> sqlite3.Connection:
+		if self._conn is None:
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			conn.execute(
+				"CREATE TABLE IF NOT EXISTS checkpoints ("
+				"workflow_id TEXT PRIMARY KEY, workflow_name TEXT, initial_data TEXT, "
+				"executions TEXT, status TEXT, updated REAL)"
+			)
+			conn.execute(
+				"CREATE TABLE IF NOT EXISTS node_outputs ("
+				"key TEXT PRIMARY KEY, workflow_name TEXT, node TEXT, output TEXT, created REAL)"
+			)
+			self._conn = conn
+		return self._conn
+
+	@staticmethod
+	def make_key(workflow_name: str, node_name: str, data: Dict[str, Any]) -> str:
+		payload = json.dumps({"workflow": workflow_name, "node": node_name, "data": data}, sort_keys=True, default=str)
+		return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+	# --- Checkpoints ---
+
+	def save(self, workflow_id: str, workflow_name: str, initial_data: Dict[str, Any], executions: List[Dict[str, Any]], status: str):
+		try:
+			row = (
+				workflow_id, workflow_name,
+				json.dumps(initial_data, default=str), json.dumps(executions, default=str),
+				status, time.time()
+			)
+			with self._lock:
+				self._connect().execute(
+					"INSERT OR REPLACE INTO checkpoints (workflow_id, workflow_name, initial_data, executions, status, updated) "
+					"VALUES (?, ?, ?, ?, ?, ?)", row
+				)
+		except (sqlite3.Error, TypeError, ValueError) as e:
+			logger.warning(f"Checkpoints: Save failed for {workflow_id}: {e}")
+
+	def load(self, workflow_id: str) -> Optional[Tuple[str, Dict[str, Any], List[Dict[str, Any]], str]]:
+		"""Return (workflow_name, initial_data, executions, status) or None."""
+		with self._lock:
+			row = self._connect().execute(
+				"SELECT workflow_name, initial_data, executions, status FROM checkpoints WHERE workflow_id = ?",
+				(workflow_id,)
+			).fetchone()
+		if not row:
+			return None
+		return row[0], json.loads(row[1]), json.loads(row[2]), row[3]
+
+	def list_incomplete(self) -> List[Dict[str, Any]]:
+		"""Workflows that stopped before finishing (crashed or failed), newest first."""
+		with self._lock:
+			rows = self._connect().execute(
+				"SELECT workflow_id, workflow_name, status, updated FROM checkpoints "
+				"WHERE status != 'completed' ORDER BY updated DESC"
+			).fetchall()
+		return [{"workflow_id": r[0], "workflow_name": r[1], "status": r[2], "updated": r[3]} for r in rows]
+
+	def delete(self, workflow_id: str):
+		with self._lock:
+			self._connect().execute("DELETE FROM checkpoints WHERE workflow_id = ?", (workflow_id,))
+
+	# --- Node output cache ---
+
+	def get_output(self, key: str) -> Optional[Dict[str, Any]]:
+		try:
+			with self._lock:
+				row = self._connect().execute("SELECT output FROM node_outputs WHERE key = ?", (key,)).fetchone()
+		except sqlite3.Error as e:
+			logger.warning(f"Checkpoints: Output read failed: {e}")
+			return None
+		return json.loads(row[0]) if row else None
+
+	def put_output(self, key: str, workflow_name: str, node_name: str, output: Dict[str, Any]):
+		try:
+			value = json.dumps(output, default=str)
+			with self._lock:
+				self._connect().execute(
+					"INSERT OR REPLACE INTO node_outputs (key, workflow_name, node, output, created) VALUES (?, ?, ?, ?, ?)",
+					(key, workflow_name, node_name, value, time.time())
+				)
+		except (sqlite3.Error, TypeError, ValueError) as e:
+			logger.warning(f"Checkpoints: Output write failed: {e}")
+
+	def clear_outputs(self, workflow_name: str = None):
+		with self._lock:
+			if workflow_name:
+				self._connect().execute("DELETE FROM node_outputs WHERE workflow_name = ?", (workflow_name,))
+			else:
+				self._connect().execute("DELETE FROM node_outputs")
+
+# Global store used by the workflow orchestrator
+checkpoint_store = WorkflowCheckpointStore()
@@ -1,30 +1,99 @@
+import os
 import time
 import json
+import sqlite3
 import paho.mqtt.client as mqtt
 import threading
 import logging
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger("_SUDOTEER.Distributed")
 
+class EdgeSpool:
+	"""
+	Local disk queue (SQLite, WAL) for reports the Master has not received yet.
+	FIFO; bounded to `max_rows` (oldest dropped first). The row count is kept in
+	memory (read once at open), so len() never queries the table.
+	"""
+	def __init__(self, path: str = None, max_rows: int = 100000):
+		self.path = path or os.getenv("SUDOTEER_EDGE_SPOOL", "sandbox/edge/spool.sqlite")
+		self.max_rows = max_rows
+		self.dropped = 0
+		self._lock = threading.Lock()
+		os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+		self._conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		self._conn.execute("PRAGMA synchronous=NORMAL")
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS spool (seq INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT, payload TEXT, created REAL)"
+		)
+		self._rows = self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+	def push(self, topic: str, payload: str):
+		with self._lock:
+			self._conn.execute("INSERT INTO spool (topic, payload, created) VALUES (?, ?, ?)", (topic, payload, time.time()))
+			self._rows += 1
+			overflow = self._rows - self.max_rows
+			if overflow > 0:
+				deleted = self._conn.execute("DELETE FROM spool WHERE seq IN (SELECT seq FROM spool ORDER BY seq LIMIT ?)", (overflow,)).rowcount
+				self._rows -= deleted
+				self.dropped += deleted
+
+	def peek(self, limit: int = 1) -> List[Tuple[int, str, str]]:
+		with self._lock:
+			return self._conn.execute("SELECT seq, topic, payload FROM spool ORDER BY seq LIMIT ?", (limit,)).fetchall()
+
+	def ack(self, seq: int):
+		with self._lock:
+			self._rows -= self._conn.execute("DELETE FROM spool WHERE seq <= ?", (seq,)).rowcount
+
+	def __len__(self) -> int:
+		return self._rows
+
+	def close(self):
+		with self._lock:
+			self._conn.close()
+
 class GreenhouseReporter:
 	"""
 	Distributed Control Reporter (Edge Computing).
 	Provides a 'Heartbeat' mechanism to report status to a Master Overseer via MQTT.
+	Samples are batched into one compact columnar message every `batch_interval`
+	seconds. While the broker is unreachable (or older batches are still queued)
+	batches go to a disk spool, which is replayed in order at `replay_rate`
+	messages/s once the connection is back. Connecting never blocks the caller;
+	record()/flush() may touch the spool, so async callers run them in a thread.
 	"""
-	def __init__(self, unit_id="GH-01", broker_address="localhost", broker_port=1883):
+	SCHEMA = 1
+
+	def __init__(self, unit_id="GH-01", broker_address="localhost", broker_port=1883,
+				 batch_interval: float = 5.0, max_batch: int = 600, replay_rate: float = 20.0,
+				 spool: EdgeSpool = None, client: Any = None, autoconnect: bool = True):
 		self.unit_id = unit_id
 		self.broker = broker_address
 		self.port = broker_port
+		self.batch_interval = batch_interval
+		self.max_batch = max_batch
+		self.replay_rate = replay_rate
 
-		# MQTT v5 client (using CallbackAPIVersion.VERSION2 as per paho-mqtt 2.0+ standards)
-		try:
-			# Use VERSION1 if VERSION2 is not available (paho-mqtt < 2.0)
-			from paho.mqtt.enums import CallbackAPIVersion
-			self.client = mqtt.Client(CallbackAPIVersion.VERSION2, client_id=unit_id)
-		except ImportError:
-			self.client = mqtt.Client(client_id=unit_id)
+		if client is not None:
+			self.client = client
+		else:
+			# MQTT v5 client (using CallbackAPIVersion.VERSION2 as per paho-mqtt 2.0+ standards)
+			try:
+				# Use VERSION1 if VERSION2 is not available (paho-mqtt < 2.0)
+				from paho.mqtt.enums import CallbackAPIVersion
+				self.client = mqtt.Client(CallbackAPIVersion.VERSION2, client_id=unit_id)
+			except ImportError:
+				self.client = mqtt.Client(client_id=unit_id)
 
 		self.connected = False
+		self.spool = spool if spool is not None else EdgeSpool()
+		self._batch: List[Tuple[float, Dict[str, Any]]] = []
+		self._batch_started: Optional[float] = None
+		self._lock = threading.Lock()
+		self._replayer: Optional[threading.Thread] = None
+		self.stats = {"samples": 0, "published": 0, "spooled": 0, "replayed": 0}
 
 		# Topics
 		self.topic_status = f"greenhouse/{unit_id}/status"
@@ -36,13 +105,15 @@ class GreenhouseReporter:
 		self.client.on_disconnect = self.on_disconnect
 		self.client.on_message = self.on_message
 
-		self.connect_bg()
+		if autoconnect:
+			self.connect_bg()
 
 	def connect_bg(self):
-		"""Connect in background to prevent blocking main simulation."""
+		"""Connect in background to prevent blocking main simulation (paho retries with backoff)."""
 		try:
 			logger.info(f"[MQTT] Attempting to connect to Master at {self.broker}:{self.port}")
-			self.client.connect(self.broker, self.port, 60)
+			self.client.reconnect_delay_set(min_delay=1, max_delay=60)
+			self.client.connect_async(self.broker, self.port, 60)
 			self.client.loop_start()
 		except Exception as e:
 			logger.warning(f"[MQTT] Warning: Could not connect to Master at {self.broker}. Unit {self.unit_id} running local-only.")
@@ -52,19 +123,21 @@ class GreenhouseReporter:
 		success = (rc == 0 if isinstance(rc, int) else rc.is_failure == False)
 		if success:
 			self.connected = True
-			logger.info(f"🛡️ [DISTRIBUTED] Local Brain GH-01 Connected to Master Overseer")
+			logger.info(f"🛡️ [DISTRIBUTED] Local Brain {self.unit_id} Connected to Master Overseer")
 			# Subscribe to commands from master
 			self.client.subscribe(self.topic_commands)
 			# Announce online status
 			self.client.publish(self.topic_alerts, json.dumps({
 				"id": self.unit_id,
 				"msg": "Edge Node Online",
-				"timestamp": time.time()
+				"timestamp": time.time(),
+				"backlog": len(self.spool)
 			}))
+			self._start_replay()
 		else:
 			logger.error(f"[MQTT] Connection failed with result code {rc}")
 
-	def on_disconnect(self, client, userdata, rc, properties=None):
+	def on_disconnect(self, client, userdata, *args, **kwargs):
 		self.connected = False
 		logger.warning(f"⚠️ [DISTRIBUTED] Disconnected from Master. Falling back to Local Isolation mode.")
 
@@ -77,24 +150,101 @@ class GreenhouseReporter:
 		except Exception as e:
 			logger.error(f"[MQTT] Error parsing master command: {e}")
 
+	# --- Batching ---
+
+	def record(self, sensor_data: Dict[str, Any], now: float = None):
+		"""Add one sample; the batch is sent once `batch_interval` has passed or it is full."""
+		now = time.time() if now is None else now
+		with self._lock:
+			if self._batch_started is None: self._batch_started = now
+			self._batch.append((now, sensor_data))
+			self.stats["samples"] += 1
+			due = now - self._batch_started >= self.batch_interval or len(self._batch) >= self.max_batch
+		if due:
+			self.flush()
+
 	def send_heartbeat(self, sensor_data):
-		"""Report current state to the master every cycle."""
-		if not self.connected:
-			return
+		"""Report current state to the master (batched; see record())."""
+		self.record(sensor_data)
 
-		payload = {
+	def _encode(self, samples: List[Tuple[float, Dict[str, Any]]]) -> str:
+		"""Columnar batch: shared key list, one row per sample, timestamps as offsets."""
+		keys = sorted({k for _, sample in samples for k in sample})
+		t0 = samples[0][0]
+		return json.dumps({
 			"id": self.unit_id,
-			"timestamp": time.time(),
-			"data": sensor_data,
-			"status": "online"
-		}
+			"v": self.SCHEMA,
+			"status": "online",
+			"t0": round(t0, 3),
+			"dt": [round(t - t0, 3) for t, _ in samples],
+			"keys": keys,
+			"rows": [[sample.get(k) for k in keys] for _, sample in samples]
+		}, separators=(",", ":"), default=str)
 
-		try:
-			self.client.publish(self.topic_status, json.dumps(payload))
-		except Exception as e:
-			logger.error(f"[MQTT] Failed to publish heartbeat: {e}")
+	def flush(self, wait: float = None):
+		"""Send (or spool) the current batch; with `wait`, spool it unless the broker acks within `wait` s."""
+		with self._lock:
+			samples, self._batch, self._batch_started = self._batch, [], None
+		if not samples:
+			return
+		payload = self._encode(samples)
+
+		# Keep history in order: while a backlog exists, new batches queue behind it
+		if self.connected and not len(self.spool):
+			try:
+				info = self.client.publish(self.topic_status, payload, qos=1)
+				if info.rc == mqtt.MQTT_ERR_SUCCESS:
+					if wait is not None:
+						info.wait_for_publish(timeout=wait)
+					if wait is None or info.is_published():
+						self.stats["published"] += 1
+						return
+			except Exception as e:
+				logger.error(f"[MQTT] Failed to publish heartbeat: {e}")
+		self.spool.push(self.topic_status, payload)
+		self.stats["spooled"] += 1
+		if self.connected: self._start_replay()
+
+	# --- Replay ---
+
+	def _start_replay(self):
+		# Called from paho's network thread (on_connect) and from flush()
+		with self._lock:
+			if self._replayer and self._replayer.is_alive():
+				return
+			if not len(self.spool):
+				return
+			self._replayer = threading.Thread(target=self._replay, name=f"edge-replay-{self.unit_id}", daemon=True)
+			self._replayer.start()
+
+	def _replay(self):
+		"""Drain the spool oldest-first, rate limited; each message is acked before the next."""
+		interval = 1.0 / self.replay_rate if self.replay_rate else 0.0
+		logger.info(f"[MQTT] Replaying {len(self.spool)} spooled reports to Master")
+		while self.connected:
+			pending = self.spool.peek(1)
+			if not pending:
+				break
+			seq, topic, payload = pending[0]
+			started = time.monotonic()
+			try:
+				info = self.client.publish(topic, payload, qos=1)
+				info.wait_for_publish(timeout=10.0)
+				if not info.is_published():
+					break  # Broker did not acknowledge; retry on the next connect
+			except Exception as e:
+				logger.warning(f"[MQTT] Replay interrupted: {e}")
+				break
+			self.spool.ack(seq)
+			self.stats["replayed"] += 1
+			time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+	def get_status(self) -> Dict[str, Any]:
+		return {"connected": self.connected, "backlog": len(self.spool), "dropped": self.spool.dropped, **self.stats}
 
-	def stop(self):
+	def stop(self, timeout: float = 5.0):
+		"""Send the last partial batch (spooled if not acked within `timeout` s), then disconnect."""
+		self.flush(wait=timeout)
 		self.connected = False
 		self.client.loop_stop()
 		self.client.disconnect()
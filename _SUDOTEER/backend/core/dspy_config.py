@@ -6,18 +6,25 @@ os.environ["DSPy_DISABLE_STRUCTURED_OUTPUTS"] = "true"
 os.environ["LITELLM_DROP_PARAMS"] = "true"
 
 import dspy
+import asyncio
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
+from .llm.cache import CachedLM
+from .llm.router import RoutingLM, LLMEndpoint, DEFAULT_CLASS
 
 logger = logging.getLogger("_SUDOTEER")
 load_dotenv(Path(__file__).parent.parent.parent / ".env")
 
+def _env_classes(name: str, default: str) -> list:
+	return [c.strip() for c in os.getenv(name, default).split(",") if c.strip()]
+
 class DSPyConfig:
 	"""Lean DSPy configuration with focus on local-first durability."""
 	def __init__(self):
 		self.lm = None
 		self.provider = "None"
+		self.router = None
 
 	def configure(self, provider: str = "auto") -> bool:
 		if provider == "auto":
@@ -28,17 +35,29 @@ class DSPyConfig:
 			return self._gemini()
 		return False
 
+	def _lm_studio_lm(self):
+		lm_url = os.getenv("LM_STUDIO_URL", "http://localhost:1234/v1")
+		lm_model = os.getenv("LM_STUDIO_MODEL", "qwen/qwen3-4b-thinking-2507")  # 4B thinking model with tool use
+		# Disable JSON mode; responses go through the shared on-disk cache (llm/cache.py)
+		lm = CachedLM(
+			model=lm_model,
+			api_base=lm_url,
+			api_key="lm-studio"
+		)
+		return lm, lm_model, lm_url
+
+	def _ollama_lm(self):
+		ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
+		ollama_model = os.getenv("OLLAMA_MODEL", "qwen3:1.7b")  # 1.7B model loaded
+		lm = CachedLM(
+			model=f"ollama_chat/{ollama_model}",
+			api_base=ollama_url
+		)
+		return lm, ollama_model, ollama_url
+
 	def _local(self):
 		try:
-			lm_url = os.getenv("LM_STUDIO_URL", "http://localhost:1234/v1")
-			lm_model = os.getenv("LM_STUDIO_MODEL", "qwen/qwen3-4b-thinking-2507")  # 4B thinking model with tool use
-			# Disable JSON mode and caching - not supported by LM Studio
-			self.lm = dspy.LM(
-				model=lm_model,
-				api_base=lm_url,
-				api_key="lm-studio",
-				cache=False
-			)
+			self.lm, lm_model, lm_url = self._lm_studio_lm()
 			self.provider = f"LM Studio ({lm_model})"
 			# Configure with experimental features off
 			dspy.configure(lm=self.lm, experimental=False)
@@ -52,7 +71,7 @@ class DSPyConfig:
 		key = os.getenv("GEMINI_API_KEY")
 		if not key: return False
 		try:
-			self.lm = dspy.LM(model="gemini/gemini-2.0-flash-exp", api_key=key)
+			self.lm = CachedLM(model="gemini/gemini-2.0-flash-exp", api_key=key)
 			self.provider = "Gemini"
 			dspy.configure(lm=self.lm)
 			return True
@@ -61,13 +80,7 @@ class DSPyConfig:
 	def _ollama(self):
 		"""Connect to local Ollama instance."""
 		try:
-			ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-			ollama_model = os.getenv("OLLAMA_MODEL", "qwen3:1.7b")  # 1.7B model loaded
-			self.lm = dspy.LM(
-				model=f"ollama_chat/{ollama_model}",
-				api_base=ollama_url,
-				cache=False
-			)
+			self.lm, ollama_model, ollama_url = self._ollama_lm()
 			self.provider = f"Ollama ({ollama_model})"
 			dspy.configure(lm=self.lm, experimental=False)
 			logger.info(f"[DSPy] Connected to Ollama: {ollama_model} @ {ollama_url}")
@@ -76,15 +89,102 @@ class DSPyConfig:
 			logger.warning(f"[DSPy] Ollama connection failed: {e}")
 			return False
 
+	def _build_endpoints(self) -> list:
+		"""Every configured backend as a routable endpoint (health-probed, weighted, classed)."""
+		endpoints = []
+		try:
+			lm, model, url = self._lm_studio_lm()
+			endpoints.append(LLMEndpoint(
+				f"lmstudio:{model}", lm, health_url=f"{url}/models",
+				weight=float(os.getenv("LM_STUDIO_WEIGHT", "2.0")),
+				model_classes=_env_classes("LM_STUDIO_CLASSES", "general,reasoning,coder")
+			))
+		except Exception as e:
+			logger.warning(f"[DSPy] LM Studio endpoint skipped: {e}")
+		try:
+			lm, model, url = self._ollama_lm()
+			endpoints.append(LLMEndpoint(
+				f"ollama:{model}", lm, health_url=f"{url}/api/tags",
+				weight=float(os.getenv("OLLAMA_WEIGHT", "1.0")),
+				model_classes=_env_classes("OLLAMA_CLASSES", "general")
+			))
+		except Exception as e:
+			logger.warning(f"[DSPy] Ollama endpoint skipped: {e}")
+		key = os.getenv("GEMINI_API_KEY")
+		if key:
+			try:
+				lm = CachedLM(model="gemini/gemini-2.0-flash-exp", api_key=key)
+				# Remote fallback: low weight so local backends take the load
+				endpoints.append(LLMEndpoint(
+					"gemini", lm, weight=float(os.getenv("GEMINI_WEIGHT", "0.5")),
+					model_classes=_env_classes("GEMINI_CLASSES", "general,reasoning,coder")
+				))
+			except Exception as e:
+				logger.warning(f"[DSPy] Gemini endpoint skipped: {e}")
+		return endpoints
+
 	def _auto(self):
+		self.probe_endpoints()
+		return self.activate_router()
+
+	def probe_endpoints(self) -> bool:
+		"""
+		Build the router and run the first health probe. Blocking network I/O
+		with no DSPy global state touched, so it can run in a worker thread.
+		The router is kept even when no backend answers yet (the health prober
+		re-admits them once they come up). False when none is healthy.
+		"""
 		logger.info("[DSPy] Auto-detecting LM...")
-		if self._local(): return True
-		if self._ollama(): return True
-		if self._gemini(): return True
-		logger.error("[DSPy] No LM backend found.")
-		return False
+		endpoints = self._build_endpoints()
+		if not endpoints:
+			logger.error("[DSPy] No LM backend configured.")
+			return False
+
+		self.router = RoutingLM(endpoints)
+		if not self.router.check_health():
+			logger.warning("[DSPy] No LM backend answering yet (" + ", ".join(e.name for e in endpoints) + "); calls fail until one comes up.")
+			return False
+		return True
+
+	def activate_router(self) -> bool:
+		"""
+		Register the probed router with DSPy (must run on the thread that owns
+		dspy.configure). Without a router, falls back to the local LM Studio config.
+		"""
+		if not self.router:
+			return self._local()
+		self.router.start_health_checks()
+		self.lm = self.router
+		self.provider = "Router (" + ", ".join(e.name for e in self.router.endpoints) + ")"
+		dspy.configure(lm=self.lm, experimental=False)
+		logger.info(f"[DSPy] {self.provider}")
+		return True
+
+	def apply_discovery(self, nodes: list):
+		"""
+		Feed LLMSeekerEngine results into the router: discovered OpenAI-compatible
+		nodes with a known model become extra endpoints.
+		"""
+		if not self.router: return
+		for node in nodes:
+			models = node.get("models") or []
+			if node.get("provider") in ("LM Studio", "Ollama") or not models:
+				continue  # Already configured, or nothing to route to
+			base = f"{node['url']}/v1"
+			lm = CachedLM(model=f"openai/{models[0]}", api_base=base, api_key="local")
+			self.router.add_endpoint(LLMEndpoint(
+				f"{node['provider'].lower()}:{models[0]}", lm, health_url=f"{base}/models",
+				model_classes=[DEFAULT_CLASS]
+			))
 
 dspy_config = DSPyConfig()
 
 def initialize_dspy(auto: bool = True):
 	return dspy_config.configure("auto" if auto else "local")
+
+async def initialize_dspy_async(auto: bool = True):
+	"""initialize_dspy for the event loop: endpoint probes run in a worker thread."""
+	if not auto:
+		return initialize_dspy(auto=False)
+	await asyncio.to_thread(dspy_config.probe_endpoints)
+	return dspy_config.activate_router()
@@ -1,33 +1,115 @@
+import os
+import time
+import asyncio
+import inspect
+import functools
 import logging
-from typing import Dict, Any, Type, Optional
+from typing import Dict, Any, Callable, Type, Optional, Union
 from .agent_base import SudoAgent
 from .ade_engine import ade_engine
 from .bus import bus
 
 logger = logging.getLogger("_SUDOTEER")
 
+class LazyAgent:
+	"""
+	Lightweight stand-in registered on the bus in place of an agent.
+	The real agent is built on the first request (or attribute access) and may
+	be evicted after a period of inactivity; the next request rebuilds it.
+	Methods reached through the proxy count as in flight until they (and any
+	coroutine they return) finish, like bus requests.
+	"""
+	def __init__(self, factory: "AgentFactory", role: str, agent_id: str):
+		self._factory = factory
+		self.role = role
+		self.agent_id = agent_id
+		self._agent: Optional[SudoAgent] = None
+		self.in_flight = 0
+		self.last_used = time.monotonic()
+
+	@property
+	def is_materialized(self) -> bool:
+		return self._agent is not None
+
+	def materialize(self) -> SudoAgent:
+		if self._agent is None:
+			started = time.perf_counter()
+			self._agent = self._factory._build(self.role, self.agent_id)
+			self._factory.stats["materialized"] += 1
+			logger.info(f"Materialized agent {self.agent_id} ({(time.perf_counter() - started) * 1000:.1f}ms)")
+		self.last_used = time.monotonic()
+		return self._agent
+
+	async def handle_request(self, message: Any) -> Any:
+		agent = self.materialize()
+		self.in_flight += 1
+		try:
+			return await agent.handle_request(message)
+		finally:
+			self._release()
+
+	def _release(self):
+		self.in_flight -= 1
+		self.last_used = time.monotonic()
+
+	def _in_use(self, method: Callable) -> Callable:
+		@functools.wraps(method)
+		def call(*args, **kwargs):
+			self.in_flight += 1
+			try:
+				result = method(*args, **kwargs)
+			except BaseException:
+				self._release()
+				raise
+			if inspect.isawaitable(result):
+				return self._awaiting(result)
+			self._release()
+			return result
+		return call
+
+	async def _awaiting(self, awaitable: Any) -> Any:
+		try:
+			return await awaitable
+		finally:
+			self._release()
+
+	def evict(self) -> bool:
+		"""Drop the real agent unless it is busy; the proxy stays registered."""
+		if self._agent is None or self.in_flight:
+			return False
+		self._agent = None
+		self._factory.stats["evicted"] += 1
+		logger.info(f"Evicted idle agent {self.agent_id}")
+		return True
+
+	def __getattr__(self, name: str) -> Any:
+		# Only reached for attributes the proxy itself does not have
+		if name.startswith("__"):
+			raise AttributeError(name)
+		value = getattr(self.materialize(), name)
+		return self._in_use(value) if inspect.ismethod(value) else value
+
+	def __repr__(self):
+		return f"<LazyAgent {self.agent_id} ({'live' if self._agent is not None else 'dormant'})>"
+
 class AgentFactory:
 	"""
 	Central factory for spawning and configuring agents.
 	Handles workstation setup, tool assignment, and bus registration.
 	"""
 	def __init__(self):
-		self.active_agents: Dict[str, SudoAgent] = {}
+		self.active_agents: Dict[str, Union[SudoAgent, LazyAgent]] = {}
 		self._role_map = {}
+		self.idle_timeout = float(os.getenv("SUDOTEER_AGENT_IDLE_TIMEOUT", "900"))  # 0 disables eviction
+		self._evictor: Optional[asyncio.Task] = None
+		self.stats = {"materialized": 0, "evicted": 0}
 
 	def register_role(self, role: str, agent_class: Type[SudoAgent]):
 		"""Map a role name to an agent class."""
 		self._role_map[role.lower()] = agent_class
 
-	def spawn_agent(self, role: str, agent_id: str, config: Optional[Dict[str, Any]] = None) -> SudoAgent:
-		"""
-		Create a new agent instance, configure it, and register it.
-		"""
-		agent_class = self._role_map.get(role.lower())
-		if not agent_class:
-			raise ValueError(f"Unknown agent role: {role}")
-
-		logger.info(f"Spawning agent: {agent_id} as {role}")
+	def _build(self, role: str, agent_id: str) -> SudoAgent:
+		agent_class = self._role_map[role.lower()]
 
 		# 1. Initialize Instance
 		agent_instance = agent_class(agent_id=agent_id, role=role)
@@ -35,9 +117,29 @@ class AgentFactory:
 		# 2. Assign Custom Tools from ADE
 		custom_tools = ade_engine.get_agent_tools(agent_id)
 		agent_instance.tools = custom_tools
+		return agent_instance
+
+	def spawn_agent(self, role: str, agent_id: str, config: Optional[Dict[str, Any]] = None, lazy: bool = False) -> Union[SudoAgent, LazyAgent]:
+		"""
+		Create a new agent instance, configure it, and register it.
+		With `lazy`, a LazyAgent proxy is registered instead and the agent is
+		built on first use. Agents with an initialize() hook (telemetry
+		subscribers) are always built eagerly.
+		"""
+		agent_class = self._role_map.get(role.lower())
+		if not agent_class:
+			raise ValueError(f"Unknown agent role: {role}")
 
-		# 3. Register on A2A Bus
-		bus.register_agent(agent_id, agent_instance)
+		config = config or {}
+		if lazy and not hasattr(agent_class, "initialize"):
+			logger.info(f"Registering agent: {agent_id} as {role} (on demand)")
+			agent_instance = LazyAgent(self, role, agent_id)
+		else:
+			logger.info(f"Spawning agent: {agent_id} as {role}")
+			agent_instance = self._build(role, agent_id)
+
+		# 3. Register on A2A Bus (config may size the agent's inbox worker pool)
+		bus.register_agent(agent_id, agent_instance, workers=config.get("workers"), max_depth=config.get("max_depth"))
 
 		self.active_agents[agent_id] = agent_instance
 		return agent_instance
@@ -46,5 +148,37 @@ class AgentFactory:
 		"""Retrieve an active agent by ID."""
 		return self.active_agents.get(agent_id)
 
+	def evict_idle(self, idle_timeout: float = None, now: float = None) -> int:
+		"""Release lazily spawned agents unused for `idle_timeout` seconds; returns how many."""
+		idle_timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+		now = time.monotonic() if now is None else now
+		evicted = 0
+		for agent in self.active_agents.values():
+			if isinstance(agent, LazyAgent) and agent.is_materialized and now - agent.last_used >= idle_timeout:
+				evicted += agent.evict()
+		return evicted
+
+	def start_idle_eviction(self, interval: float = None):
+		"""Periodically evict idle on-demand agents (no-op when idle_timeout is 0)."""
+		if self.idle_timeout <= 0 or (self._evictor and not self._evictor.done()):
+			return
+		interval = interval or max(1.0, self.idle_timeout / 4)
+
+		async def _loop():
+			while True:
+				await asyncio.sleep(interval)
+				self.evict_idle()
+
+		self._evictor = asyncio.create_task(_loop())
+
+	def get_stats(self) -> Dict[str, Any]:
+		lazy = [a for a in self.active_agents.values() if isinstance(a, LazyAgent)]
+		return {
+			"agents": len(self.active_agents),
+			"on_demand": len(lazy),
+			"live": len(self.active_agents) - sum(not a.is_materialized for a in lazy),
+			**self.stats
+		}
+
 # Global factory instance
 agent_factory = AgentFactory()
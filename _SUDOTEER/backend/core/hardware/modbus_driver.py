@@ -2,54 +2,214 @@
 _SUDOTEER Modbus TCP Driver
 Handles low-level communication with industrial PLCs.
 Supports a Simulation Fallback to the Greenhouse Digital Twin.
+Every PLC/gateway is a pooled connection keyed by (host, port, unit_id):
+requests to different devices run concurrently, requests to one device are
+serialized, and a dead device is retried with exponential backoff in the
+background while its points fall back to the simulation.
 """
+import time
+import inspect
 import logging
 import asyncio
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 from pymodbus.client import AsyncModbusTcpClient
-from .plc_mapper import PLC_MAP, get_register
+from .plc_mapper import PLC_MAP, DEVICES, DEFAULT_DEVICE, get_register
 from ...sandbox.simulations.greenhouse import greenhouse_sim
 
 logger = logging.getLogger("_SUDOTEER")
 
-class ModbusDriver:
-    def __init__(self, host: str = "127.0.0.1", port: int = 502):
+DeviceKey = Tuple[str, int, int]  # (host, port, unit_id)
+
+class ModbusExceptionResponse(IOError):
+    """The PLC answered with a Modbus exception: this request failed, the link is fine."""
+
+class PLCConnection:
+    """One persistent connection to a PLC/gateway unit, with its own lock, backoff and counters."""
+    def __init__(self, host: str, port: int = 502, unit_id: int = 1, timeout: float = 1.0,
+                 backoff_initial: float = 1.0, backoff_max: float = 60.0):
         self.host = host
         self.port = port
-        self.client = AsyncModbusTcpClient(host, port=port)
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.client: Optional[AsyncModbusTcpClient] = None
         self.is_connected = False
+        self.lock = asyncio.Lock()  # One outstanding request per device
+        self.backoff = backoff_initial
+        self.next_attempt = 0.0
+        self._reconnect: Optional[asyncio.Task] = None
+        self._unit_kwarg: Optional[str] = None
+        self.stats = {"reads": 0, "writes": 0, "errors": 0, "reconnects": 0, "latency_ms": None}
+
+    @property
+    def key(self) -> DeviceKey:
+        return (self.host, self.port, self.unit_id)
+
+    def _new_client(self) -> AsyncModbusTcpClient:
+        # Reconnects are driven by the pool's backoff, not by the client
+        return AsyncModbusTcpClient(self.host, port=self.port, timeout=self.timeout, retries=0, reconnect_delay=0)
 
     async def connect(self) -> bool:
-        """Establish connection to the PLC."""
         try:
-            self.is_connected = await self.client.connect()
-            if self.is_connected:
-                logger.info(f"Modbus: Connected to {self.host}:{self.port}")
-            else:
-                logger.warning(f"Modbus: Hardware offline. Using Simulation Fallback.")
-            return self.is_connected
+            if self.client is None:
+                self.client = self._new_client()
+            self.is_connected = bool(await asyncio.wait_for(self.client.connect(), self.timeout * 2))
         except Exception as e:
-            logger.error(f"Modbus Connection Error: {e}")
+            logger.debug(f"Modbus: Connect to {self.host}:{self.port}/{self.unit_id} failed: {e}")
             self.is_connected = False
-            return False
 
-    async def disconnect(self):
-        self.client.close()
+        if self.is_connected:
+            self.backoff = self.backoff_initial
+            logger.info(f"Modbus: Connected to {self.host}:{self.port} (unit {self.unit_id})")
+        else:
+            self._schedule_retry()
+        return self.is_connected
+
+    def _schedule_retry(self):
+        self.next_attempt = time.monotonic() + self.backoff
+        self.backoff = min(self.backoff * 2, self.backoff_max)
+
+    def ensure_connecting(self):
+        """Start a background reconnect once the backoff has elapsed (never blocks the caller)."""
+        if self.is_connected or time.monotonic() < self.next_attempt:
+            return
+        if self._reconnect and not self._reconnect.done():
+            return
+        self.stats["reconnects"] += 1
+        self._reconnect = asyncio.create_task(self.connect())
+
+    def mark_failed(self, error: Exception):
+        self.stats["errors"] += 1
+        if self.is_connected:
+            logger.warning(f"Modbus: {self.host}:{self.port}/{self.unit_id} failed ({error}). Backing off {self.backoff:.0f}s.")
+        self.is_connected = False
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+            self.client = None
+        self._schedule_retry()
+
+    def _unit(self) -> Dict[str, int]:
+        """Unit-id keyword for this pymodbus version (device_id, slave or unit)."""
+        if self._unit_kwarg is None:
+            params = inspect.signature(self.client.read_holding_registers).parameters
+            self._unit_kwarg = next((k for k in ("device_id", "slave", "unit") if k in params), "")
+        return {self._unit_kwarg: self.unit_id} if self._unit_kwarg else {}
+
+    async def request(self, operation: str, address: int, value: Any = None) -> Any:
+        """
+        Serialized "read", "write" or "write_many" (consecutive registers from `address`).
+        Raises on error; only transport failures take the connection down.
+        """
+        async with self.lock:
+            if not self.is_connected:
+                raise ConnectionError(f"{self.host}:{self.port}/{self.unit_id} is offline")
+            started = time.perf_counter()
+            try:
+                if operation == "read":
+                    call = self.client.read_holding_registers(address, count=1, **self._unit())
+                elif operation == "write_many":
+                    call = self.client.write_registers(address, list(value), **self._unit())
+                else:
+                    call = self.client.write_register(address, value, **self._unit())
+                result = await asyncio.wait_for(call, self.timeout)
+            except Exception as e:
+                self.mark_failed(e)
+                raise
+            if result.isError():
+                self.stats["errors"] += 1
+                raise ModbusExceptionResponse(f"Modbus exception response: {result}")
+            elapsed = (time.perf_counter() - started) * 1000
+            ema = self.stats["latency_ms"]
+            self.stats["latency_ms"] = round(elapsed if ema is None else 0.8 * ema + 0.2 * elapsed, 2)
+            if operation == "read":
+                self.stats["reads"] += 1
+            else:
+                self.stats["writes"] += len(value) if operation == "write_many" else 1
+            return result
+
+    def close(self):
+        if self._reconnect: self._reconnect.cancel()
+        if self.client is not None:
+            self.client.close()
+            self.client = None
         self.is_connected = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "connected": self.is_connected,
+            "retry_in_s": max(0.0, round(self.next_attempt - time.monotonic(), 1)) if not self.is_connected else 0.0
+        }
+
+class ModbusDriver:
+    """
+    Pool of PLC connections addressed by the device named in each PLC_MAP entry.
+    `host`/`port` configure the default device (DEFAULT_DEVICE) when it is not in DEVICES.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 502, devices: Dict[str, Dict[str, Any]] = None):
+        self.host = host
+        self.port = port
+        self.devices = dict(devices if devices is not None else DEVICES)
+        self.devices.setdefault(DEFAULT_DEVICE, {"host": host, "port": port, "unit_id": 1})
+        self.pool: Dict[DeviceKey, PLCConnection] = {}
+        self.started = False  # Background reconnects only after connect() (not in pure simulation)
+
+    def add_device(self, name: str, host: str, port: int = 502, unit_id: int = 1):
+        """Register (or re-address) a named device at runtime."""
+        self.devices[name] = {"host": host, "port": port, "unit_id": unit_id}
+
+    def connection(self, device: str = DEFAULT_DEVICE) -> PLCConnection:
+        """Pooled connection for a named device; devices sharing (host, port, unit) share it."""
+        spec = self.devices.get(device)
+        if spec is None:
+            raise KeyError(f"Unknown PLC device '{device}' (known: {', '.join(sorted(self.devices))})")
+        key = (spec["host"], spec.get("port", 502), spec.get("unit_id", 1))
+        conn = self.pool.get(key)
+        if conn is None:
+            conn = self.pool[key] = PLCConnection(*key, timeout=spec.get("timeout", 1.0))
+        return conn
+
+    @property
+    def is_connected(self) -> bool:
+        return any(conn.is_connected for conn in self.pool.values())
+
+    async def connect(self) -> bool:
+        """Establish connection to every configured PLC at once."""
+        self.started = True
+        connections = {id(c): c for c in (self.connection(name) for name in self.devices)}.values()
+        results = await asyncio.gather(*(conn.connect() for conn in connections))
+        if not any(results):
+            logger.warning(f"Modbus: Hardware offline. Using Simulation Fallback.")
+        return any(results)
+
+    async def disconnect(self):
+        self.started = False
+        for conn in self.pool.values():
+            conn.close()
         logger.info("Modbus: Disconnected")
 
+    def _target(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[PLCConnection]]:
+        reg_info = PLC_MAP.get(key)
+        if not reg_info:
+            return None, None
+        conn = self.connection(reg_info.get("device", DEFAULT_DEVICE))
+        if self.started: conn.ensure_connecting()
+        return reg_info, (conn if conn.is_connected else None)
+
     async def read_sensor(self, key: str) -> Optional[float]:
         """Read a sensor value (Hardware or Sim)."""
-        if self.is_connected:
-            reg_info = PLC_MAP.get(key)
-            if not reg_info: return None
+        reg_info, conn = self._target(key)
+        if conn is not None:
             try:
-                result = await self.client.read_holding_registers(reg_info["addr"], 1)
-                if not result.isError():
-                    raw_val = result.registers[0]
-                    if reg_info["type"] == "float":
-                        return raw_val / 100.0
-                    return float(raw_val)
+                result = await conn.request("read", reg_info["addr"])
+                raw_val = result.registers[0]
+                if reg_info["type"] == "float":
+                    return raw_val / 100.0
+                return float(raw_val)
             except Exception as e:
                 logger.error(f"Modbus Read Error ({key}): {e}")
 
@@ -66,20 +226,68 @@ class ModbusDriver:
         sim_key = mapping.get(key, key)
         return sim_data.get(sim_key)
 
+    @staticmethod
+    def _encode(reg_info: Dict[str, Any], value: Any) -> int:
+        return int(value) if reg_info["type"] == "bool" else int(value * 100)
+
     async def write_actuator(self, key: str, value: Any) -> bool:
-        """Write an actuator state (Hardware or Sim)."""
-        if self.is_connected:
-            reg_info = PLC_MAP.get(key)
-            if not reg_info: return False
+        """
+        Write an actuator state (Hardware or Sim). A failed write to an online
+        PLC returns False: the simulation only stands in for devices that are offline.
+        """
+        reg_info, conn = self._target(key)
+        if conn is not None:
             try:
-                write_val = int(value) if reg_info["type"] == "bool" else int(value * 100)
-                result = await self.client.write_register(reg_info["addr"], write_val)
-                return not result.isError()
+                await conn.request("write", reg_info["addr"], self._encode(reg_info, value))
+                return True
             except Exception as e:
                 logger.error(f"Modbus Write Error ({key}): {e}")
+                return False
 
         # Simulation Fallback
         return greenhouse_sim.set_actuator(key, value, source="agent")
 
+    async def write_actuators(self, values: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Write several actuators with as few requests as possible: per device,
+        consecutive registers go out as one write_registers request. Devices
+        are written concurrently. Offline devices fall back to the simulation;
+        failed writes to online devices report False.
+        """
+        results: Dict[str, bool] = {}
+        by_device: Dict[DeviceKey, list] = {}
+        for key, value in values.items():
+            reg_info, conn = self._target(key)
+            if conn is None:
+                results[key] = greenhouse_sim.set_actuator(key, value, source="agent")
+            else:
+                by_device.setdefault(conn.key, []).append((reg_info["addr"], key, self._encode(reg_info, value)))
+
+        async def _write_device(conn: PLCConnection, points: list):
+            points.sort()
+            runs = [[points[0]]]
+            for point in points[1:]:
+                if point[0] == runs[-1][-1][0] + 1:
+                    runs[-1].append(point)
+                else:
+                    runs.append([point])
+            for run in runs:
+                try:
+                    if len(run) == 1:
+                        await conn.request("write", run[0][0], run[0][2])
+                    else:
+                        await conn.request("write_many", run[0][0], [p[2] for p in run])
+                    results.update({key: True for _, key, _ in run})
+                except Exception as e:
+                    logger.error(f"Modbus Write Error ({', '.join(k for _, k, _ in run)}): {e}")
+                    results.update({key: False for _, key, _ in run})
+
+        await asyncio.gather(*(_write_device(self.pool[key], points) for key, points in by_device.items()))
+        return results
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-device latency/error counters keyed 'host:port/unit'."""
+        return {f"{h}:{p}/{u}": conn.get_stats() for (h, p, u), conn in self.pool.items()}
+
 # Global Instance
 modbus_driver = ModbusDriver()
@@ -1,13 +1,119 @@
 """
 Industrial Safety Watchdog
 Prevents hardware damage from software errors or sensor failure.
+Range, rate-of-change and stale-data rules are compiled into numpy arrays over
+a fixed channel index, so each telemetry frame is checked with a handful of
+vector operations whatever the number of channels. The watchdog subscribes to
+the high-frequency telemetry stream directly.
 """
 import logging
 import time
-from typing import Dict, Any
+import asyncio
+import numpy as np
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Sensory engine channel -> PLC point. Rules are keyed by PLC point; frames may use either name.
+CHANNEL_ALIASES = {
+    "temp_air": "S02_TEMP",
+    "humidity_air": "S03_HUM",
+    "ph_nutrient": "S04_PH",
+    "ec_nutrient": "S05_EC",
+    "lux": "S01_LUX",
+}
+
+# Actuators that must never run at the same time
+DEFAULT_CONFLICTS = [
+    ("A03_PUMP_PH_UP", "A04_PUMP_PH_DOWN"),
+    ("ph_up", "ph_down"),
+]
+
+Violation = Tuple[str, str, float]  # (channel, rule, value)
+
+class SafetyRuleEngine:
+    """
+    Per-channel rules evaluated as one vectorized pass per frame:
+    range (lo <= v <= hi), rate of change (|dv/dt| <= max_rate) and staleness
+    (a channel seen before but silent for more than stale_s). NaN = not reported.
+    Call compile() after changing rules.
+    `budget_ms` is a monitoring threshold, not a deadline: a slow frame is still
+    fully checked, then counted in stats["over_budget"] and logged.
+    """
+    def __init__(self, budget_ms: float = 1.0):
+        self.budget_ms = budget_ms
+        self.ranges: Dict[str, Tuple[float, float]] = {}
+        self.rates: Dict[str, float] = {}
+        self.stale: Dict[str, float] = {}
+        self.stats = {"frames": 0, "violations": 0, "over_budget": 0, "max_us": 0.0, "mean_us": 0.0}
+        self.compile()
+
+    def compile(self, channels: Iterable[str] = ()):
+        """Build the channel index and rule arrays (resets rate/stale history)."""
+        names = sorted(set(channels) | set(self.ranges) | set(self.rates) | set(self.stale))
+        self.channels: List[str] = names
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        for alias, point in CHANNEL_ALIASES.items():
+            if point in self.index: self.index[alias] = self.index[point]
+        n = len(names)
+        self.lo = np.array([self.ranges.get(c, (-np.inf, np.inf))[0] for c in names], dtype=float)
+        self.hi = np.array([self.ranges.get(c, (-np.inf, np.inf))[1] for c in names], dtype=float)
+        self.max_rate = np.array([self.rates.get(c, np.inf) for c in names], dtype=float)
+        self.stale_s = np.array([self.stale.get(c, np.inf) for c in names], dtype=float)
+        self.last = np.full(n, np.nan)
+        self.last_t = np.full(n, np.nan)
+        self._values = np.full(n, np.nan)
+
+    def to_array(self, frame: Dict[str, Any]) -> np.ndarray:
+        """Frame dict -> value vector in channel order (unknown keys ignored)."""
+        values = self._values
+        values.fill(np.nan)
+        index = self.index
+        for key, value in frame.items():
+            i = index.get(key)
+            if i is not None and value is not None:
+                try:
+                    values[i] = value
+                except (TypeError, ValueError):
+                    pass
+        return values
+
+    def evaluate(self, frame: Dict[str, Any], now: float = None) -> List[Violation]:
+        return self.evaluate_array(self.to_array(frame), now)
+
+    def evaluate_array(self, values: np.ndarray, now: float = None) -> List[Violation]:
+        """Check one frame given as a vector in channel order; returns the violations."""
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        reported = ~np.isnan(values)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out_of_range = (values < self.lo) | (values > self.hi)
+            rate = np.abs(values - self.last) / (now - self.last_t)
+            too_fast = reported & (rate > self.max_rate)
+            silent = ~reported & ((now - self.last_t) > self.stale_s)
+
+        violations: List[Violation] = []
+        if out_of_range.any() or too_fast.any() or silent.any():
+            for i in np.flatnonzero(out_of_range): violations.append((self.channels[i], "range", float(values[i])))
+            for i in np.flatnonzero(too_fast): violations.append((self.channels[i], "rate", float(rate[i])))
+            for i in np.flatnonzero(silent): violations.append((self.channels[i], "stale", float(now - self.last_t[i])))
+
+        np.copyto(self.last, values, where=reported)
+        self.last_t[reported] = now
+
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        stats = self.stats
+        stats["frames"] += 1
+        stats["violations"] += len(violations)
+        stats["max_us"] = max(stats["max_us"], elapsed_us)
+        stats["mean_us"] += (elapsed_us - stats["mean_us"]) / stats["frames"]
+        if elapsed_us > self.budget_ms * 1000:
+            stats["over_budget"] += 1
+            if stats["over_budget"] & (stats["over_budget"] - 1) == 0:  # 1st, 2nd, 4th, 8th... occurrence
+                logger.warning(f"SAFETY: Rule check took {elapsed_us:.0f} us (budget {self.budget_ms} ms, {stats['over_budget']} slow frames)")
+        return violations
+
 class SafetyWatchdog:
     def __init__(self):
         self.safe_ranges = {
@@ -15,40 +121,134 @@ class SafetyWatchdog:
             "S04_PH": (4.0, 9.0),
             "S03_HUM": (10.0, 95.0)
         }
+        # Max plausible change per second; faster means a failing sensor or runaway process
+        self.rate_limits = {
+            "S02_TEMP": 5.0,
+            "S04_PH": 1.0,
+            "S03_HUM": 20.0
+        }
+        self.stale_timeout = 30.0
+        # Consecutive rate violations before a channel trips the lock. A single
+        # glitched sample violates twice (jump and return), so it only raises an alarm.
+        self.rate_trip_frames = 3
+        self._rate_streak: Dict[str, int] = {}
+        self.alarms: Dict[str, str] = {}  # Non-latching: channel -> current rate alarm
+        self.conflicts: Dict[str, set] = {}
+        for a, b in DEFAULT_CONFLICTS: self.add_conflict(a, b)
+        self.actuator_state: Dict[str, Any] = {}
         self.last_sensor_update = time.time()
         self.emergency_lock = False
+        self._alerts = set()
+        self._attached = False
+        self.engine = SafetyRuleEngine()
+        self.compile()
+
+    def compile(self):
+        """Recompile the rule engine from safe_ranges / rate_limits / stale_timeout."""
+        self.engine.ranges = dict(self.safe_ranges)
+        self.engine.rates = dict(self.rate_limits)
+        self.engine.stale = {c: self.stale_timeout for c in set(self.safe_ranges) | set(self.rate_limits)}
+        self.engine.compile()
+
+    def add_conflict(self, actuator_a: str, actuator_b: str):
+        self.conflicts.setdefault(actuator_a, set()).add(actuator_b)
+        self.conflicts.setdefault(actuator_b, set()).add(actuator_a)
+
+    async def attach(self, bus: Any = None, topic: str = "telemetry/high_freq"):
+        """Check every high-frequency telemetry frame as it is published."""
+        if self._attached: return
+        if bus is None:
+            from ..bus import bus
+        await bus.subscribe(topic, self._on_frame)
+        self._attached = True
+        logger.info(f"SAFETY: Watchdog subscribed to {topic}")
+
+    async def _on_frame(self, data: Any):
+        sensors = data.get("raw", data) if isinstance(data, dict) else None
+        if sensors:
+            self.check_telemetry(sensors)
 
-    def validate_actuator_request(self, actuator_id: str, value: Any) -> bool:
-        """Checks if a command is safe to execute."""
+    def validate_actuator_request(self, actuator_id: str, value: Any, pending: Dict[str, Any] = None) -> bool:
+        """
+        Checks if a command is safe to execute. Conflicts are checked against
+        written actuator state plus `pending` (other commands going out in the same batch).
+        """
         if self.emergency_lock:
             logger.error("SAFETY: Emergency Lock active. Command REJECTED.")
             return False
 
-        # Example: Prevent pH Up and pH Down from running simultaneously
-        # (Conflict Resolution)
+        # Conflict Resolution: e.g. pH Up and pH Down never run simultaneously
+        if value:
+            pending = pending or {}
+            active = [other for other in self.conflicts.get(actuator_id, ()) if self.actuator_state.get(other) or pending.get(other)]
+            if active:
+                logger.error(f"SAFETY: {actuator_id} conflicts with active {active}. Command REJECTED.")
+                return False
         return True
 
-    def check_telemetry(self, sensors: Dict[str, Any]):
+    def record_actuator(self, actuator_id: str, value: Any):
+        """Track an actuator's state once its write has succeeded."""
+        self.actuator_state[actuator_id] = value
+
+    def check_telemetry(self, sensors: Dict[str, Any], now: float = None):
         """Sanity check on all incoming sensor data."""
-        now = time.time()
+        now = time.time() if now is None else now
+        reasons = []
 
         # 1. Timeout Check
-        if now - self.last_sensor_update > 30.0:
+        if now - self.last_sensor_update > self.stale_timeout:
             logger.critical("SAFETY: Sensor Data Outdated! Entering Safe State.")
-            self.trigger_emergency_stop()
+            reasons.append("Sensor data outdated")
+
+        # 2. Range / Rate / Per-channel staleness (one vectorized pass)
+        too_fast = set()
+        for channel, rule, value in self.engine.evaluate(sensors, now):
+            if rule == "rate":
+                too_fast.add(channel)
+                streak = self._rate_streak[channel] = self._rate_streak.get(channel, 0) + 1
+                if streak < self.rate_trip_frames:
+                    self.alarms[channel] = f"rate {value:.3g}/s ({streak}/{self.rate_trip_frames})"
+                    logger.warning(f"SAFETY: {channel} RATE ALARM ({value:.3g}/s, {streak}/{self.rate_trip_frames} frames).")
+                    continue
+            logger.critical(f"SAFETY: {channel} {rule.upper()} VIOLATION ({value:.3g}). SHUTTING DOWN.")
+            reasons.append(f"{channel} {rule} violation ({value:.3g})")
+        for channel in [c for c in self._rate_streak if c not in too_fast]:
+            del self._rate_streak[channel]
+            self.alarms.pop(channel, None)
 
-        # 2. Range Check
-        for key, (min_v, max_v) in self.safe_ranges.items():
-            val = sensors.get(key)
-            if val is not None and (val < min_v or val > max_v):
-                logger.critical(f"SAFETY: {key} OUT OF RANGE ({val}). SHUTTING DOWN.")
-                self.trigger_emergency_stop()
+        if reasons and not self.emergency_lock:
+            self.trigger_emergency_stop("; ".join(reasons))
 
         self.last_sensor_update = now
 
-    def trigger_emergency_stop(self):
+    def trigger_emergency_stop(self, reason: str = "Emergency stop"):
         self.emergency_lock = True
         logger.info("SAFETY: ALL ACTUATORS REJECTED. MANUAL RESET REQUIRED.")
         # In a real system, we'd send a hard Modbus broadcast to kill all relays here.
+        self._notify_supervisor(reason)
+
+    def _notify_supervisor(self, reason: str):
+        """URGENT escalation to the Supervisor; it is served ahead of any queued work."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (CLI/tests): the lock alone is enough
+
+        async def _send():
+            from ..bus import bus
+            from ..protocol import A2AMessage, MessagePriority
+            try:
+                await bus.send_request(A2AMessage(
+                    from_agent="safety_watchdog",
+                    to_agent="supervisor_01",
+                    content={"escalation": {"reason": reason, "emergency_lock": True}},
+                    priority=MessagePriority.URGENT
+                ), timeout=10.0)
+            except Exception as e:
+                logger.error(f"SAFETY: Escalation to Supervisor failed: {e}")
+
+        task = loop.create_task(_send())
+        self._alerts.add(task)
+        task.add_done_callback(self._alerts.discard)
 
 safety_watchdog = SafetyWatchdog()
@@ -6,7 +6,8 @@ Handles 10Hz+ polling, edge-filtering, and Latent Variable Inference.
 import logging
 import asyncio
 import numpy as np
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from .modbus_driver import modbus_driver
 from ..bus import bus
@@ -21,8 +22,10 @@ class SensoryEngine:
     def __init__(self, polling_rate: float = 0.1): # 10Hz Default
         self.polling_rate = polling_rate
         self.is_running = False
-        self.raw_buffer: Dict[str, List[float]] = {}
         self.buffer_size = 100  # Keep last 10 seconds of 10Hz data
+        self.raw_buffer: Dict[str, Deque[float]] = {}
+        self.seq_buffer: Dict[str, Deque[int]] = {}  # Sample sequence numbers, parallel to raw_buffer
+        self.seq = 0  # Sequence number of the latest acquisition cycle
         self.latent_states: Dict[str, float] = {}
 
     async def start(self):
@@ -48,12 +51,7 @@ class SensoryEngine:
                 sensor_data = dict(zip(sensors, results))
 
                 # 2. Update Frequency Buffers
-                for s, val in sensor_data.items():
-                    if val is not None:
-                        if s not in self.raw_buffer: self.raw_buffer[s] = []
-                        self.raw_buffer[s].append(val)
-                        if len(self.raw_buffer[s]) > self.buffer_size:
-                            self.raw_buffer[s].pop(0)
+                self.record_samples(sensor_data)
 
                 # 3. EDGE INFERENCE: Latent Variable Calculation (Genius Tier)
                 await self._perform_inference(sensor_data)
@@ -73,6 +71,51 @@ class SensoryEngine:
                 logger.error(f"Sensory Loop Error: {e}")
                 await asyncio.sleep(1)
 
+    def record_samples(self, sensor_data: Dict[str, Optional[float]]) -> int:
+        """Append one acquisition cycle to the ring buffers; returns its sequence number."""
+        self.seq += 1
+        for s, val in sensor_data.items():
+            if val is not None:
+                if s not in self.raw_buffer:
+                    self.raw_buffer[s] = deque(maxlen=self.buffer_size)
+                    self.seq_buffer[s] = deque(maxlen=self.buffer_size)
+                self.raw_buffer[s].append(val)
+                self.seq_buffer[s].append(self.seq)
+        return self.seq
+
+    def window(self, since_seq: int = 0) -> Dict[str, Tuple[Tuple[int, float], ...]]:
+        """(seq, value) samples newer than `since_seq` per channel (at most the buffer)."""
+        result = {}
+        for s, values in self.raw_buffer.items():
+            seqs = self.seq_buffer[s]
+            fresh = []
+            for i in range(len(seqs) - 1, -1, -1):  # Newest first, stop at the first old sample
+                if seqs[i] <= since_seq: break
+                fresh.append((seqs[i], values[i]))
+            result[s] = tuple(reversed(fresh))
+        return result
+
+    def channel_stats(self) -> Dict[str, Dict[str, float]]:
+        """last/mean/min/max and least-squares slope (units per second) over each buffer."""
+        stats = {}
+        for s, values in self.raw_buffer.items():
+            if not values: continue
+            y = np.fromiter(values, dtype=float, count=len(values))
+            x = np.fromiter(self.seq_buffer[s], dtype=float, count=len(values)) * self.polling_rate
+            slope = 0.0
+            if len(y) > 1:
+                dx = x - x.mean()
+                denom = float(np.dot(dx, dx))
+                if denom: slope = float(np.dot(dx, y - y.mean()) / denom)
+            stats[s] = {
+                "last": float(y[-1]),
+                "mean": float(y.mean()),
+                "min": float(y.min()),
+                "max": float(y.max()),
+                "slope": slope
+            }
+        return stats
+
     async def _perform_inference(self, data: Dict[str, Optional[float]]):
         """
         Calculate Latent Variables (States that aren't directly measured).
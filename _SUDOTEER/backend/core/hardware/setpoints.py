@@ -0,0 +1,115 @@
+"""
+_SUDOTEER Setpoint Manager
+Sits between actuator commands and the hardware: remembers what each actuator
+was last commanded and last successfully written (the writer reported success;
+there is no read-back), so agents reacting to every telemetry frame do not
+hammer relays with writes that change nothing.
+"""
+import os
+import time
+import logging
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger("_SUDOTEER")
+
+_UNSET = object()
+
+class SetpointManager:
+    """
+    - Redundant requests (value already last_written) are answered without a write.
+    - Requests inside `window` seconds coalesce; the last value wins.
+    - Writes to one actuator are at least `min_interval` seconds apart (relay protection).
+    - Each flush hands every due change to `writer` as one batch, so the driver
+      can group them per device.
+    `writer(values) -> {actuator_id: success}`. `force=True` bypasses dedup and
+    rate limiting (safe-state commands).
+    """
+    def __init__(self, writer: Callable[[Dict[str, Any]], Awaitable[Dict[str, bool]]], window: float = 0.05, min_interval: float = None):
+        self.writer = writer
+        self.window = window
+        self.min_interval = float(os.getenv("SUDOTEER_SETPOINT_MIN_INTERVAL", "2")) if min_interval is None else min_interval
+        self.commanded: Dict[str, Any] = {}
+        self.last_written: Dict[str, Any] = {}
+        self.last_write: Dict[str, float] = {}
+        self._pending: Dict[str, Tuple[Any, asyncio.Future]] = {}
+        self._forced: Set[str] = set()
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"requested": 0, "suppressed": 0, "coalesced": 0, "rate_limited": 0, "written": 0, "failed": 0, "batches": 0}
+
+    async def request(self, actuator_id: str, value: Any, force: bool = False) -> bool:
+        """Ask for `actuator_id` = `value`; resolves once the (possibly coalesced) write is done."""
+        self.stats["requested"] += 1
+        pending = self._pending.get(actuator_id)
+
+        if not force and self.last_written.get(actuator_id, _UNSET) == value:
+            self.stats["suppressed"] += 1
+            self.commanded[actuator_id] = value
+            if pending is not None:
+                # The burst went back to the written value: nothing left to write
+                del self._pending[actuator_id]
+                if not pending[1].done(): pending[1].set_result(True)
+            return True
+
+        self.commanded[actuator_id] = value
+        if force: self._forced.add(actuator_id)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            future = pending[1]
+        else:
+            future = asyncio.get_running_loop().create_future()
+        self._pending[actuator_id] = (value, future)
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return await asyncio.shield(future)
+
+    async def _flush_loop(self):
+        while self._pending:
+            await asyncio.sleep(self.window)  # Let a burst collapse into one value
+            now = time.monotonic()
+            due = {}
+            for actuator_id in list(self._pending):
+                ready_at = self.last_write.get(actuator_id, float("-inf")) + self.min_interval
+                if actuator_id in self._forced or now >= ready_at:
+                    due[actuator_id] = self._pending.pop(actuator_id)
+                    self._forced.discard(actuator_id)
+
+            if not due:
+                self.stats["rate_limited"] += 1
+                wake = min(self.last_write[a] + self.min_interval for a in self._pending)
+                await asyncio.sleep(max(0.0, wake - now - self.window))
+                continue
+
+            self.stats["batches"] += 1
+            try:
+                results = await self.writer({a: value for a, (value, _) in due.items()})
+            except Exception as e:
+                logger.error(f"Setpoints: Batch write failed: {e}")
+                results = {}
+
+            written_at = time.monotonic()
+            for actuator_id, (value, future) in due.items():
+                ok = bool(results.get(actuator_id, False))
+                if ok:
+                    self.last_written[actuator_id] = value
+                    self.last_write[actuator_id] = written_at
+                    self.stats["written"] += 1
+                else:
+                    self.stats["failed"] += 1
+                if not future.done(): future.set_result(ok)
+
+    def forget(self, actuator_id: str = None):
+        """Drop last_written state (e.g. after a PLC restart) so the next request is written."""
+        if actuator_id is None:
+            self.last_written.clear()
+        else:
+            self.last_written.pop(actuator_id, None)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "commanded": dict(self.commanded),
+            "last_written": dict(self.last_written),
+            "pending": {a: value for a, (value, _) in self._pending.items()},
+            **self.stats
+        }
@@ -0,0 +1,242 @@
+"""
+_SUDOTEER Agent Inboxes
+Every agent registered on the bus gets a bounded request queue served by a
+fixed pool of async workers, so concurrent workflows share agents fairly and
+throughput scales with the worker count instead of piling onto one instance.
+Requests are served by MessagePriority: URGENT first (and never left waiting
+for a free worker), then HIGH/NORMAL/LOW with aging so LOW cannot starve.
+"""
+import os
+import time
+import asyncio
+import logging
+import itertools
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from .protocol import MessagePriority
+
+logger = logging.getLogger("_SUDOTEER")
+
+# Agents currently handling a request in this call chain. A request to one of
+# them (A -> B -> A) bypasses the inbox, otherwise it could wait on itself.
+_call_chain: ContextVar[Tuple[str, ...]] = ContextVar("a2a_call_chain", default=())
+
+# Absolute deadline (epoch seconds) of the request being handled. Nested
+# requests never outlive the request that caused them.
+_deadline: ContextVar[Optional[float]] = ContextVar("a2a_deadline", default=None)
+
+# Priority of the request being handled; nested requests inherit it if higher
+_priority: ContextVar[MessagePriority] = ContextVar("a2a_priority", default=MessagePriority.LOW)
+
+# Request metadata key: the handler's LM calls bypass the response cache
+# (retries and other steps that must not get the previous answer back)
+NO_CACHE_KEY = "no_cache"
+
+# Lower rank is served first
+PRIORITY_RANK = {
+	MessagePriority.URGENT: 0,
+	MessagePriority.HIGH: 1,
+	MessagePriority.NORMAL: 2,
+	MessagePriority.LOW: 3
+}
+
+class AdmissionError(RuntimeError):
+	"""Raised when a queue is too deep to accept more work."""
+
+class A2ATimeoutError(asyncio.TimeoutError):
+	"""Raised when a request misses its deadline (queued or running)."""
+
+class AgentInbox:
+	"""
+	Priority request queue for one agent, drained by `workers` concurrent handlers.
+	One FIFO lane per MessagePriority. Waiting requests gain one priority level
+	every `aging_seconds` (up to HIGH), so a flood of NORMAL work cannot starve LOW.
+	URGENT requests never wait for a worker: if all are busy they run at once
+	on an extra handler.
+	"""
+	def __init__(self, agent_id: str, handler: Callable[[Any], Awaitable[Any]], workers: int = None, max_depth: int = None, aging_seconds: float = None):
+		self.agent_id = agent_id
+		self.handler = handler
+		self.workers = workers or int(os.getenv("SUDOTEER_AGENT_WORKERS", "2"))
+		self.max_depth = max_depth or int(os.getenv("SUDOTEER_INBOX_MAX_DEPTH", "64"))
+		self.aging_seconds = aging_seconds or float(os.getenv("SUDOTEER_INBOX_AGING_S", "5"))
+		self._lanes: Dict[MessagePriority, deque] = {p: deque() for p in PRIORITY_RANK}
+		self._ready: Optional[asyncio.Semaphore] = None
+		self._seq = itertools.count()
+		self._tasks = []
+		self._loop = None
+		self._idle = 0
+		self._futures: Dict[str, asyncio.Future] = {}  # message_id -> caller future
+		self.stats = {"processed": 0, "errors": 0, "rejected": 0, "expired": 0, "cancelled": 0, "in_flight": 0, "preempted": 0, "aged": 0}
+		self.served = {p.value: 0 for p in PRIORITY_RANK}
+
+	@property
+	def depth(self) -> int:
+		return sum(len(lane) for lane in self._lanes.values())
+
+	def _ensure_workers(self):
+		"""Start the worker pool on the running loop (restarted if the loop changed)."""
+		loop = asyncio.get_running_loop()
+		if self._loop is loop and self._tasks:
+			return
+		if self._loop is not loop:
+			self._lanes = {p: deque() for p in PRIORITY_RANK}
+			self._ready = asyncio.Semaphore(0)
+			self._idle = 0
+		self._loop = loop
+		self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+	def resize(self, workers: int):
+		"""Change the worker count. Extra workers retire after their current request."""
+		self.workers = workers
+		if self._tasks:
+			for i in range(workers):
+				if i >= len(self._tasks):
+					self._tasks.append(asyncio.create_task(self._worker(i)))
+				elif self._tasks[i].done():
+					self._tasks[i] = asyncio.create_task(self._worker(i))
+
+	def _pop(self) -> Optional[tuple]:
+		"""Next request: URGENT strictly first, otherwise best aged rank, oldest first."""
+		if self._lanes[MessagePriority.URGENT]:
+			return self._lanes[MessagePriority.URGENT].popleft()
+		now = time.monotonic()
+		best, best_key = None, None
+		for priority, lane in self._lanes.items():
+			if not lane or priority is MessagePriority.URGENT:
+				continue
+			seq, enqueued = lane[0][0], lane[0][1]
+			aged = max(PRIORITY_RANK[MessagePriority.HIGH], PRIORITY_RANK[priority] - int((now - enqueued) / self.aging_seconds))
+			key = (aged, seq)
+			if best_key is None or key < best_key:
+				best, best_key = priority, key
+		if best is None:
+			return None
+		if best_key[0] < PRIORITY_RANK[best]:
+			self.stats["aged"] += 1
+		return self._lanes[best].popleft()
+
+	async def submit(self, message: Any, deadline: float = None) -> Any:
+		"""
+		Queue a request and wait for the agent's answer until `deadline`.
+		Missing the deadline, or cancelling the caller, cancels the handler.
+		"""
+		remaining = None if deadline is None else deadline - time.time()
+		if remaining is not None and remaining <= 0:
+			self.stats["expired"] += 1
+			raise A2ATimeoutError(f"Request to {self.agent_id} expired before dispatch")
+
+		chain = _call_chain.get()
+		if self.agent_id in chain:
+			try:
+				return await asyncio.wait_for(self._handle(message, chain, deadline), remaining)
+			except asyncio.TimeoutError:
+				raise A2ATimeoutError(f"Request to {self.agent_id} timed out") from None
+
+		self._ensure_workers()
+		if self.depth >= self.max_depth:
+			self.stats["rejected"] += 1
+			raise AdmissionError(f"Inbox of {self.agent_id} is full ({self.depth} queued)")
+
+		future = self._loop.create_future()
+		message_id = getattr(message, "message_id", None)
+		if message_id: self._futures[message_id] = future
+		priority = getattr(message, "priority", MessagePriority.NORMAL)
+		entry = (next(self._seq), time.monotonic(), message, future, chain, deadline)
+
+		if priority is MessagePriority.URGENT and self._idle == 0:
+			# Every worker is busy: serve the urgent request now instead of queueing it
+			self.stats["preempted"] += 1
+			asyncio.create_task(self._serve(entry, priority))
+		else:
+			self._lanes[priority].append(entry)
+			self._ready.release()
+		try:
+			return await asyncio.wait_for(future, remaining)
+		except asyncio.TimeoutError:
+			self.stats["expired"] += 1
+			raise A2ATimeoutError(f"Request to {self.agent_id} missed its deadline") from None
+		finally:
+			if message_id: self._futures.pop(message_id, None)
+
+	def cancel(self, message_id: str) -> bool:
+		"""Cancel a queued or running request; its caller sees CancelledError."""
+		future = self._futures.get(message_id)
+		if future and not future.done():
+			self.stats["cancelled"] += 1
+			return future.cancel()
+		return False
+
+	async def _handle(self, message: Any, chain: Tuple[str, ...], deadline: Optional[float]) -> Any:
+		chain_token = _call_chain.set(chain + (self.agent_id,))
+		deadline_token = _deadline.set(deadline)
+		priority_token = _priority.set(getattr(message, "priority", MessagePriority.NORMAL))
+		try:
+			if (getattr(message, "metadata", None) or {}).get(NO_CACHE_KEY):
+				from .llm.cache import llm_cache
+				with llm_cache.disabled():
+					return await self.handler(message)
+			return await self.handler(message)
+		finally:
+			_priority.reset(priority_token)
+			_deadline.reset(deadline_token)
+			_call_chain.reset(chain_token)
+
+	async def _worker(self, index: int):
+		while index < self.workers:
+			self._idle += 1
+			try:
+				await self._ready.acquire()
+			finally:
+				self._idle -= 1
+			if index >= self.workers:
+				self._ready.release()  # Retired by resize(): leave the request to the pool
+				break
+			entry = self._pop()
+			if entry is not None:
+				await self._serve(entry, getattr(entry[2], "priority", MessagePriority.NORMAL))
+
+	async def _serve(self, entry: tuple, priority: MessagePriority):
+		_, _, message, future, chain, deadline = entry
+		if future.done():
+			return  # Caller gave up (timeout or cancel) while it was queued
+		self.served[priority.value] += 1
+		handler = asyncio.create_task(self._handle(message, chain, deadline))
+		# Propagate caller cancellation/timeouts into the running handler
+		future.add_done_callback(lambda f, task=handler: task.cancel() if f.cancelled() else None)
+		self.stats["in_flight"] += 1
+		try:
+			await asyncio.wait({handler})
+		except asyncio.CancelledError:
+			handler.cancel()  # Pool is being stopped
+			if not future.done(): future.cancel()
+			raise
+		finally:
+			self.stats["in_flight"] -= 1
+
+		if future.done():
+			return
+		if handler.cancelled():
+			future.cancel()
+		elif handler.exception() is not None:
+			self.stats["errors"] += 1
+			future.set_exception(handler.exception())
+		else:
+			self.stats["processed"] += 1
+			future.set_result(handler.result())
+
+	def stop(self):
+		for task in self._tasks: task.cancel()
+		self._tasks = []
+		self._idle = 0
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {
+			**self.stats,
+			"depth": self.depth,
+			"depth_by_priority": {p.value: len(lane) for p, lane in self._lanes.items()},
+			"served_by_priority": dict(self.served),
+			"workers": self.workers,
+			"max_depth": self.max_depth
+		}
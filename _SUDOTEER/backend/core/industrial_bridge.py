@@ -1,10 +1,12 @@
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from .bus import bus
+from .topics import freeze
 from .hardware.safety import safety_watchdog
 from .hardware.modbus_driver import modbus_driver
 from .hardware.sensory_engine import sensory_engine
+from .hardware.setpoints import SetpointManager
 
 logger = logging.getLogger("_SUDOTEER")
 
@@ -18,6 +20,9 @@ class IndustrialBridge:
 		self.mode = mode # 'simulation' or 'hardware'
 		self.connected = False
 		self.is_streaming = False
+		self.stream_seq = 0  # Last sensory sequence number published
+		self.setpoints = SetpointManager(self._apply_setpoints)
+		self._submitted: Set[asyncio.Task] = set()  # Fire-and-forget writes (strong refs)
 
 	async def connect(self):
 		"""Initialize hardware connection and sensory engine."""
@@ -34,7 +39,8 @@ class IndustrialBridge:
 			self.connected = True
 			logger.info("Industrial Bridge initiated in Simulation Mode.")
 
-		# 2. Start the High-Freq Sensory Engine (10Hz)
+		# 2. Start the High-Freq Sensory Engine (10Hz), watched frame by frame
+		await safety_watchdog.attach(bus)
 		await sensory_engine.start()
 
 		# 3. Start the UI/A2A Streaming Loop
@@ -50,26 +56,37 @@ class IndustrialBridge:
 		"""
 		while self.is_streaming:
 			try:
-				# Combine raw signals and latent insights
-				payload = {
-					"timestamp": asyncio.get_event_loop().time(),
-					"mode": self.mode,
-					"latent": sensory_engine.latent_states,
-					"raw": sensory_engine.raw_buffer
-				}
-
 				# Publish for all Agents and the UI Dashboard
-				await bus.publish("telemetry/industrial", payload)
+				await bus.publish("telemetry/industrial", self.build_frame())
 
 				await asyncio.sleep(0.5) # 2Hz Awareness Stream
 			except Exception as e:
 				logger.error(f"Telemetry Stream Error: {e}")
 				await asyncio.sleep(1)
 
-	async def write_setpoint(self, actuator_id: str, value: Any) -> bool:
+	def build_frame(self) -> Dict[str, Any]:
+		"""
+		One stream frame: samples newer than the previous frame (`since` < seq <= `seq`)
+		plus last/mean/min/max/slope per channel over the sensory buffer.
+		Frozen, so every subscriber shares it without copying or aliasing live buffers.
+		"""
+		since, self.stream_seq = self.stream_seq, sensory_engine.seq
+		return freeze({
+			"timestamp": asyncio.get_event_loop().time(),
+			"mode": self.mode,
+			"seq": self.stream_seq,
+			"since": since,
+			"window": sensory_engine.window(since),
+			"stats": sensory_engine.channel_stats(),
+			"latent": sensory_engine.latent_states
+		})
+
+	async def write_setpoint(self, actuator_id: str, value: Any, force: bool = False) -> bool:
 		"""
 		Validated hardware write.
 		Follows the 'Trust but Verify' protocol by checking against the Safety Watchdog.
+		Goes through the SetpointManager: unchanged values are not rewritten, bursts
+		coalesce and relays are rate-limited. `force` bypasses both (safe-state commands).
 		"""
 		if not self.connected:
 			logger.error(f"Bridge not connected. Refusing command: {actuator_id}")
@@ -80,23 +97,54 @@ class IndustrialBridge:
 			logger.error(f"⚠ SAFETY VIOLATION: Command rejected for {actuator_id}")
 			return False
 
+		return await self.setpoints.request(actuator_id, value, force=force)
+
+	def submit_setpoint(self, actuator_id: str, value: Any, force: bool = False) -> asyncio.Task:
+		"""
+		write_setpoint without waiting: for telemetry callbacks, which the bus awaits
+		in line with the stream (a coalesced, rate-limited write can take seconds).
+		"""
+		task = asyncio.create_task(self.write_setpoint(actuator_id, value, force=force))
+		self._submitted.add(task)
+		task.add_done_callback(self._submitted.discard)
+		return task
+
+	async def _apply_setpoints(self, values: Dict[str, Any]) -> Dict[str, bool]:
+		"""SetpointManager writer: one batch of actuator changes."""
+		# Re-check: a deferred write may outlive an emergency stop (and a batch may hold both sides of a conflict)
+		allowed: Dict[str, Any] = {}
+		for actuator_id, value in values.items():
+			if safety_watchdog.validate_actuator_request(actuator_id, value, pending=allowed):
+				allowed[actuator_id] = value
+		results = {a: False for a in values if a not in allowed}
+		if not allowed:
+			return results
+
 		# 2. PHYSICAL EXECUTION
 		if self.mode == "hardware":
-			success = await modbus_driver.write_actuator(actuator_id, value)
-			if success:
-				logger.info(f"✓ Hardware Write: {actuator_id} = {value}")
-			else:
-				logger.error(f"✖ Hardware Write FAILED: {actuator_id}")
-			return success
+			written = await modbus_driver.write_actuators(allowed)
+			for actuator_id, success in written.items():
+				if success:
+					logger.info(f"✓ Hardware Write: {actuator_id} = {allowed[actuator_id]}")
+				else:
+					logger.error(f"✖ Hardware Write FAILED: {actuator_id}")
+			results.update(written)
 		else:
 			# Simulation logic
-			logger.info(f"Simulated Write: {actuator_id} = {value}")
-			return True
+			for actuator_id, value in allowed.items():
+				logger.info(f"Simulated Write: {actuator_id} = {value}")
+				results[actuator_id] = True
+
+		for actuator_id, value in allowed.items():
+			if results.get(actuator_id):
+				safety_watchdog.record_actuator(actuator_id, value)
+		return results
 
 	async def disconnect(self):
 		self.is_streaming = False
 		await sensory_engine.stop()
 		await modbus_driver.disconnect()
+		bus.flush_telemetry()  # Record the last partial telemetry summaries
 		self.connected = False
 		logger.info("Industrial Bridge disconnected.")
 
@@ -0,0 +1,185 @@
+"""
+_SUDOTEER LLM Response Cache
+Content-addressed, on-disk cache for deterministic DSPy calls.
+SQLite (WAL) so the agency process and the scripts can share one cache file.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+import dspy
+from .gateway import InferenceGateway, inference_gateway
+
+logger = logging.getLogger("_SUDOTEER")
+
+# Per-call opt-out. ContextVars follow the gateway's offload threads, so a `with llm_cache.disabled():`
+# around an agent step also covers the DSPy call running in the worker thread.
+_cache_disabled: ContextVar[bool] = ContextVar("llm_cache_disabled", default=False)
+
+# Call kwarg that skips the cache for a single call (e.g. Predict(..., config={"no_cache": True}))
+NO_CACHE_KWARG = "no_cache"
+
+class LLMResponseCache:
+	"""
+	Maps sha256(model, prompt/messages, temperature, call kwargs) -> LM outputs.
+	The rendered messages carry the signature and its inputs, so identical
+	prompts for the same signature share an entry. Least-recently-used entries
+	are evicted once the file exceeds `max_bytes`.
+	"""
+	def __init__(self, path: str = None, max_bytes: int = None):
+		self.path = path or os.getenv("SUDOTEER_LLM_CACHE", "sandbox/llm_cache/responses.sqlite")
+		self.max_bytes = max_bytes or int(os.getenv("SUDOTEER_LLM_CACHE_MB", "256")) * 1024 * 1024
+		self.enabled = os.getenv("SUDOTEER_LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+		self.hits = 0
+		self.misses = 0
+		self._conn: Optional[sqlite3.Connection] = None
+		self._lock = threading.Lock()
+
+	def _connect(self) -> sqlite3.Connection:
+		if self._conn is None:
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			conn.execute(
+				"CREATE TABLE IF NOT EXISTS responses ("
+				"key TEXT PRIMARY KEY, model TEXT, value TEXT, size INTEGER, "
+				"created REAL, last_access REAL)"
+			)
+			conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+			self._conn = conn
+		return self._conn
+
+	@staticmethod
+	def make_key(model: str, prompt: Any, messages: Any, kwargs: Dict[str, Any]) -> str:
+		payload = json.dumps({
+			"model": model,
+			"prompt": prompt,
+			"messages": messages,
+			"temperature": kwargs.get("temperature"),
+			"kwargs": {k: v for k, v in kwargs.items() if k != "temperature"}
+		}, sort_keys=True, default=str)
+		return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+	@property
+	def active(self) -> bool:
+		return self.enabled and not _cache_disabled.get()
+
+	@contextmanager
+	def disabled(self):
+		"""Bypass the cache for every LM call made inside this block."""
+		token = _cache_disabled.set(True)
+		try:
+			yield
+		finally:
+			_cache_disabled.reset(token)
+
+	def get(self, key: str) -> Optional[List[Any]]:
+		try:
+			with self._lock:
+				conn = self._connect()
+				row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+				if row:
+					conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+		except sqlite3.Error as e:
+			logger.warning(f"LLMCache: Read failed: {e}")
+			return None
+		return json.loads(row[0]) if row else None
+
+	def put(self, key: str, model: str, outputs: List[Any]):
+		try:
+			value = json.dumps(outputs)
+		except (TypeError, ValueError):
+			return  # Non-serializable outputs (e.g. tool-call objects) are not cached
+		now = time.time()
+		try:
+			with self._lock:
+				conn = self._connect()
+				conn.execute(
+					"INSERT OR REPLACE INTO responses (key, model, value, size, created, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+					(key, model, value, len(value), now, now)
+				)
+				self._evict(conn)
+		except sqlite3.Error as e:
+			logger.warning(f"LLMCache: Write failed: {e}")
+
+	def _evict(self, conn: sqlite3.Connection):
+		"""Drop least-recently-used entries until the cache is back under 90% of max_bytes."""
+		total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+		if total <= self.max_bytes:
+			return
+		target = int(self.max_bytes * 0.9)
+		freed = 0
+		victims = []
+		for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+			victims.append((key,))
+			freed += size
+			if total - freed <= target:
+				break
+		conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+		logger.info(f"LLMCache: Evicted {len(victims)} entries ({freed} bytes).")
+
+	def record(self, hit: bool):
+		from backend.utils.finance import finance_tracker
+		if hit:
+			self.hits += 1
+		else:
+			self.misses += 1
+		finance_tracker.log_cache(hit)
+
+	def clear(self):
+		with self._lock:
+			self._connect().execute("DELETE FROM responses")
+
+	def get_stats(self) -> Dict[str, Any]:
+		total = self.hits + self.misses
+		return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+# Global cache shared by every CachedLM in this process
+llm_cache = LLMResponseCache()
+
+class CachedLM(dspy.LM):
+	"""
+	dspy.LM that consults the shared on-disk cache before calling the model.
+	Misses go through the inference gateway, which caps in-flight calls per
+	backend and coalesces identical prompts already in flight.
+	Opt out of caching per call with `no_cache=True` (or `config={"no_cache": True}`
+	on a predictor), for a whole block with `llm_cache.disabled()`, or for an
+	A2A request with metadata {"no_cache": True} (see AgentInbox).
+	"""
+	def __init__(self, *args, response_cache: LLMResponseCache = None, gateway: InferenceGateway = None, **kwargs):
+		# DSPy's own cache stays off; ours is shared across processes.
+		kwargs["cache"] = False
+		super().__init__(*args, **kwargs)
+		self.response_cache = response_cache or llm_cache
+		self.gateway = gateway or inference_gateway
+		self.backend = kwargs.get("api_base") or self.model
+
+	def __call__(self, prompt=None, messages=None, **kwargs):
+		skip = kwargs.pop(NO_CACHE_KWARG, False)
+		call = super().__call__
+		cache = self.response_cache
+		if skip or not cache.active:
+			return self.gateway.run(self.backend, lambda: call(prompt=prompt, messages=messages, **kwargs))
+
+		key = cache.make_key(self.model, prompt, messages, {**self.kwargs, **kwargs})
+		cached = cache.get(key)
+		if cached is not None:
+			cache.record(hit=True)
+			return cached
+
+		cache.record(hit=False)
+		outputs = self.gateway.run(self.backend, lambda: call(prompt=prompt, messages=messages, **kwargs), key=key)
+		if isinstance(outputs, list):
+			cache.put(key, self.model, outputs)
+		return outputs
+
+	async def acall(self, prompt=None, messages=None, **kwargs):
+		"""Async path (Predict.acall / aforward): same cache and gateway, off the event loop."""
+		return await self.gateway.offload(self.__call__, prompt, messages=messages, **kwargs)
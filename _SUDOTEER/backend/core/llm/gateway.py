@@ -0,0 +1,194 @@
+"""
+_SUDOTEER Inference Gateway
+Central admission point for every DSPy LM call.
+Caps in-flight requests per backend, serves waiters by priority class,
+coalesces identical in-flight prompts and records queue-time metrics.
+Async code hands blocking LM calls to `offload`, which runs them on the
+gateway's own thread pool: callers queued for a slot park those threads,
+not the default executor shared with checkpoints, the reporter and discovery.
+"""
+import os
+import time
+import heapq
+import asyncio
+import logging
+import functools
+import itertools
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger("_SUDOTEER")
+
+class LLMPriority(IntEnum):
+	"""Lower value is served first."""
+	SAFETY = 0       # Risk assessment, safety escalations
+	INTERACTIVE = 1  # User-facing decomposition / routing
+	NORMAL = 2
+	BULK = 3         # Narration, documentation, reflection
+
+# Priority of LM calls made in the current context. ContextVars follow
+# offload (and asyncio.to_thread), so the DSPy call in the worker thread inherits it.
+_current_priority: ContextVar[LLMPriority] = ContextVar("llm_priority", default=LLMPriority.NORMAL)
+
+class _BackendSlots:
+	"""Priority-ordered counting semaphore for one backend."""
+	def __init__(self, limit: int):
+		self.limit = limit
+		self.in_flight = 0
+		self._waiters = []  # heap of (priority, seq, event)
+		self._seq = itertools.count()
+		self._lock = threading.Lock()
+
+	@property
+	def queued(self) -> int:
+		return len(self._waiters)
+
+	def acquire(self, priority: LLMPriority):
+		with self._lock:
+			if self.in_flight < self.limit and not self._waiters:
+				self.in_flight += 1
+				return
+			event = threading.Event()
+			heapq.heappush(self._waiters, (int(priority), next(self._seq), event))
+		# The releasing thread hands its slot over directly, so in_flight is already counted
+		event.wait()
+
+	def release(self):
+		with self._lock:
+			if self._waiters and self.in_flight <= self.limit:
+				_, _, event = heapq.heappop(self._waiters)
+				event.set()
+			else:
+				self.in_flight -= 1
+
+class InferenceGateway:
+	"""
+	Thread-safe scheduler for blocking LM calls (they run on offload's threads).
+	One slot pool per backend (api_base); identical keyed requests already in
+	flight share a single model call.
+	"""
+	def __init__(self, default_limit: int = None, workers: int = None):
+		self.default_limit = default_limit or int(os.getenv("SUDOTEER_LLM_MAX_IN_FLIGHT", "2"))
+		self.workers = workers or int(os.getenv("SUDOTEER_LLM_WORKERS", "32"))
+		self._executor: Optional[ThreadPoolExecutor] = None
+		self.limits: Dict[str, int] = {}
+		self._backends: Dict[str, _BackendSlots] = {}
+		self._pending: Dict[Hashable, Future] = {}
+		self._lock = threading.Lock()
+		self.metrics: Dict[str, Dict[str, Any]] = {}
+
+	def set_limit(self, backend: str, max_in_flight: int):
+		"""Configure the in-flight cap for a backend (applies to new pools)."""
+		self.limits[backend] = max_in_flight
+		with self._lock:
+			if backend in self._backends:
+				self._backends[backend].limit = max_in_flight
+
+	@contextmanager
+	def priority(self, level: LLMPriority):
+		"""Run every LM call inside this block at `level`."""
+		token = _current_priority.set(level)
+		try:
+			yield
+		finally:
+			_current_priority.reset(token)
+
+	async def offload(self, fn: Callable, *args, **kwargs) -> Any:
+		"""asyncio.to_thread for LM calls: runs `fn` on the gateway's pool with the caller's context."""
+		with self._lock:
+			if self._executor is None:
+				self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="llm")
+			executor = self._executor
+		context = contextvars.copy_context()
+		return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, fn, *args, **kwargs))
+
+	def _slots(self, backend: str) -> _BackendSlots:
+		with self._lock:
+			slots = self._backends.get(backend)
+			if slots is None:
+				slots = _BackendSlots(self.limits.get(backend, self.default_limit))
+				self._backends[backend] = slots
+				self.metrics[backend] = {"completed": 0, "coalesced": 0, "errors": 0, "queue_time": {}}
+			return slots
+
+	def run(self, backend: str, fn: Callable[[], Any], key: Optional[Hashable] = None, priority: Optional[LLMPriority] = None) -> Any:
+		"""
+		Execute `fn` under the backend's concurrency cap.
+		Pass `key` to coalesce with an identical request that is already in flight.
+		"""
+		priority = _current_priority.get() if priority is None else priority
+		slots = self._slots(backend)
+		stats = self.metrics[backend]
+
+		if key is not None:
+			with self._lock:
+				leader = self._pending.get(key)
+				if leader is None:
+					future = self._pending[key] = Future()
+			if leader is not None:
+				self._count(stats, "coalesced")
+				return leader.result()
+
+		enqueued = time.perf_counter()
+		slots.acquire(priority)
+		self._record_wait(stats, priority, time.perf_counter() - enqueued)
+		try:
+			result = fn()
+			self._count(stats, "completed")
+		except BaseException as e:
+			self._count(stats, "errors")
+			if key is not None:
+				self._settle(key, future, error=e)
+			raise
+		finally:
+			slots.release()
+
+		if key is not None:
+			self._settle(key, future, result=result)
+		return result
+
+	def _settle(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+		with self._lock:
+			self._pending.pop(key, None)
+		if error is not None:
+			future.set_exception(error)
+		else:
+			future.set_result(result)
+
+	def _count(self, stats: Dict[str, Any], name: str):
+		with self._lock:
+			stats[name] += 1
+
+	def _record_wait(self, stats: Dict[str, Any], priority: LLMPriority, waited: float):
+		with self._lock:
+			bucket = stats["queue_time"].setdefault(priority.name, {"count": 0, "total": 0.0, "max": 0.0})
+			bucket["count"] += 1
+			bucket["total"] += waited
+			bucket["max"] = max(bucket["max"], waited)
+
+	def get_stats(self) -> Dict[str, Any]:
+		report = {}
+		with self._lock:
+			for backend, slots in self._backends.items():
+				stats = self.metrics[backend]
+				report[backend] = {
+					"limit": slots.limit,
+					"in_flight": slots.in_flight,
+					"queued": slots.queued,
+					"completed": stats["completed"],
+					"coalesced": stats["coalesced"],
+					"errors": stats["errors"],
+					"queue_time_ms": {
+						name: {"avg": 1000 * b["total"] / b["count"], "max": 1000 * b["max"]}
+						for name, b in stats["queue_time"].items()
+					}
+				}
+		return report
+
+# Global gateway shared by every CachedLM in this process
+inference_gateway = InferenceGateway()
@@ -0,0 +1,221 @@
+"""
+_SUDOTEER LLM Router
+Spreads DSPy calls across every healthy LLM endpoint (LM Studio, Ollama, Gemini,
+discovered OpenAI-compatible nodes) by weighted least-outstanding-requests.
+Failing endpoints are ejected and re-probed in the background.
+"""
+import time
+import logging
+import threading
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Set
+import dspy
+from .gateway import inference_gateway
+
+logger = logging.getLogger("_SUDOTEER")
+
+DEFAULT_CLASS = "general"
+
+# Model class requested by the current context (follows inference_gateway.offload / asyncio.to_thread)
+_model_class: ContextVar[str] = ContextVar("llm_model_class", default=DEFAULT_CLASS)
+
+# Signature name -> model class (e.g. code generation on coder models)
+SIGNATURE_PINS: Dict[str, str] = {
+	"GenerateCode": "coder",
+	"GenerateTests": "coder",
+	"DecomposeUserGoal": "reasoning",
+	"RiskAssessment": "reasoning"
+}
+
+# HTTP statuses that blame the endpoint (auth, missing model, overload), not the request
+ENDPOINT_HTTP_ERRORS = {401, 403, 404, 408, 429}
+
+# Transport error classes of the HTTP clients under dspy.LM (litellm/openai, httpx)
+TRANSPORT_ERRORS = ("APIConnectionError", "APITimeoutError", "TransportError", "ServiceUnavailableError")
+
+def is_endpoint_error(error: BaseException) -> bool:
+	"""True when the endpoint is down or refusing work; False for bad requests, parse errors and bugs."""
+	if isinstance(error, (ConnectionError, TimeoutError, OSError)):
+		return True
+	status = getattr(error, "status_code", None)
+	if isinstance(status, int):
+		return status >= 500 or status in ENDPOINT_HTTP_ERRORS
+	return any(cls.__name__ in TRANSPORT_ERRORS for cls in type(error).__mro__)
+
+def pin_signature(signature: Any, model_class: str):
+	"""Send every call made under `route(signature)` to `model_class` endpoints."""
+	SIGNATURE_PINS[getattr(signature, "__name__", str(signature))] = model_class
+
+@contextmanager
+def route(target: Any):
+	"""Scope LM calls to a model class, given directly or via a pinned signature."""
+	name = getattr(target, "__name__", str(target))
+	token = _model_class.set(SIGNATURE_PINS.get(name, name))
+	try:
+		yield
+	finally:
+		_model_class.reset(token)
+
+class LLMEndpoint:
+	"""One routable backend: an LM plus its health and load state."""
+	def __init__(self, name: str, lm: Any, health_url: Optional[str] = None, weight: float = 1.0, model_classes: Iterable[str] = (DEFAULT_CLASS,)):
+		self.name = name
+		self.lm = lm
+		self.health_url = health_url
+		self.weight = max(weight, 0.01)
+		self.model_classes: Set[str] = set(model_classes)
+		self.outstanding = 0
+		self.healthy = True
+		self.ejected_at: Optional[float] = None
+		self.calls = 0
+		self.errors = 0
+		self.latency_ema: Optional[float] = None
+
+	def load(self) -> float:
+		return (self.outstanding + 1) / self.weight
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {
+			"name": self.name,
+			"healthy": self.healthy,
+			"weight": self.weight,
+			"classes": sorted(self.model_classes),
+			"outstanding": self.outstanding,
+			"calls": self.calls,
+			"errors": self.errors,
+			"latency_ms": round(self.latency_ema * 1000, 1) if self.latency_ema is not None else None
+		}
+
+class RoutingLM(dspy.BaseLM):
+	"""
+	LM facade registered with dspy.configure().
+	Each call goes to the least-loaded healthy endpoint serving the requested
+	model class; on a transport or endpoint HTTP error the endpoint is ejected
+	and the call fails over. Other errors (bad request, unparsable output) are
+	the caller's and are raised as-is.
+	"""
+	def __init__(self, endpoints: List[LLMEndpoint], probe_interval: float = 15.0, eject_cooldown: float = 30.0):
+		super().__init__(model="router/" + "+".join(e.name for e in endpoints), cache=False)
+		self.endpoints: List[LLMEndpoint] = list(endpoints)
+		self.probe_interval = probe_interval
+		self.eject_cooldown = eject_cooldown
+		self._lock = threading.Lock()
+		self._prober: Optional[threading.Thread] = None
+		self._stop = threading.Event()
+
+	# --- Endpoint management ---
+
+	def add_endpoint(self, endpoint: LLMEndpoint):
+		with self._lock:
+			if all(e.name != endpoint.name for e in self.endpoints):
+				self.endpoints.append(endpoint)
+				logger.info(f"[LLMRouter] Endpoint added: {endpoint.name} {sorted(endpoint.model_classes)}")
+
+	def eject(self, endpoint: LLMEndpoint, reason: str):
+		with self._lock:
+			endpoint.errors += 1
+			if endpoint.healthy:
+				endpoint.healthy = False
+				endpoint.ejected_at = time.time()
+				logger.warning(f"[LLMRouter] Ejected {endpoint.name}: {reason}")
+
+	def readmit(self, endpoint: LLMEndpoint):
+		with self._lock:
+			if not endpoint.healthy:
+				endpoint.healthy = True
+				endpoint.ejected_at = None
+				logger.info(f"[LLMRouter] Re-admitted {endpoint.name}")
+
+	def _pick(self, model_class: str, exclude: Set[str]) -> Optional[LLMEndpoint]:
+		with self._lock:
+			live = [e for e in self.endpoints if e.healthy and e.name not in exclude]
+			matching = [e for e in live if model_class in e.model_classes] or live
+			if not matching:
+				return None
+			chosen = min(matching, key=LLMEndpoint.load)
+			chosen.outstanding += 1
+			return chosen
+
+	# --- LM interface ---
+
+	def __call__(self, prompt=None, messages=None, **kwargs):
+		model_class = _model_class.get()
+		tried: Set[str] = set()
+		last_error: Optional[Exception] = None
+
+		while True:
+			endpoint = self._pick(model_class, tried)
+			if endpoint is None:
+				if last_error is not None:
+					raise last_error
+				raise RuntimeError("[LLMRouter] No healthy LLM endpoint available.")
+
+			started = time.perf_counter()
+			try:
+				outputs = endpoint.lm(prompt=prompt, messages=messages, **kwargs)
+			except Exception as e:
+				if not is_endpoint_error(e):
+					raise
+				tried.add(endpoint.name)
+				last_error = e
+				self.eject(endpoint, str(e)[:120])
+				continue
+			finally:
+				with self._lock:
+					endpoint.outstanding -= 1
+
+			elapsed = time.perf_counter() - started
+			with self._lock:
+				endpoint.calls += 1
+				endpoint.latency_ema = elapsed if endpoint.latency_ema is None else 0.8 * endpoint.latency_ema + 0.2 * elapsed
+			return outputs
+
+	async def acall(self, prompt=None, messages=None, **kwargs):
+		"""Async path: routed like __call__ so endpoint caches and failover still apply."""
+		return await inference_gateway.offload(self.__call__, prompt, messages=messages, **kwargs)
+
+	# --- Health checks ---
+
+	@staticmethod
+	def probe(url: str, timeout: float = 1.0) -> bool:
+		try:
+			with urllib.request.urlopen(url, timeout=timeout) as response:
+				return response.status == 200
+		except Exception:
+			return False
+
+	def check_health(self) -> int:
+		"""
+		Probe every endpoint once (blocking; call from a worker thread); endpoints
+		without a health URL re-enter after the cooldown. Returns the healthy count.
+		"""
+		for endpoint in list(self.endpoints):
+			if endpoint.health_url:
+				if self.probe(endpoint.health_url):
+					self.readmit(endpoint)
+				elif endpoint.healthy:
+					self.eject(endpoint, "health probe failed")
+			elif not endpoint.healthy and time.time() - (endpoint.ejected_at or 0) > self.eject_cooldown:
+				self.readmit(endpoint)
+		with self._lock:
+			return sum(e.healthy for e in self.endpoints)
+
+	def start_health_checks(self):
+		if self._prober and self._prober.is_alive(): return
+		self._stop.clear()
+
+		def _loop():
+			while not self._stop.wait(self.probe_interval):
+				self.check_health()
+
+		self._prober = threading.Thread(target=_loop, name="llm-router-prober", daemon=True)
+		self._prober.start()
+
+	def stop_health_checks(self):
+		self._stop.set()
+
+	def get_status(self) -> List[Dict[str, Any]]:
+		with self._lock:
+			return [e.to_dict() for e in self.endpoints]
@@ -1,8 +1,10 @@
+import time
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Optional
 import socket
+from urllib.parse import urlsplit
 
 logger = logging.getLogger("_SUDOTEER")
 
@@ -11,8 +13,15 @@ class LLMSeekerEngine:
 	_SUDOTEER LLM Discovery Engine.
 	Automatically scans the local network and system for active LLM nodes
 	(Ollama, LM Studio, LocalAI) to ensure a hassle-free setup.
+	Every host:port candidate is probed concurrently (bounded by a semaphore);
+	results carry latency and model lists and are cached per scope for `ttl` seconds.
+	Subnet scans first sweep the standard ports with bare TCP connects
+	(`sweep_timeout`, up to `sweep_concurrency` at once) and only send HTTP
+	probes to ports that accepted, so a /24 takes about
+	ceil(254 * ports / sweep_concurrency) * sweep_timeout plus one probe.
 	"""
-	def __init__(self):
+	def __init__(self, max_concurrency: int = 256, connect_timeout: float = 0.3, probe_timeout: float = 0.8, ttl: float = 60.0,
+				 sweep_concurrency: int = 512, sweep_timeout: float = 0.15):
 		self.standard_ports = {
 			"Ollama": 11434,
 			"LM Studio": 1234,
@@ -20,53 +29,153 @@ class LLMSeekerEngine:
 			"Oobabooga": 5000,
 			"VLLM": 8000
 		}
+		self.max_concurrency = max_concurrency
+		self.connect_timeout = connect_timeout
+		self.probe_timeout = probe_timeout
+		self.ttl = ttl
+		self.sweep_concurrency = sweep_concurrency  # Below the usual 1024 open-file limit
+		self.sweep_timeout = sweep_timeout
 		self.discovered_nodes = []
+		self._cache: Dict[str, tuple] = {}  # scope -> (scanned_at, nodes)
+		self._periodic: Optional[asyncio.Task] = None
 
-	async def scan_local_host(self) -> List[Dict[str, Any]]:
+	@staticmethod
+	def _health_path(provider: str) -> str:
+		# Check for OpenAI-compatible /v1/models or provider-specific health
+		return "/api/tags" if provider == "Ollama" else "/v1/models"
+
+	@staticmethod
+	def _parse_models(payload: Any) -> List[str]:
+		"""Model names from an Ollama /api/tags or OpenAI /v1/models response."""
+		if not isinstance(payload, dict):
+			return []
+		if "models" in payload:
+			return [m.get("name") or m.get("model") for m in payload["models"] if isinstance(m, dict)]
+		return [m.get("id") for m in payload.get("data", []) if isinstance(m, dict) and m.get("id")]
+
+	async def _probe(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, host: str, provider: str, port: int) -> Optional[Dict[str, Any]]:
+		url = f"http://{host}:{port}"
+		async with semaphore:
+			started = time.perf_counter()
+			try:
+				async with session.get(url + self._health_path(provider)) as response:
+					if response.status != 200:
+						return None
+					latency = time.perf_counter() - started
+					try:
+						models = self._parse_models(await response.json(content_type=None))
+					except Exception:
+						models = []
+			except Exception:
+				return None
+
+		logger.info(f"SeekerEngine: Discovered {provider} at {url} ({latency * 1000:.0f} ms)")
+		return {
+			"provider": provider,
+			"url": url,
+			"status": "active",
+			"latency_ms": round(latency * 1000, 1),
+			"models": models
+		}
+
+	async def _port_open(self, semaphore: asyncio.Semaphore, host: str, port: int) -> bool:
+		async with semaphore:
+			try:
+				_, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.sweep_timeout)
+			except (OSError, asyncio.TimeoutError):
+				return False
+			writer.close()
+			return True
+
+	async def _sweep(self, hosts: List[str]) -> List[tuple]:
+		"""(host, provider, port) for every standard port that accepts a TCP connection."""
+		semaphore = asyncio.Semaphore(self.sweep_concurrency)
+		candidates = [(host, provider, port) for host in hosts for provider, port in self.standard_ports.items()]
+		open_ports = await asyncio.gather(*(self._port_open(semaphore, host, port) for host, _, port in candidates))
+		return [c for c, is_open in zip(candidates, open_ports) if is_open]
+
+	async def scan(self, hosts: Iterable[str], scope: str = None, force: bool = False, sweep: bool = False) -> List[Dict[str, Any]]:
+		"""
+		Probe every host against every standard port at once; fastest nodes first.
+		With `sweep`, only ports that accept a TCP connect are probed over HTTP.
+		"""
+		hosts = list(hosts)
+		scope = scope or ",".join(hosts)
+		cached = self._cache.get(scope)
+		if cached and not force and time.time() - cached[0] < self.ttl:
+			return cached[1]
+
+		if sweep:
+			candidates = await self._sweep(hosts)
+		else:
+			candidates = [(host, provider, port) for host in hosts for provider, port in self.standard_ports.items()]
+
+		semaphore = asyncio.Semaphore(self.max_concurrency)
+		timeout = aiohttp.ClientTimeout(total=self.probe_timeout, sock_connect=self.connect_timeout)
+		connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+		async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+			results = await asyncio.gather(*(
+				self._probe(session, semaphore, host, provider, port)
+				for host, provider, port in candidates
+			))
+
+		found = sorted((n for n in results if n), key=lambda n: n["latency_ms"])
+		self._cache[scope] = (time.time(), found)
+		self._merge(found, hosts)
+		return found
+
+	def _merge(self, nodes: List[Dict[str, Any]], hosts: Iterable[str]):
+		"""
+		Fold one scan into discovered_nodes. Nodes on a scanned host that did not
+		answer this time are dropped; nodes from other scopes are kept.
+		"""
+		scanned = set(hosts)
+		merged = {n["url"]: n for n in self.discovered_nodes if urlsplit(n["url"]).hostname not in scanned}
+		merged.update({n["url"]: n for n in nodes})
+		self.discovered_nodes = sorted(merged.values(), key=lambda n: n["latency_ms"])
+
+	async def scan_local_host(self, force: bool = False) -> List[Dict[str, Any]]:
 		"""Check 127.0.0.1 for active LLM backends."""
 		logger.info("SeekerEngine: Scanning localhost for LLM backends...")
-		found = []
+		return await self.scan(["127.0.0.1"], scope="local", force=force)
 
-		async with aiohttp.ClientSession() as session:
-			for provider, port in self.standard_ports.items():
-				url = f"http://127.0.0.1:{port}"
-				try:
-					# Check for OpenAI-compatible /v1/models or provider-specific health
-					if provider == "Ollama":
-						test_endpoint = f"{url}/api/tags"
-					else:
-						test_endpoint = f"{url}/v1/models"
-
-					async with session.get(test_endpoint, timeout=0.5) as response:
-						if response.status == 200:
-							logger.info(f"SeekerEngine: Discovered {provider} at {url}")
-							found.append({
-								"provider": provider,
-								"url": url,
-								"status": "active"
-							})
-				except Exception:
-					continue
-
-		self.discovered_nodes = found
-		return found
+	@staticmethod
+	async def local_subnet() -> str:
+		# Name resolution can block for seconds on a slow resolver
+		local_ip = await asyncio.to_thread(socket.gethostbyname, socket.gethostname())
+		return ".".join(local_ip.split(".")[:-1])
 
-	async def scan_network(self) -> List[Dict[str, Any]]:
+	async def scan_network(self, subnet: str = None, force: bool = False) -> List[Dict[str, Any]]:
 		"""
-		Wider network scan logic.
-		Uses the machine's local IP to guess the subnet.
+		Wider network scan: every host of the /24 around this machine
+		(or `subnet`, e.g. "192.168.1") on every standard port, TCP sweep first.
 		"""
-		hostname = socket.gethostname()
-		local_ip = socket.gethostbyname(hostname)
-		subnet = ".".join(local_ip.split(".")[:-1])
-		logger.info(f"SeekerEngine: Subnet detected - {subnet}.x (This may take a while...)")
+		subnet = subnet or await self.local_subnet()
+		logger.info(f"SeekerEngine: Scanning subnet {subnet}.0/24...")
+		return await self.scan((f"{subnet}.{i}" for i in range(1, 255)), scope=f"{subnet}.0/24", force=force, sweep=True)
+
+	def start_periodic(self, interval: float = 300.0, network: bool = False, on_update: Callable[[List[Dict[str, Any]]], None] = None):
+		"""Re-scan in the background every `interval` seconds (requires a running loop)."""
+		if self._periodic and not self._periodic.done(): return
+
+		async def _loop():
+			while True:
+				try:
+					nodes = await (self.scan_network(force=True) if network else self.scan_local_host(force=True))
+					if on_update: on_update(nodes)
+				except Exception as e:
+					logger.warning(f"SeekerEngine: Periodic scan failed: {e}")
+				await asyncio.sleep(interval)
+
+		self._periodic = asyncio.create_task(_loop())
 
-		# For v1.0, we just simulate the wide scan to avoid performance hits
-		# But we would iterate through 1-255 on standard ports
-		return self.discovered_nodes
+	def stop_periodic(self):
+		if self._periodic:
+			self._periodic.cancel()
+			self._periodic = None
 
 	def get_connection_string(self) -> Optional[str]:
-		"""Returns the primary connection string to be used by the Agency."""
+		"""Returns the primary (lowest-latency) connection string to be used by the Agency."""
 		if self.discovered_nodes:
 			return self.discovered_nodes[0]["url"]
 		return None
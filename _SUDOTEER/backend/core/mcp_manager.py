@@ -2,22 +2,218 @@
 🛠️ _SUDOTEER MCP MANAGER 🛠️
 Orchestrates the lifecycle of MCP servers and clients.
 Bridges the gap between standardized tools and the SudoAgency.
+Each registered server runs as one long-lived stdio subprocess with one
+initialized ClientSession; concurrent tool calls are multiplexed over it
+(JSON-RPC request ids), idle sessions are pinged so a server that exits
+between calls is noticed, crashed servers are restarted with backoff and
+list_tools results are cached per session.
 """
+import os
+import sys
+import time
 import asyncio
 import logging
-import os
-import subprocess
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Union
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 logger = logging.getLogger("_SUDOTEER")
 
+# JSON-RPC error code MCP uses for requests cut off by a closed transport
+CONNECTION_CLOSED = -32000
+
+def _is_transport_error(error: BaseException) -> bool:
+    """True when the server/pipe is gone (restart), False for tool, protocol or timeout errors."""
+    if isinstance(error, TimeoutError):
+        return False  # A slow tool is not a dead server
+    if isinstance(error, (ConnectionError, BrokenPipeError, EOFError, OSError)):
+        return True
+    if type(error).__module__.startswith("anyio") and type(error).__name__ in ("ClosedResourceError", "BrokenResourceError", "EndOfStream"):
+        return True
+    data = getattr(error, "error", None)
+    code = getattr(data, "code", getattr(error, "code", None))
+    return code == CONNECTION_CLOSED
+
+@asynccontextmanager
+async def stdio_session(params: StdioServerParameters):
+    """Spawn the server and yield an initialized ClientSession."""
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+class MCPServerSession:
+    """
+    One persistent connection to an MCP server. A background task owns the
+    transport (stdio_client/ClientSession must be entered and exited in the
+    same task); callers wait until it is ready and share the session.
+    `connector(params)` is an async context manager yielding an initialized session.
+    """
+    def __init__(self, name: str, params: StdioServerParameters, connector: Callable = stdio_session,
+                 start_timeout: float = 15.0, call_timeout: float = 60.0,
+                 backoff_initial: float = 1.0, backoff_max: float = 60.0, keepalive: float = 10.0):
+        self.name = name
+        self.params = params
+        self.connector = connector
+        self.start_timeout = start_timeout
+        self.call_timeout = call_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.backoff = backoff_initial
+        self.keepalive = keepalive
+        self.session: Any = None
+        self.last_error: Optional[str] = None
+        self._ready = asyncio.Event()
+        self._failed = asyncio.Event()
+        self._settled = asyncio.Event()  # The current start attempt is over (ready, or failed with last_error)
+        self._closing = False
+        self._runner: Optional[asyncio.Task] = None
+        self._tools: Any = None
+        self._tools_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.stats = {"starts": 0, "restarts": 0, "calls": 0, "errors": 0, "tool_cache_hits": 0, "latency_ms": None}
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self):
+        """Launch the server in the background (idempotent, never blocks)."""
+        if self._runner is None or self._runner.done():
+            self._closing = False
+            self._failed.clear()
+            self._settled.clear()
+            self._runner = asyncio.create_task(self._run(), name=f"mcp-{self.name}")
+
+    async def _run(self):
+        while not self._closing:
+            self._settled.clear()
+            try:
+                async with self.connector(self.params) as session:
+                    self.session = session
+                    self.backoff = self.backoff_initial
+                    self.last_error = None
+                    self.stats["starts"] += 1
+                    self._ready.set()
+                    self._settled.set()
+                    logger.info(f"🔌 MCP: Session '{self.name}' ready.")
+                    await self._watch(session)  # Until the transport dies, or close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                self._settled.set()  # Callers fail fast until the next attempt
+                logger.warning(f"MCP: Server '{self.name}' failed: {e}")
+            finally:
+                self._ready.clear()
+                self.session = None
+                self._tools = None
+
+            if self._closing:
+                break
+            self._failed.clear()
+            self.stats["restarts"] += 1
+            logger.info(f"MCP: Restarting '{self.name}' in {self.backoff:.0f}s.")
+            await asyncio.sleep(self.backoff)
+            self.backoff = min(self.backoff * 2, self.backoff_max)
+
+    async def _watch(self, session):
+        """
+        Hold the session until a call marks it failed, or close(). While idle,
+        ping the server every `keepalive` seconds: a process that exited between
+        calls surfaces as a transport error here instead of on the next caller.
+        """
+        while not self._failed.is_set():
+            try:
+                await asyncio.wait_for(self._failed.wait(), self.keepalive)
+            except asyncio.TimeoutError:
+                if self.in_flight:
+                    continue  # Live calls will see a dead transport themselves
+                try:
+                    await asyncio.wait_for(session.send_ping(), self.call_timeout)
+                except Exception as e:
+                    if _is_transport_error(e):
+                        logger.warning(f"MCP: Server '{self.name}' stopped responding while idle: {e}")
+                        self._mark_failed(e)
+
+    async def _session(self):
+        self.start()
+        if not self._ready.is_set():
+            # Waits only while a start is in progress; backing off after a failure fails fast
+            try:
+                await asyncio.wait_for(self._settled.wait(), self.start_timeout)
+            except asyncio.TimeoutError:
+                pass
+            if not self._ready.is_set():
+                raise ConnectionError(f"MCP server '{self.name}' is not available ({self.last_error or 'starting'})")
+        return self.session
+
+    def _mark_failed(self, error: BaseException):
+        self.stats["errors"] += 1
+        if _is_transport_error(error):
+            self._ready.clear()  # Later callers wait for the restarted session
+            self._settled.clear()
+            self._failed.set()
+
+    async def call_tool(self, tool_name: str, tool_args: dict = None) -> Any:
+        """Invoke a tool over the shared session; many calls may be in flight at once."""
+        session = await self._session()
+        self.stats["calls"] += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(session.call_tool(tool_name, tool_args or {}), self.call_timeout)
+        except Exception as e:
+            self._mark_failed(e)
+            raise
+        finally:
+            self.in_flight -= 1
+            elapsed = (time.perf_counter() - started) * 1000
+            ema = self.stats["latency_ms"]
+            self.stats["latency_ms"] = round(elapsed if ema is None else 0.8 * ema + 0.2 * elapsed, 2)
+
+    async def list_tools(self, refresh: bool = False) -> Any:
+        """Tool listing, cached until the session restarts (or `refresh`)."""
+        if self._tools is not None and not refresh:
+            self.stats["tool_cache_hits"] += 1
+            return self._tools
+        async with self._tools_lock:
+            if self._tools is not None and not refresh:
+                self.stats["tool_cache_hits"] += 1
+                return self._tools
+            session = await self._session()
+            try:
+                self._tools = await asyncio.wait_for(session.list_tools(), self.call_timeout)
+            except Exception as e:
+                self._mark_failed(e)
+                raise
+            return self._tools
+
+    async def close(self):
+        self._closing = True
+        self._failed.set()
+        self._settled.set()
+        if self._runner is not None:
+            if not self._ready.is_set():
+                self._runner.cancel()  # Starting or backing off: nothing to shut down cleanly
+            try:
+                await asyncio.wait_for(self._runner, 5.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._runner.cancel()
+            except Exception:
+                pass
+            self._runner = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "ready": self.is_ready, "in_flight": self.in_flight, "last_error": self.last_error}
+
 class MCPManager:
     """Manages the lifecycle of MCP connections for Sudoteer Agents."""
 
-    def __init__(self):
-        self.sessions = {}
-        self.internal_server_proc = None
+    def __init__(self, connector: Callable = stdio_session):
+        self.sessions: Dict[str, MCPServerSession] = {}
+        self.connector = connector
         # Registry of available MCP servers and their run commands
         self.registry = {
             "fetch": {
@@ -34,74 +230,85 @@ class MCPManager:
             }
         }
 
+    @staticmethod
+    def _python_exe() -> str:
+        venv_python = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".venv", "Scripts", "python.exe"))
+        return venv_python if os.path.exists(venv_python) else sys.executable
+
+    def _params(self, config: Dict[str, Any]) -> StdioServerParameters:
+        cmd = self._python_exe() if config["command"] == "python" else config["command"]
+        return StdioServerParameters(command=cmd, args=config["args"], env=config.get("env"))
+
+    def session(self, name: str) -> MCPServerSession:
+        """The persistent session for a registered server (created and started on first use)."""
+        session = self.sessions.get(name)
+        if session is None:
+            session = self.sessions[name] = MCPServerSession(name, self._params(self.registry[name]), connector=self.connector)
+        session.start()
+        return session
+
     async def start_internal_server(self):
-        """Launches the Sudoteer Hardware MCP server as a subprocess."""
+        """Launches the Sudoteer Hardware MCP server (persistent stdio session)."""
         # Ensure data directory exists for sqlite
         os.makedirs("backend/data", exist_ok=True)
+        logger.info(f"🚀 Launching Internal MCP Server: {self.registry['hardware']['args'][0]}")
+        self.session("hardware")
 
-        info = self.registry["hardware"]
-        python_exe = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".venv", "Scripts", "python.exe"))
-        script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", info["args"][0]))
-
-        logger.info(f"🚀 Launching Internal MCP Server: {script_path}")
-        # We start it as a stdio server
-        self.internal_server_proc = subprocess.Popen(
-            [python_exe, script_path],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        logger.info("✅ Internal Hardware MCP Server is online (PID: %s)", self.internal_server_proc.pid)
-
-    async def get_all_tools(self):
-        """Discovers tools across all registered MCP servers."""
+    async def get_all_tools(self, refresh: bool = False):
+        """Discovers tools across all registered MCP servers (concurrently, cached per session)."""
+        names = list(self.registry)
+        results = await asyncio.gather(*(self.session(name).list_tools(refresh) for name in names), return_exceptions=True)
         all_tools = {}
-        python_exe = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".venv", "Scripts", "python.exe"))
-
-        for name, config in self.registry.items():
-            try:
-                # Prepare transport params
-                cmd = python_exe if config["command"] == "python" else config["command"]
-                params = StdioServerParameters(command=cmd, args=config["args"])
-
-                async with stdio_client(params) as (read, write):
-                    async with ClientSession(read, write) as session:
-                        await session.initialize()
-                        tools = await session.list_tools()
-                        all_tools[name] = tools
-                        logger.info(f"🔍 MCP: Discovered {len(tools.tools)} tools on '{name}' server.")
-            except Exception as e:
-                logger.warning(f"Failed to discover tools for {name}: {e}")
-
+        for name, tools in zip(names, results):
+            if isinstance(tools, BaseException):
+                logger.warning(f"Failed to discover tools for {name}: {tools}")
+                continue
+            all_tools[name] = tools
+            logger.info(f"🔍 MCP: Discovered {len(tools.tools)} tools on '{name}' server.")
         return all_tools
 
     async def connect_to_server(self, server_id: str, command: str, args: list):
-        """Connect to an MCP server and store the session."""
-        server_params = StdioServerParameters(command=command, args=args)
+        """Register an MCP server and start its persistent session."""
+        self.registry[server_id] = {"command": command, "args": list(args)}
+        old = self.sessions.pop(server_id, None)
+        if old is not None:
+            await old.close()
+        return self.session(server_id)
 
-        # Note: In a production async app, we'd handle the context manager differently
-        # For now, we provide a helper to run a specific tool
-        return server_params
+    def _resolve(self, server: Union[str, StdioServerParameters]) -> MCPServerSession:
+        if isinstance(server, str):
+            return self.session(server)
+        # Ad-hoc parameters: one session per distinct command line
+        key = f"{server.command} {' '.join(server.args)}"
+        session = self.sessions.get(key)
+        if session is None:
+            session = self.sessions[key] = MCPServerSession(key, server, connector=self.connector)
+        session.start()
+        return session
 
-    async def call_tool(self, server_params: StdioServerParameters, tool_name: str, tool_args: dict):
-        """Helper to invoke a tool on an MCP server."""
+    async def call_tool(self, server: Union[str, StdioServerParameters], tool_name: str, tool_args: dict):
+        """Helper to invoke a tool on an MCP server (registered name or server parameters)."""
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.call_tool(tool_name, tool_args)
-                    return result
+            return await self._resolve(server).call_tool(tool_name, tool_args)
         except Exception as e:
             logger.error(f"MCP Tool Call Failed ({tool_name}): {e}")
             return None
 
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: session.get_stats() for name, session in self.sessions.items()}
+
+    async def close(self):
+        """Stop every server session."""
+        await asyncio.gather(*(session.close() for session in self.sessions.values()))
+        self.sessions.clear()
+
     def shutdown(self):
         """Clean up all processes."""
-        if self.internal_server_proc:
-            self.internal_server_proc.terminate()
-            logger.info("🛑 Internal MCP Server stopped.")
+        try:
+            asyncio.get_running_loop().create_task(self.close())
+        except RuntimeError:
+            self.sessions.clear()  # No loop: the session tasks are already gone
+        logger.info("🛑 MCP sessions stopped.")
 
 # Global Manager Instance
 mcp_manager = MCPManager()
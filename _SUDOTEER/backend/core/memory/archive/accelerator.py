@@ -3,6 +3,10 @@ from typing import Dict, Any, List, Literal
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Sifter heuristics (shared with the MemorySplitter fast path)
+GRAPH_KEYWORDS = ("depends on", "link", "related to", "process", "flow", "workflow", "topology", "impact")
+VECTOR_KEYWORDS = ("similar", "find", "describe", "explain", "concepts", "what is", "about")
+
 class MemoryAccelerator:
 	"""
 	_SUDOTEER Memory Accelerator & Sifter.
@@ -24,14 +28,12 @@ class MemoryAccelerator:
 		query_lower = query.lower()
 
 		# Heuristic 1: Graph-heavy keywords (Relationships, Dependencies, Flow)
-		graph_keywords = ["depends on", "link", "related to", "process", "flow", "workflow", "topology", "impact"]
-		if any(kw in query_lower for kw in graph_keywords):
+		if any(kw in query_lower for kw in GRAPH_KEYWORDS):
 			logger.info(f"Accelerator: Detected relational query. Routing to Graph.")
 			return "relational"
 
 		# Heuristic 2: Search-heavy keywords (Find, Similar, What is, Concepts)
-		vector_keywords = ["similar", "find", "describe", "explain", "concepts", "what is", "about"]
-		if any(kw in query_lower for kw in vector_keywords):
+		if any(kw in query_lower for kw in VECTOR_KEYWORDS):
 			logger.info(f"Accelerator: Detected semantic query. Routing to Vector.")
 			return "semantic"
 
@@ -0,0 +1,111 @@
+"""
+_SUDOTEER Chroma Compatibility Proxy (API v1 -> v2)
+One long-lived, pooled httpx client shared by every proxied route: upstream
+connections are kept alive between vector queries, request and response bodies
+are streamed through instead of buffered, and per-route latency is recorded.
+"""
+import os
+import time
+import logging
+from typing import Any, Dict, Optional
+import httpx
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+logger = logging.getLogger("_SUDOTEER")
+
+CHROMA_INTERNAL_URL = os.getenv("SUDOTEER_CHROMA_URL", "http://127.0.0.1:8001")
+V2_COLLECTIONS = "/api/v2/tenants/default_tenant/databases/default_database/collections"
+
+# Connection-level headers that must not be forwarded by a proxy
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+			  "te", "trailers", "transfer-encoding", "upgrade", "host"}
+
+class ChromaProxy:
+	"""
+	Forwards requests to the internal Chroma server over a pooled keep-alive client.
+	Pool limits come from SUDOTEER_CHROMA_MAX_CONNECTIONS / _MAX_KEEPALIVE / _KEEPALIVE_EXPIRY.
+	Call start() at app startup and close() at shutdown (forward() starts it lazily).
+	"""
+	def __init__(self, base_url: str = None, max_connections: int = None, max_keepalive: int = None,
+				 keepalive_expiry: float = None, connect_timeout: float = 2.0):
+		self.base_url = base_url or CHROMA_INTERNAL_URL
+		self.limits = httpx.Limits(
+			max_connections=max_connections or int(os.getenv("SUDOTEER_CHROMA_MAX_CONNECTIONS", "100")),
+			max_keepalive_connections=max_keepalive or int(os.getenv("SUDOTEER_CHROMA_MAX_KEEPALIVE", "20")),
+			keepalive_expiry=keepalive_expiry or float(os.getenv("SUDOTEER_CHROMA_KEEPALIVE_EXPIRY", "30"))
+		)
+		self.connect_timeout = connect_timeout
+		self.client: Optional[httpx.AsyncClient] = None
+		self.metrics: Dict[str, Dict[str, Any]] = {}
+
+	async def start(self, transport: httpx.AsyncBaseTransport = None):
+		if self.client is None:
+			self.client = httpx.AsyncClient(
+				base_url=self.base_url,
+				limits=self.limits,
+				timeout=httpx.Timeout(10.0, connect=self.connect_timeout),
+				transport=transport
+			)
+			logger.info(f"ChromaProxy: Pooled client -> {self.base_url} (max {self.limits.max_connections} connections)")
+
+	async def close(self):
+		if self.client is not None:
+			await self.client.aclose()
+			self.client = None
+
+	@staticmethod
+	def _forward_headers(headers) -> Dict[str, str]:
+		return {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP}
+
+	def _record(self, route: str, elapsed_ms: float, error: bool = False):
+		m = self.metrics.get(route)
+		if m is None:
+			m = self.metrics[route] = {"requests": 0, "errors": 0, "mean_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+		m["requests"] += 1
+		if error: m["errors"] += 1
+		m["last_ms"] = round(elapsed_ms, 2)
+		m["max_ms"] = round(max(m["max_ms"], elapsed_ms), 2)
+		m["mean_ms"] = round(m["mean_ms"] + (elapsed_ms - m["mean_ms"]) / m["requests"], 2)
+
+	async def forward(self, request: Request, path: str, route: str = None, timeout: float = 10.0) -> Response:
+		"""Stream `request` to `path` on the Chroma server and stream the answer back."""
+		if self.client is None:
+			await self.start()
+		route = route or path
+		headers = self._forward_headers(request.headers)
+		has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+		started = time.perf_counter()
+		try:
+			upstream = self.client.build_request(
+				request.method, path,
+				params=request.query_params,
+				headers=headers,
+				content=request.stream() if has_body else None,
+				timeout=timeout
+			)
+			r = await self.client.send(upstream, stream=True)
+		except Exception as e:
+			self._record(route, (time.perf_counter() - started) * 1000, error=True)
+			return Response(content=f"Proxy error: {str(e)}", status_code=502)
+
+		# Latency = time to upstream response headers; the body is streamed afterwards
+		self._record(route, (time.perf_counter() - started) * 1000, error=r.status_code >= 500)
+		return StreamingResponse(
+			r.aiter_raw(),
+			status_code=r.status_code,
+			headers=self._forward_headers(r.headers),
+			background=BackgroundTask(r.aclose)
+		)
+
+	def get_stats(self) -> Dict[str, Any]:
+		return {
+			"upstream": self.base_url,
+			"max_connections": self.limits.max_connections,
+			"max_keepalive": self.limits.max_keepalive_connections,
+			"routes": {route: dict(m) for route, m in self.metrics.items()}
+		}
+
+# Global Instance
+chroma_proxy = ChromaProxy()
@@ -1,8 +1,8 @@
 import dspy
 import logging
-import asyncio
 from typing import Dict, Any
 from ..dspy_signatures import CalibrationCheck
+from ...llm.gateway import inference_gateway
 
 logger = logging.getLogger("_SUDOTEER")
 
@@ -22,7 +22,7 @@ class ConfidenceMonitor(dspy.Module):
 		"""
 		logger.info("ConfidenceMonitor: Calibrating plan confidence...")
 
-		result = await asyncio.to_thread(self.calibrator, user_request=user_request, proposed_plan=proposed_plan)
+		result = await inference_gateway.offload(self.calibrator, user_request=user_request, proposed_plan=proposed_plan)
 
 		try:
 			ambiguity = float(result.ambiguity_score)
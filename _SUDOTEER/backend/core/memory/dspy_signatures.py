@@ -29,6 +29,16 @@ class RouteToAgent(dspy.Signature):
 	agent_id: str = dspy.OutputField(desc="The agent ID best suited for this task")
 	reasoning: str = dspy.OutputField(desc="Why this agent was selected")
 
+class RouteSubtasks(dspy.Signature):
+	"""Assign every subtask to an agent in one pass and note which subtasks must wait for others."""
+
+	subtasks: list[str] = dspy.InputField(desc="Numbered subtasks, in order (index 0 first)")
+	available_agents: str = dspy.InputField(desc="JSON of available agents and their capabilities")
+
+	agent_ids: list[str] = dspy.OutputField(desc="One agent ID per subtask, same order and length as subtasks")
+	depends_on: list[list[int]] = dspy.OutputField(desc="Per subtask, indices of EARLIER subtasks whose results it needs ([] if independent)")
+	reasoning: str = dspy.OutputField(desc="Brief routing rationale")
+
 class NarrateResults(dspy.Signature):
 	"""Convert technical agent outputs into user-friendly narrative."""
 
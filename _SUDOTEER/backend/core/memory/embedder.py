@@ -0,0 +1,108 @@
+"""
+_SUDOTEER Sentence Embedder
+Local, batched sentence embeddings for semantic chunking (Protocol Beta).
+Uses the same ONNX MiniLM model ChromaDB embeds with, so no remote calls.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Callable, List, Optional
+import numpy as np
+
+logger = logging.getLogger("_SUDOTEER")
+
+class SentenceEmbedder:
+	"""
+	Embeds sentence atoms in batches and caches each vector by sentence hash.
+	Re-chunking an edited document only embeds the sentences that changed.
+	"""
+	def __init__(self, batch_size: int = 64, cache_size: int = 50000, embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None):
+		self.batch_size = batch_size
+		self.cache_size = cache_size
+		self._embed_fn = embed_fn
+		self._load_failed = False
+		self._verified = False  # Set after the first successful model call
+		self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def _load_model(self) -> bool:
+		"""Lazily load the local embedding model (first use only)."""
+		if self._embed_fn is not None:
+			return True
+		if self._load_failed:
+			return False
+		try:
+			from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+			self._embed_fn = DefaultEmbeddingFunction()
+			logger.info("✓ Embedder: Local MiniLM (ONNX) loaded.")
+			return True
+		except Exception as e:
+			logger.warning(f"Embedder: Local model unavailable ({e}). Semantic chunking will use the size heuristic.")
+			self._load_failed = True
+			return False
+
+	@property
+	def available(self) -> bool:
+		return self._load_model()
+
+	@staticmethod
+	def _key(sentence: str) -> str:
+		return hashlib.sha1(sentence.encode("utf-8")).hexdigest()
+
+	def embed(self, sentences: List[str]) -> Optional[np.ndarray]:
+		"""
+		Return an (n, d) matrix of L2-normalized embeddings, or None if no model.
+		Only cache misses are sent to the model, in batches of `batch_size`.
+		"""
+		if not sentences:
+			return None
+		if not self._load_model():
+			return None
+
+		keys = [self._key(s) for s in sentences]
+		missing = {}
+		for key, sentence in zip(keys, sentences):
+			if key in self._cache:
+				self._cache.move_to_end(key)
+			elif key not in missing:
+				missing[key] = sentence
+
+		self.hits += len(keys) - len(missing)
+		self.misses += len(missing)
+
+		pending = list(missing.items())
+		fresh = {}
+		for i in range(0, len(pending), self.batch_size):
+			batch = pending[i:i + self.batch_size]
+			try:
+				vectors = np.asarray(self._embed_fn([s for _, s in batch]), dtype=np.float32)
+			except Exception as e:
+				logger.error(f"Embedder: Batch embedding failed: {e}")
+				if not self._verified:
+					# Model never worked (e.g. ONNX download failed): stop retrying on every call
+					logger.warning("Embedder: Disabling local model. Semantic chunking will use the size heuristic.")
+					self._load_failed = True
+					self._embed_fn = None
+				return None
+			self._verified = True
+			norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+			vectors = vectors / np.maximum(norms, 1e-12)
+			for (key, _), vec in zip(batch, vectors):
+				fresh[key] = vec
+
+		matrix = np.stack([fresh[k] if k in fresh else self._cache[k] for k in keys])
+
+		for key, vec in fresh.items():
+			self._cache[key] = vec
+		while len(self._cache) > self.cache_size:
+			self._cache.popitem(last=False)
+
+		return matrix
+
+	def get_stats(self):
+		return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+# Global instance
+sentence_embedder = SentenceEmbedder()
@@ -0,0 +1,158 @@
+"""
+_SUDOTEER Sift Router
+Tiered fast path for MemorySplitter.sift_query.
+Tier 0: memo by normalized query. Tier 1: keywords + a small Naive Bayes model
+trained on past sift decisions from the monologue logs. Only ambiguous
+queries escalate to the DSPy sifter.
+"""
+
+import os
+import re
+import json
+import glob
+import math
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from .archive.accelerator import GRAPH_KEYWORDS, VECTOR_KEYWORDS
+
+logger = logging.getLogger("_SUDOTEER")
+
+STRATEGIES = ("semantic", "relational", "hybrid")
+SIFT_EVENT = "sift"
+
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+class NaiveBayesSifter:
+	"""Multinomial Naive Bayes over query words. Small enough to retrain online."""
+	def __init__(self):
+		self.class_counts: Dict[str, int] = {s: 0 for s in STRATEGIES}
+		self.word_counts: Dict[str, Dict[str, int]] = {s: {} for s in STRATEGIES}
+		self.word_totals: Dict[str, int] = {s: 0 for s in STRATEGIES}
+		self.vocab = set()
+		self.examples = 0
+
+	def learn(self, words, strategy: str):
+		if strategy not in self.class_counts: return
+		self.class_counts[strategy] += 1
+		self.examples += 1
+		counts = self.word_counts[strategy]
+		for w in words:
+			counts[w] = counts.get(w, 0) + 1
+			self.vocab.add(w)
+		self.word_totals[strategy] += len(words)
+
+	def predict(self, words) -> Tuple[str, float]:
+		"""Return (strategy, posterior) for the most likely class."""
+		vocab_size = len(self.vocab) + 1
+		log_scores = {}
+		for s in STRATEGIES:
+			if not self.class_counts[s]: continue
+			score = math.log(self.class_counts[s] / self.examples)
+			denom = self.word_totals[s] + vocab_size
+			counts = self.word_counts[s]
+			for w in words:
+				score += math.log((counts.get(w, 0) + 1) / denom)
+			log_scores[s] = score
+
+		best = max(log_scores, key=log_scores.get)
+		peak = log_scores[best]
+		norm = sum(math.exp(v - peak) for v in log_scores.values())
+		return best, 1.0 / norm
+
+class SiftRouter:
+	"""
+	Answers confident sift decisions locally and memoizes every decision.
+	Confidence fuses keyword evidence and the Naive Bayes posterior; the two
+	must agree, otherwise the query is treated as ambiguous.
+	"""
+	def __init__(self, confidence: float = 0.8, min_examples: int = 20, memo_size: int = 4096):
+		self.confidence = confidence
+		self.min_examples = min_examples
+		self.memo_size = memo_size
+		self.memo: "OrderedDict[str, str]" = OrderedDict()
+		self.model = NaiveBayesSifter()
+		self.stats = {"memo": 0, "local": 0, "escalated": 0}
+
+	@staticmethod
+	def normalize(query: str) -> str:
+		return " ".join(_WORD_PATTERN.findall(query.lower()))
+
+	def lookup(self, query: str) -> Optional[str]:
+		"""Tier 0: previously decided query."""
+		key = self.normalize(query)
+		strategy = self.memo.get(key)
+		if strategy is not None:
+			self.memo.move_to_end(key)
+			self.stats["memo"] += 1
+		return strategy
+
+	def _keyword_vote(self, query_lower: str) -> Tuple[Optional[str], float]:
+		graph_hits = sum(1 for kw in GRAPH_KEYWORDS if kw in query_lower)
+		vector_hits = sum(1 for kw in VECTOR_KEYWORDS if kw in query_lower)
+		if graph_hits and vector_hits:
+			return "hybrid", 0.5
+		hits = graph_hits or vector_hits
+		if not hits:
+			return None, 0.0
+		# One keyword is a hint, two or more is a confident call
+		return ("relational" if graph_hits else "semantic"), min(0.95, 0.6 + 0.1 * hits)
+
+	def classify(self, query: str) -> Optional[str]:
+		"""Tier 1: local decision, or None when the query is ambiguous."""
+		normalized = self.normalize(query)
+		kw_strategy, kw_conf = self._keyword_vote(normalized)
+
+		nb_strategy, nb_conf = None, 0.0
+		if self.model.examples >= self.min_examples:
+			nb_strategy, nb_conf = self.model.predict(normalized.split())
+
+		if kw_strategy and nb_strategy and kw_strategy != nb_strategy:
+			return None
+
+		strategy = kw_strategy or nb_strategy
+		if not strategy:
+			return None
+
+		# Independent agreeing signals: noisy-OR of their confidences
+		conf = 1.0 - (1.0 - kw_conf) * (1.0 - nb_conf)
+		if conf < self.confidence:
+			return None
+
+		self.stats["local"] += 1
+		self._memoize(normalized, strategy)
+		return strategy
+
+	def learn(self, query: str, strategy: str):
+		"""Record an escalated (LLM) decision: memoize it and train on it."""
+		normalized = self.normalize(query)
+		self.stats["escalated"] += 1
+		self._memoize(normalized, strategy)
+		self.model.learn(normalized.split(), strategy)
+
+	def _memoize(self, key: str, strategy: str):
+		self.memo[key] = strategy
+		self.memo.move_to_end(key)
+		while len(self.memo) > self.memo_size:
+			self.memo.popitem(last=False)
+
+	def train_from_monologues(self, base_path: str = "sandbox/monologues") -> int:
+		"""Bootstrap the local model from sift decisions recorded in past sessions."""
+		trained = 0
+		for path in sorted(glob.glob(os.path.join(base_path, "session_*.jsonl"))):
+			try:
+				with open(path, "r", encoding="utf-8") as f:
+					for line in f:
+						if f'"{SIFT_EVENT}"' not in line: continue
+						entry = json.loads(line)
+						strategy = entry.get("metadata", {}).get("strategy")
+						if entry.get("type") == SIFT_EVENT and strategy in STRATEGIES:
+							self.model.learn(self.normalize(str(entry["content"])).split(), strategy)
+							trained += 1
+			except Exception as e:
+				logger.warning(f"SiftRouter: Skipping {path}: {e}")
+		logger.info(f"SiftRouter: Trained on {trained} past sift decisions.")
+		return trained
+
+	def get_stats(self) -> Dict[str, int]:
+		return {**self.stats, "memo_size": len(self.memo), "examples": self.model.examples}
@@ -6,13 +6,72 @@ Uses DSPy to classify information and extract structured relationships.
 
 import logging
 import dspy
-import asyncio
 from typing import Dict, Any, List, Optional, Literal
 from .dspy_signatures import SiftMemoryRequest, SplitMemoryStorage
+from .embedder import sentence_embedder
+from .sift_router import SiftRouter, SIFT_EVENT
+from ..monologue import recorder
+from ..llm.gateway import inference_gateway
+import numpy as np
 import re
+from bisect import bisect_left, bisect_right
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Separator hierarchy for Protocol Alpha, coarsest first: paragraph, line, sentence.
+# Anything finer falls back to a plain word boundary.
+_TOKEN_PATTERN = re.compile(r"\S+")
+_BREAK_PATTERNS = (
+	re.compile(r"\n[^\S\n]*\n"),
+	re.compile(r"\n"),
+	re.compile(r"[.!?](?=\s)"),
+)
+
+class TokenView:
+	"""
+	Whitespace-token view of a document, computed once.
+	Holds token character offsets plus the token indices where each separator
+	level allows a cut, so chunkers never re-split or re-join strings.
+	"""
+	def __init__(self, text: str):
+		self.text = text
+		self.starts: List[int] = []
+		self.ends: List[int] = []
+		for match in _TOKEN_PATTERN.finditer(text):
+			self.starts.append(match.start())
+			self.ends.append(match.end())
+
+		# boundaries[level] = sorted token indices i where a cut between token i-1 and i is allowed
+		self.boundaries: List[List[int]] = []
+		total = len(self.starts)
+		for pattern in _BREAK_PATTERNS:
+			level = []
+			for match in pattern.finditer(text):
+				idx = bisect_left(self.starts, match.end())
+				if 0 < idx < total and (not level or level[-1] != idx):
+					level.append(idx)
+			self.boundaries.append(level)
+
+	def __len__(self) -> int:
+		return len(self.starts)
+
+	def best_cut(self, after: int, limit: int) -> int:
+		"""
+		Latest cut in (after, limit] on the coarsest separator level available.
+		Falls back to a hard word cut at `limit`.
+		"""
+		if limit >= len(self.starts):
+			return len(self.starts)
+		for level in self.boundaries:
+			pos = bisect_right(level, limit) - 1
+			if pos >= 0 and level[pos] > after:
+				return level[pos]
+		return limit
+
+	def span_text(self, start: int, end: int) -> str:
+		"""Original text covering tokens [start, end)."""
+		return self.text[self.starts[start]:self.ends[end - 1]]
+
 class MemorySplitter:
 	"""
 	The 'Splitter' module that sits between the agents and the storage layer.
@@ -23,11 +82,20 @@ class MemorySplitter:
 		# DSPy Modules
 		self.sifter = dspy.ChainOfThought(SiftMemoryRequest)
 		self.splitter = dspy.ChainOfThought(SplitMemoryStorage)
+		self.embedder = sentence_embedder
+		self.router = SiftRouter()
 
 	async def sift_query(self, query: str) -> str:
 		"""
 		Determines if a query is semantic, relational, or hybrid.
+		Memoized and confident decisions come from the local SiftRouter;
+		only ambiguous queries pay for the DSPy sifter.
 		"""
+		strategy = self.router.lookup(query) or self.router.classify(query)
+		if strategy:
+			logger.info(f"Splitter: Sifted locally -> {strategy}")
+			return strategy
+
 		logger.info(f"Splitter: Sifting query -> {query}")
 
 		# Description of stores for the LLM context
@@ -36,15 +104,20 @@ class MemorySplitter:
 			"Graph Store: Best for relationships, dependencies, workflows, and 'how things are linked'."
 		)
 
-		result = await asyncio.to_thread(self.sifter, query=query, available_stores=available_stores)
+		result = await inference_gateway.offload(self.sifter, query=query, available_stores=available_stores)
 
 		strategy = result.strategy.lower()
 		if "hybrid" in strategy:
-			return "hybrid"
+			strategy = "hybrid"
 		elif "relational" in strategy or "graph" in strategy:
-			return "relational"
+			strategy = "relational"
 		else:
-			return "semantic"
+			strategy = "semantic"
+
+		# Feed the decision back to the fast path and the monologue (training data)
+		self.router.learn(query, strategy)
+		recorder.record_event("memory_splitter", "system", SIFT_EVENT, query, {"strategy": strategy})
+		return strategy
 
 	async def split_storage(self, data: str) -> Dict[str, Any]:
 		"""
@@ -52,7 +125,7 @@ class MemorySplitter:
 		"""
 		logger.info("Splitter: Analyzing data for hybrid storage...")
 
-		result = await asyncio.to_thread(self.splitter, data=data)
+		result = await inference_gateway.offload(self.splitter, data=data)
 
 		# Clean up list/dict from DSPy output if needed (signatures handle this mostly)
 		return {
@@ -79,74 +152,73 @@ class MemorySplitter:
 		"""
 		Protocol Alpha: Recursive Character Split (The 'Camry' / Sniper).
 		Limits noise by keeping chunks small (200 tokens).
+
+		Works on a token view computed once: each chunk is cut at the coarsest
+		separator (paragraph > line > sentence > word) that fits the window,
+		and starts with the last `overlap` tokens of the previous chunk.
+		Running offsets keep the whole pass linear in document size.
 		"""
-		logger.info(f"Splitter: Executing Protocol Alpha (Recursive 200/20)")
-
-		# Simple recursive split implementation (simplified for vanilla context)
-		separators = ["\n\n", "\n", ". ", " ", ""]
-
-		def split_recursive(content: str, seps: List[str]) -> List[str]:
-			if len(content.split()) <= chunk_size:
-				return [content]
-
-			if not seps:
-				# Fallback hard split if no seps left
-				words = content.split()
-				return [" ".join(words[i:i+chunk_size]) for i in range(0, len(words), chunk_size - overlap)]
-
-			sep = seps[0]
-			final_chunks = []
-			parts = content.split(sep)
-
-			current_chunk = ""
-			for p in parts:
-				if len((current_chunk + sep + p).split()) <= chunk_size:
-					current_chunk = (current_chunk + sep + p) if current_chunk else p
-				else:
-					if current_chunk:
-						final_chunks.append(current_chunk)
-					# If a single part is too big, go deeper
-					if len(p.split()) > chunk_size:
-						final_chunks.extend(split_recursive(p, seps[1:]))
-						current_chunk = ""
-					else:
-						current_chunk = p
-
-			if current_chunk:
-				final_chunks.append(current_chunk)
-			return final_chunks
-
-		return split_recursive(text, separators)
-
-	def _protocol_beta_semantic(self, text: str, threshold: float = 0.85) -> List[str]:
+		logger.info(f"Splitter: Executing Protocol Alpha (Recursive {chunk_size}/{overlap})")
+
+		view = TokenView(text)
+		total = len(view)
+		if total <= chunk_size:
+			return [text]
+
+		overlap = max(0, min(overlap, chunk_size - 1))
+		chunks = []
+		prev_cut = 0
+		while prev_cut < total:
+			start = max(0, prev_cut - overlap) if chunks else 0
+			cut = view.best_cut(prev_cut, min(total, start + chunk_size))
+			chunks.append(view.span_text(start, cut))
+			prev_cut = cut
+		return chunks
+
+	def _protocol_beta_semantic(self, text: str, threshold: float = 0.5, max_words: int = 250) -> List[str]:
 		"""
 		Protocol Beta: Cluster Semantic Chunker (Antigravity Mode).
 		Logic: Split into atoms -> Embed -> Cluster by Similarity.
+
+		Adjacent-atom cosine similarities are computed in one vectorized pass; a
+		topic boundary is any pair whose similarity falls below `threshold`
+		(absolute, so a document without topic changes stays whole). Chunks are
+		still capped at `max_words`.
 		"""
 		logger.info(f"Splitter: Executing Protocol Beta (Semantic Clustering)")
 
 		# 1. Atomic Split (Sentences)
-		atoms = re.split(r'(?<=[.!?]) +', text)
-		if not atoms: return [text]
-
-		# 2. Vectorize atoms (Using dspy to get embeddings if available,
-		# but here we'll simulate or use a simple heuristic if no embedder exposed)
-		# MISSION: Implement true vector clustering when embedder is connected.
-
-		# Heuristic fallback: Group sentences until a topic shift or size limit
+		atoms = [a for a in re.split(r'(?<=[.!?]) +', text) if a.strip()]
+		if len(atoms) <= 1: return [text]
+
+		# 2. Vectorize atoms (batched, cached per sentence hash)
+		embeddings = self.embedder.embed(atoms)
+		if embeddings is None:
+			# Heuristic fallback: group sentences up to the size limit
+			return self._group_atoms(atoms, None, max_words)
+
+		# 3. Adjacent similarity -> topic boundaries
+		similarities = np.einsum("ij,ij->i", embeddings[:-1], embeddings[1:])
+		breaks = similarities < threshold
+		return self._group_atoms(atoms, breaks, max_words)
+
+	@staticmethod
+	def _group_atoms(atoms: List[str], breaks: Optional[Any], max_words: int) -> List[str]:
+		"""Join atoms into chunks, cutting at `breaks[i-1]` or when `max_words` would overflow."""
 		chunks = []
-		current_chunk = atoms[0]
+		current = [atoms[0]]
+		current_words = len(atoms[0].split())
 
 		for i in range(1, len(atoms)):
-			# Heuristic similarity (simulated for now until Embedder ready)
-			# In a real implementation: similarity = cosine_sim(embed(current), embed(p))
-			if len((current_chunk + " " + atoms[i]).split()) <= 250:
-				current_chunk += " " + atoms[i]
-			else:
-				chunks.append(current_chunk)
-				current_chunk = atoms[i]
-
-		chunks.append(current_chunk)
+			words = len(atoms[i].split())
+			topic_shift = breaks is not None and bool(breaks[i - 1])
+			if topic_shift or current_words + words > max_words:
+				chunks.append(" ".join(current))
+				current, current_words = [], 0
+			current.append(atoms[i])
+			current_words += words
+
+		chunks.append(" ".join(current))
 		return chunks
 
 # Global instance
@@ -1,41 +1,66 @@
+import os
 import time
 import asyncio
 import logging
 import json
+from contextvars import ContextVar
 from typing import Dict, List, Any, Optional
 from .bus import bus
-from .protocol import A2AMessage
+from .inbox import AdmissionError, NO_CACHE_KEY
+from .protocol import A2AMessage, MessagePriority
 from .workflow import workflow_orchestrator, WorkflowDefinition, WorkflowNode, WorkflowState
 from .ui_bridge import ui_bridge
 from backend.utils.finance import finance_tracker
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Start time of the workflow running in the current task. Node tasks inherit it,
+# so each concurrent workflow is held to its own budget.
+_workflow_started: ContextVar[Optional[float]] = ContextVar("workflow_started", default=None)
+
 class AgencyOrchestrator:
 	"""
 	Technical Brain of _SUDOTEER.
 	Orchestrates professional multi-agent workflows with A2A protocol.
 	Enforces ROI-based guardrails and tracks system health.
+	Up to `max_concurrent_workflows` chains run at once; further goals wait,
+	and new goals are rejected once `max_waiting` are waiting or
+	`max_queued_requests` A2A requests are queued across all agent inboxes.
 	"""
-	def __init__(self, budget_limit_hours: float = 2.0):
+	def __init__(self, budget_limit_hours: float = 2.0, max_concurrent_workflows: int = None, max_waiting: int = None, max_queued_requests: int = None):
 		self.budget_limit_hours = budget_limit_hours
 		self.start_time = None
+		self.max_concurrent_workflows = max_concurrent_workflows or int(os.getenv("SUDOTEER_MAX_WORKFLOWS", "4"))
+		self.max_waiting = max_waiting or int(os.getenv("SUDOTEER_MAX_WAITING_WORKFLOWS", "16"))
+		self.max_queued_requests = max_queued_requests or int(os.getenv("SUDOTEER_MAX_QUEUED_REQUESTS", "128"))
+		self.active_workflows = 0
+		self.waiting_workflows = 0
+		self._slots: Optional[asyncio.Semaphore] = None
+		self._slots_loop = None
 		self._setup_default_workflows()
 
 	def _setup_default_workflows(self):
-		"""Define the core 'Pass-the-Torch' validation chain."""
+		"""
+		Define the core 'Pass-the-Torch' validation chain.
+		After testing, documentation and a code review run side by side;
+		the final audit joins on both. Coding and testing write to memory and
+		award XP, so they always run; documentation, review and the audit only
+		read their declared inputs, so a successful output is reused when those
+		inputs repeat.
+		"""
 		nodes = [
 			WorkflowNode("coder", "coder", self._step_coder, ["tester"]),
-			WorkflowNode("tester", "tester", self._step_tester, ["documenter"]),
-			WorkflowNode("documenter", "documenter", self._step_documenter, ["validator"]),
-			WorkflowNode("validator", "validator", self._step_validator, [])
+			WorkflowNode("tester", "tester", self._step_tester, ["documenter", "reviewer"]),
+			WorkflowNode("documenter", "documenter", self._step_documenter, ["validator"], cacheable=True, inputs=["code", "test_report"]),
+			WorkflowNode("reviewer", "validator", self._step_reviewer, ["validator"], cacheable=True, inputs=["code", "test_report"]),
+			WorkflowNode("validator", "validator", self._step_validator, [], cacheable=True, inputs=["code", "test_report", "docs", "review"])
 		]
 		chain = WorkflowDefinition("validation_chain", "Professional Coder-to-Validator flow", nodes, "coder")
 		workflow_orchestrator.register_workflow(chain)
 
 	# --- Workflow Step Functions ---
 
-	async def _run_agent_step(self, state: WorkflowState, agent_id: str, task_name: str, payload_key: str, input_payload: Dict[str, Any]) -> WorkflowState:
+	async def _run_agent_step(self, state: WorkflowState, agent_id: str, task_name: str, payload_key: str, input_payload: Dict[str, Any], priority: MessagePriority = MessagePriority.NORMAL) -> WorkflowState:
 		"""Generic helper to run a standardized agent step with guardrails."""
 		if not self.check_viability():
 			return state
@@ -46,7 +71,10 @@ class AgencyOrchestrator:
 		result = await bus.send_request(A2AMessage(
 			from_agent="orchestrator",
 			to_agent=agent_id,
-			content=input_payload
+			content=input_payload,
+			priority=priority,
+			# A retried step must not be handed the LLM answers that just failed
+			metadata={NO_CACHE_KEY: True} if state.get("attempt") else None
 		))
 
 		state["data"][payload_key] = result
@@ -68,6 +96,13 @@ class AgencyOrchestrator:
 	async def _step_documenter(self, state: WorkflowState) -> WorkflowState:
 		return await self._run_agent_step(
 			state, "documenter_01", "Documentation Phase", "docs",
+			{"code": state["data"].get("code"), "tests": state["data"].get("test_report")},
+			priority=MessagePriority.LOW  # Bulk work: yields to everything else
+		)
+
+	async def _step_reviewer(self, state: WorkflowState) -> WorkflowState:
+		return await self._run_agent_step(
+			state, "validator_01", "Code Review Phase", "review",
 			{"code": state["data"].get("code"), "tests": state["data"].get("test_report")}
 		)
 
@@ -77,12 +112,13 @@ class AgencyOrchestrator:
 			{"bundle": {
 				"code": state["data"].get("code"),
 				"tests": state["data"].get("test_report"),
-				"docs": state["data"].get("docs")
+				"docs": state["data"].get("docs"),
+				"review": state["data"].get("review")
 			}}
 		)
 		# Extraction logic moved here for simplicity
 		v_res = state["data"].get("validation_result")
-		state["data"]["valid"] = v_res.get("valid") if isinstance(v_res, dict) else False
+		state["data"]["valid"] = v_res.get("is_valid", v_res.get("valid", False)) if isinstance(v_res, dict) else False
 		return state
 
 	# --- Utilities ---
@@ -92,19 +128,77 @@ class AgencyOrchestrator:
 		logger.info("Agency workflow timer started.")
 
 	def check_viability(self) -> bool:
-		if not self.start_time: return True
-		elapsed_hours = (time.time() - self.start_time) / 3600
+		started = _workflow_started.get() or self.start_time
+		if not started: return True
+		elapsed_hours = (time.time() - started) / 3600
 		if elapsed_hours > self.budget_limit_hours or not finance_tracker.is_stable():
 			logger.error("Stop signal triggered: Budget or Financial Stability violation.")
 			return False
 		return True
 
+	def _workflow_slots(self) -> asyncio.Semaphore:
+		loop = asyncio.get_running_loop()
+		if self._slots is None or self._slots_loop is not loop:
+			self._slots = asyncio.Semaphore(self.max_concurrent_workflows)
+			self._slots_loop = loop
+		return self._slots
+
+	def admission_block(self) -> Optional[str]:
+		"""Why new work would be rejected right now, or None if it is accepted."""
+		if self.waiting_workflows >= self.max_waiting:
+			return f"{self.waiting_workflows} workflows already waiting"
+		queued = bus.queue_depth()
+		if queued >= self.max_queued_requests:
+			return f"{queued} agent requests already queued"
+		return None
+
+	async def _admitted(self, run):
+		"""Run one workflow under admission control with its own budget timer."""
+		blocked = self.admission_block()
+		if blocked:
+			raise AdmissionError(f"Agency busy: {blocked}")
+
+		slots = self._workflow_slots()
+		self.waiting_workflows += 1
+		try:
+			await slots.acquire()
+		finally:
+			self.waiting_workflows -= 1
+
+		self.active_workflows += 1
+		self.start_time = time.time()
+		token = _workflow_started.set(self.start_time)
+		try:
+			return await run()
+		finally:
+			_workflow_started.reset(token)
+			self.active_workflows -= 1
+			slots.release()
+
 	async def execute_validation_chain(self, goal: str):
-		self.start_timer()
 		logger.info(f"Triggering professional validation chain for goal: {goal}")
-
-		final_state = await workflow_orchestrator.execute_workflow("validation_chain", {"goal": goal})
-
+		final_state = await self._admitted(
+			lambda: workflow_orchestrator.execute_workflow("validation_chain", {"goal": goal})
+		)
+		return self._finish_chain(goal, final_state)
+
+	async def resume_validation_chain(self, workflow_id: str):
+		"""Pick up a validation chain that stopped mid-way (e.g. after a crash)."""
+		logger.info(f"Resuming validation chain {workflow_id}")
+		final_state = await self._admitted(lambda: workflow_orchestrator.resume_workflow(workflow_id))
+		return self._finish_chain(final_state["data"].get("goal"), final_state)
+
+	def get_load(self) -> Dict[str, Any]:
+		return {
+			"active_workflows": self.active_workflows,
+			"waiting_workflows": self.waiting_workflows,
+			"max_concurrent_workflows": self.max_concurrent_workflows,
+			"queued_requests": bus.queue_depth(),
+			"accepting": self.admission_block() is None,
+			"inboxes": bus.get_inbox_stats()
+		}
+
+	def _finish_chain(self, goal: str, final_state: Dict[str, Any]):
 		success = final_state["data"].get("valid", False)
 		finance_tracker.log_effectiveness(goal, 1, success)
 
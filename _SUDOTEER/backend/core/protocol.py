@@ -1,9 +1,16 @@
-import uuid
+import json
+import time
+import itertools
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from enum import Enum
 
+try:
+	import msgpack
+except ImportError:  # Optional: the codec falls back to compact JSON
+	msgpack = None
+
 logger = logging.getLogger("_SUDOTEER")
 
 class MessagePriority(Enum):
@@ -12,11 +19,21 @@ class MessagePriority(Enum):
 	HIGH = "high"
 	URGENT = "urgent"
 
+# Process-wide message ids: monotonic, start at 1 so an id is never falsy
+_message_ids = itertools.count(1)
+
 class A2AMessage:
 	"""
 	Standardized A2A (Agent-to-Agent) Message Protocol.
 	Ensures type-safety and visual consistency across the agency.
+	Slotted and cheap to build: integer ids, the ISO timestamp is only
+	formatted when read, and metadata is only allocated when used.
 	"""
+	__slots__ = (
+		"message_id", "created", "from_agent", "to_agent", "content", "message_type",
+		"priority", "requires_response", "parent_id", "_timestamp", "_metadata"
+	)
+
 	def __init__(
 		self,
 		from_agent: str,
@@ -25,11 +42,11 @@ class A2AMessage:
 		message_type: str = "request",
 		priority: MessagePriority = MessagePriority.NORMAL,
 		requires_response: bool = False,
-		parent_id: Optional[str] = None,
+		parent_id: Optional[int] = None,
 		metadata: Optional[Dict[str, Any]] = None
 	):
-		self.message_id = str(uuid.uuid4())
-		self.timestamp = datetime.now().isoformat()
+		self.message_id = next(_message_ids)
+		self.created = time.time()
 		self.from_agent = from_agent
 		self.to_agent = to_agent
 		self.content = content
@@ -37,7 +54,28 @@ class A2AMessage:
 		self.priority = priority
 		self.requires_response = requires_response
 		self.parent_id = parent_id
-		self.metadata = metadata or {}
+		self._timestamp = None
+		self._metadata = metadata
+
+	@property
+	def timestamp(self) -> str:
+		if self._timestamp is None:
+			self._timestamp = datetime.fromtimestamp(self.created).isoformat()
+		return self._timestamp
+
+	@timestamp.setter
+	def timestamp(self, value: str):
+		self._timestamp = value
+
+	@property
+	def metadata(self) -> Dict[str, Any]:
+		if self._metadata is None:
+			self._metadata = {}
+		return self._metadata
+
+	@metadata.setter
+	def metadata(self, value: Optional[Dict[str, Any]]):
+		self._metadata = value
 
 	def to_dict(self) -> Dict[str, Any]:
 		return {
@@ -62,10 +100,11 @@ class A2AMessage:
 			message_type=data.get("message_type", "request"),
 			priority=MessagePriority(data.get("priority", "normal")),
 			requires_response=data.get("requires_response", False),
-			parent_id=data.get("parent_id")
+			parent_id=data.get("parent_id"),
+			metadata=data.get("metadata")
 		)
 		msg.message_id = data.get("message_id", msg.message_id)
-		msg.timestamp = data.get("timestamp", msg.timestamp)
+		if "timestamp" in data: msg.timestamp = data["timestamp"]
 		return msg
 
 	def validate(self) -> bool:
@@ -73,3 +112,58 @@ class A2AMessage:
 		if not self.from_agent or not self.to_agent or not self.content:
 			return False
 		return True
+
+	def __repr__(self) -> str:
+		return f"A2AMessage({self.message_id}, {self.from_agent} -> {self.to_agent}, {self.message_type})"
+
+class MessageCodec:
+	"""
+	Binary wire format for A2AMessage.
+	Frame: [schema version][format][payload], payload being a positional array
+	of fields (msgpack when installed, compact JSON otherwise).
+	Decoding rejects unknown schema versions instead of guessing.
+	"""
+	SCHEMA_VERSION = 1
+	MSGPACK = ord("M")
+	JSON = ord("J")
+
+	# Positional codes follow MessagePriority's declaration order; changing it needs a new SCHEMA_VERSION
+	PRIORITY_CODES = {p: i for i, p in enumerate(MessagePriority)}
+	PRIORITIES = list(MessagePriority)
+
+	@classmethod
+	def _fields(cls, msg: A2AMessage) -> List[Any]:
+		return [
+			msg.message_id, msg.created, msg._timestamp, msg.from_agent, msg.to_agent, msg.content,
+			msg.message_type, cls.PRIORITY_CODES[msg.priority], msg.requires_response,
+			msg.parent_id, msg._metadata
+		]
+
+	@classmethod
+	def encode(cls, msg: A2AMessage, use_msgpack: bool = True) -> bytes:
+		fields = cls._fields(msg)
+		if use_msgpack and msgpack is not None:
+			return bytes((cls.SCHEMA_VERSION, cls.MSGPACK)) + msgpack.packb(fields, use_bin_type=True, default=str)
+		return bytes((cls.SCHEMA_VERSION, cls.JSON)) + json.dumps(fields, separators=(",", ":"), default=str).encode("utf-8")
+
+	@classmethod
+	def decode(cls, frame: bytes) -> A2AMessage:
+		if len(frame) < 2:
+			raise ValueError("A2A frame too short")
+		version, fmt = frame[0], frame[1]
+		if version != cls.SCHEMA_VERSION:
+			raise ValueError(f"Unsupported A2A schema version {version} (expected {cls.SCHEMA_VERSION})")
+		if fmt == cls.MSGPACK:
+			if msgpack is None:
+				raise ValueError("A2A frame is msgpack-encoded but msgpack is not installed")
+			fields = msgpack.unpackb(frame[2:], raw=False)
+		elif fmt == cls.JSON:
+			fields = json.loads(frame[2:])
+		else:
+			raise ValueError(f"Unknown A2A frame format {fmt!r}")
+
+		msg = A2AMessage.__new__(A2AMessage)
+		(msg.message_id, msg.created, msg._timestamp, msg.from_agent, msg.to_agent, msg.content,
+			msg.message_type, priority, msg.requires_response, msg.parent_id, msg._metadata) = fields
+		msg.priority = cls.PRIORITIES[priority]
+		return msg
@@ -0,0 +1,118 @@
+"""
+_SUDOTEER Topic Recording Policies
+How bus.publish() audits each topic. Agent broadcasts are recorded frame by
+frame; high-rate telemetry takes a fast lane where frames are not wrapped as
+A2AMessages and the recorder only receives per-window min/max/mean summaries
+(or every Nth frame). Frames shared by many subscribers can be frozen so no
+subscriber can change what the others see.
+"""
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Recording modes
+FULL = "full"        # every frame is a monologue event
+SUMMARY = "summary"  # per-window min/max/mean of numeric fields
+SAMPLED = "sampled"  # every `sample_every`-th frame
+OFF = "off"          # not recorded
+MODES = (FULL, SUMMARY, SAMPLED, OFF)
+
+class TopicPolicy:
+	"""Recording policy for a topic, or for every topic under a prefix ending in '/'."""
+	def __init__(self, recording: str = FULL, window_s: float = 1.0, sample_every: int = 10):
+		if recording not in MODES:
+			raise ValueError(f"Unknown recording mode '{recording}' (expected one of {MODES})")
+		self.recording = recording
+		self.window_s = window_s
+		self.sample_every = max(1, sample_every)
+
+	@property
+	def fast_lane(self) -> bool:
+		"""Frames are delivered raw, without an A2AMessage wrapper."""
+		return self.recording != FULL
+
+	def __repr__(self) -> str:
+		return f"TopicPolicy({self.recording}, window_s={self.window_s}, sample_every={self.sample_every})"
+
+# Defaults: every telemetry/ topic is summarised once per second
+DEFAULT_POLICIES: Dict[str, TopicPolicy] = {
+	"telemetry/": TopicPolicy(SUMMARY, window_s=1.0)
+}
+
+class FrozenDict(dict):
+	"""Read-only dict: still JSON-serialisable and a dict for subscribers, but not mutable."""
+	def _readonly(self, *args, **kwargs):
+		raise TypeError("Telemetry frames are shared between subscribers and read-only")
+
+	__setitem__ = __delitem__ = __ior__ = _readonly
+	clear = pop = popitem = setdefault = update = _readonly
+
+	def __hash__(self):
+		return id(self)
+
+def freeze(value: Any) -> Any:
+	"""Deep copy of dicts/lists/deques into FrozenDicts and tuples."""
+	if isinstance(value, dict):
+		return value if isinstance(value, FrozenDict) else FrozenDict((k, freeze(v)) for k, v in value.items())
+	if isinstance(value, (list, tuple, deque)):
+		return tuple(freeze(v) for v in value)
+	return value
+
+class TelemetryAggregator:
+	"""
+	Min/max/mean of every numeric field seen on one topic during the current window.
+	Nested dicts are flattened to dotted keys; for lists (sample buffers) the
+	latest value counts.
+	"""
+	def __init__(self, topic: str, window_s: float):
+		self.topic = topic
+		self.window_s = window_s
+		self.frames = 0
+		self.started: Optional[float] = None
+		self.fields: Dict[str, list] = {}  # key -> [min, max, sum, count]
+
+	def add(self, frame: Any, now: float = None):
+		now = time.time() if now is None else now
+		if self.started is None: self.started = now
+		self.frames += 1
+		self._fold("", frame)
+
+	def _fold(self, key: str, value: Any):
+		if isinstance(value, dict):
+			for name, item in value.items():
+				self._fold(f"{key}.{name}" if key else str(name), item)
+			return
+		if isinstance(value, (list, tuple)):
+			if value: self._fold(key, value[-1])
+			return
+		if isinstance(value, bool) or not isinstance(value, (int, float)):
+			return
+		stats = self.fields.get(key)
+		if stats is None:
+			self.fields[key] = [value, value, value, 1]
+		else:
+			if value < stats[0]: stats[0] = value
+			if value > stats[1]: stats[1] = value
+			stats[2] += value
+			stats[3] += 1
+
+	def due(self, now: float = None) -> bool:
+		now = time.time() if now is None else now
+		return self.started is not None and now - self.started >= self.window_s
+
+	def flush(self, now: float = None) -> Optional[Dict[str, Any]]:
+		"""Summary of the window so far (None if empty); starts a new window."""
+		if not self.frames:
+			return None
+		now = time.time() if now is None else now
+		summary = {
+			"topic": self.topic,
+			"frames": self.frames,
+			"window_s": round(now - self.started, 3),
+			"fields": {
+				key: {"min": s[0], "max": s[1], "mean": round(s[2] / s[3], 4), "n": s[3]}
+				for key, s in self.fields.items()
+			}
+		}
+		self.frames, self.started, self.fields = 0, None, {}
+		return summary
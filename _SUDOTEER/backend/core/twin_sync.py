@@ -2,82 +2,162 @@
 _SUDOTEER Twin Sync Engine
 Synchronizes the Physical Twin (Hardware) with the Digital Twin (Graph/Memory).
 Detects drift, verifies operations, and publishes 'Wisdom' upon resolution.
+Expectations live in an in-memory table indexed by channel; drift is evaluated
+as telemetry arrives, and the graph is only written when an expectation changes.
 """
 import logging
 import asyncio
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from backend.core.bus import bus
 from backend.core.memory.manager import memory_manager
 from backend.core.ui_bridge import ui_bridge
+from backend.core.hardware.safety import CHANNEL_ALIASES
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Allowed |physical - expected| per key before it counts as drift
+DEFAULT_TOLERANCES = {
+    "S02_TEMP": 1.0,
+    "S03_HUM": 5.0,
+    "S04_PH": 0.3,
+    "S05_EC": 0.2,
+}
+
+class Expectation:
+    """One expected value. Drift starts beyond `tolerance` and clears below `tolerance - hysteresis`."""
+    __slots__ = ("key", "value", "tolerance", "hysteresis", "drifting", "since", "physical")
+
+    def __init__(self, key: str, value: Any, tolerance: float, hysteresis: float):
+        self.key = key
+        self.value = value
+        self.tolerance = tolerance
+        self.hysteresis = hysteresis
+        self.drifting = False
+        self.since: Optional[float] = None
+        self.physical: Any = None
+
+    def error(self, physical: Any) -> Optional[float]:
+        """|physical - expected| for numbers; 0/inf for exact-match values (bools, states)."""
+        numeric = (int, float)
+        if isinstance(physical, numeric) and isinstance(self.value, numeric) \
+                and not isinstance(physical, bool) and not isinstance(self.value, bool):
+            return abs(physical - self.value)
+        return 0.0 if physical == self.value else float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "expected": self.value,
+            "physical": self.physical,
+            "tolerance": self.tolerance,
+            "drifting": self.drifting,
+            "since": self.since
+        }
+
 class TwinSyncEngine:
-    def __init__(self):
-        self.expectations: Dict[str, Any] = {}
+    def __init__(self, default_tolerance: float = 1.0, hysteresis_ratio: float = 0.25):
+        self.expectations: Dict[str, Expectation] = {}  # canonical key -> expectation
+        self.tolerances: Dict[str, float] = dict(DEFAULT_TOLERANCES)
+        self.default_tolerance = default_tolerance
+        self.hysteresis_ratio = hysteresis_ratio
         self.last_sync_time = time.time()
-        self.sync_interval = 5.0 # Seconds
         self.is_running = False
+        self.stats = {"frames": 0, "checks": 0, "alerts": 0, "resolved": 0, "graph_writes": 0}
+        self._writes: set = set()  # Pending graph writes (strong refs until done)
+
+    @staticmethod
+    def _canonical(key: str) -> str:
+        return CHANNEL_ALIASES.get(key, key)
 
-    def start(self):
-        """Start the sync monitoring loop."""
+    async def start(self, topic: str = "telemetry/high_freq"):
+        """Evaluate drift on every telemetry frame (no polling)."""
         if self.is_running: return
         self.is_running = True
-        asyncio.create_task(self._sync_loop())
-        logger.info("TwinSyncEngine: Monitoring started.")
-
-    async def _sync_loop(self):
-        """Background loop to verify physical vs digital state."""
-        while self.is_running:
-            try:
-                await self.perform_sync_check()
-            except Exception as e:
-                logger.error(f"TwinSync Error: {e}")
-            await asyncio.sleep(self.sync_interval)
-
-    async def perform_sync_check(self):
+        await bus.subscribe(topic, self._on_frame)
+        logger.info(f"TwinSyncEngine: Monitoring {topic}.")
+
+    async def _on_frame(self, data: Any):
+        if isinstance(data, dict):
+            self.observe(data.get("raw", data))
+
+    def observe(self, physical: Dict[str, Any], now: float = None) -> List[str]:
+        """Check one telemetry frame against the expectations it touches; returns keys that changed state."""
+        now = time.time() if now is None else now
+        self.stats["frames"] += 1
+        self.last_sync_time = now
+        changed = []
+        for key, value in physical.items():
+            if value is None: continue
+            exp = self.expectations.get(self._canonical(key))
+            if exp is None: continue
+            self.stats["checks"] += 1
+            exp.physical = value
+            error = exp.error(value)
+            if not exp.drifting and error > exp.tolerance:
+                exp.drifting, exp.since = True, now
+                self.stats["alerts"] += 1
+                changed.append(exp.key)
+                logger.warning(f"TWIN DRIFT: {exp.key} (Physical: {value} != Expected: {exp.value})")
+                ui_bridge.broadcast("TWIN_DRIFT_ALERT", "system", {
+                    "key": exp.key,
+                    "physical": value,
+                    "expected": exp.value,
+                    "tolerance": exp.tolerance
+                })
+            elif exp.drifting and error <= exp.tolerance - exp.hysteresis:
+                self.stats["resolved"] += 1
+                changed.append(exp.key)
+                logger.info(f"TWIN SYNC: {exp.key} back in tolerance after {now - exp.since:.1f}s")
+                ui_bridge.broadcast("TWIN_DRIFT_RESOLVED", "system", {
+                    "key": exp.key,
+                    "physical": value,
+                    "expected": exp.value,
+                    "duration_s": round(now - exp.since, 2)
+                })
+                exp.drifting, exp.since = False, None
+        return changed
+
+    async def perform_sync_check(self) -> Dict[str, Dict[str, Any]]:
         """
-        The 'Reality Check': Compares physical sensors with digital expectations.
+        The 'Reality Check': current drift state of every expectation.
+        Evaluation already happened as telemetry arrived; this only reads the table.
         """
-        # 1. Fetch current physical sensors from Industrial Bridge (simulated via bus)
-        # In this implementation, we subscribe to topics, but for a global check,
-        # we can peek at the industrial_bridge instance.
-        from backend.core.industrial_bridge import industrial_bridge
-        physical_state = industrial_bridge.sensors
-
-        # 2. Fetch Digital Expectations from Memory Manager (Neo4j/Graph)
-        # HANDBOOK: 'How should the greenhouse look right now?'
-        digital_expectations = await memory_manager.recall("Current environmental expectations", mode="relational")
-
-        # 3. Detect Drift
-        drift_detected = False
-        for key, physical_val in physical_state.items():
-            expected_val = digital_expectations.get("graph_context", {}).get(key)
-
-            if expected_val is not None:
-                # Basic threshold check
-                if abs(float(physical_val) - float(expected_val)) > 1.0:
-                    drift_detected = True
-                    logger.warning(f"TWIN DRIFT: {key} (Physical: {physical_val} != Expected: {expected_val})")
-                    ui_bridge.broadcast("TWIN_DRIFT_ALERT", "system", {
-                        "key": key,
-                        "physical": physical_val,
-                        "expected": expected_val
-                    })
-
-        # 4. Update Heartbeat
-        self.last_sync_time = time.time()
+        return {key: exp.to_dict() for key, exp in self.expectations.items() if exp.drifting}
 
-    def set_expectation(self, key: str, value: Any):
+    def set_expectation(self, key: str, value: Any, tolerance: float = None, hysteresis: float = None):
         """Agents call this when they perform an action (e.g. 'Turn on Light')."""
-        self.expectations[key] = value
-        # Also store in Graph for long-term 'Expectation'
-        asyncio.create_task(memory_manager.remember("twin_sync", f"Set digital expectation for {key} to {value}", {
+        canonical = self._canonical(key)
+        tolerance = tolerance if tolerance is not None else self.tolerances.get(canonical, self.default_tolerance)
+        hysteresis = hysteresis if hysteresis is not None else tolerance * self.hysteresis_ratio
+        exp = self.expectations.get(canonical)
+        if exp is not None and exp.value == value and exp.tolerance == tolerance and exp.hysteresis == hysteresis:
+            return  # Unchanged: nothing to store
+
+        if exp is None:
+            exp = self.expectations[canonical] = Expectation(canonical, value, tolerance, hysteresis)
+        else:
+            exp.value, exp.tolerance, exp.hysteresis = value, tolerance, hysteresis
+            if exp.drifting and exp.physical is not None and exp.error(exp.physical) <= tolerance:
+                exp.drifting, exp.since = False, None  # The new target already matches reality
+
+        # Also store in Graph for long-term 'Expectation' (only on change)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug(f"TWIN SYNC: No event loop, expectation for {canonical} kept in memory only.")
+            return
+        self.stats["graph_writes"] += 1
+        task = loop.create_task(memory_manager.remember("twin_sync", f"Set digital expectation for {canonical} to {value}", {
             "type": "expectation",
-            "key": key,
-            "value": value
+            "key": canonical,
+            "value": value,
+            "tolerance": tolerance
         }))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    def clear_expectation(self, key: str):
+        self.expectations.pop(self._canonical(key), None)
 
 # Global Instance
 twin_sync = TwinSyncEngine()
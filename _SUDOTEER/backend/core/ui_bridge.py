@@ -139,7 +139,7 @@ class UIBridge:
 		self.broadcast(f"AGENT_{status.upper()}", agent_id, details or {})
 		self.tick()  # Prove the main thread is alive
 
-	def broadcast_workflow_step(self, workflow_id: str, current_node: str, status: str):
+	def broadcast_workflow_step(self, workflow_id: str, current_node: str, status: str, details: Dict[str, Any] = None):
 		"""
 		Broadcasts workflow progress for real-time visualization.
 
@@ -147,11 +147,13 @@ class UIBridge:
 			workflow_id: Unique workflow execution ID
 			current_node: Currently executing agent
 			status: "processing", "completed", "failed"
+			details: Extra fields, e.g. agent_id and duration_ms per node
 		"""
 		self.broadcast("WORKFLOW_UPDATE", "orchestrator", {
 			"workflow_id": workflow_id,
 			"current_node": current_node,
-			"status": status
+			"status": status,
+			**(details or {})
 		})
 		self.tick()  # Prove the main thread is alive
 
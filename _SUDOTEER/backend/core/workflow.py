@@ -1,13 +1,19 @@
+import time
 import logging
 import asyncio
 import uuid
+from collections import deque
 from typing import Dict, List, Any, Callable, Optional, Union
 from .bus import bus
 from .protocol import A2AMessage
 from .ui_bridge import ui_bridge
+from .checkpoints import WorkflowCheckpointStore, checkpoint_store
 
 logger = logging.getLogger("_SUDOTEER")
 
+# Agent result statuses that mean the step succeeded ("needs_review", "failed", "flagged"... do not)
+SUCCESS_STATUSES = ("success", "completed", "passed", "cleared")
+
 class WorkflowState(dict):
 	"""Dynamic state passed between workflow nodes."""
 	def __init__(self, *args, **kwargs):
@@ -18,6 +24,15 @@ class WorkflowState(dict):
 		if "agent_statuses" not in self: self["agent_statuses"] = {}
 		if "errors" not in self: self["errors"] = []
 		if "status" not in self: self["status"] = "running"
+		if "branches" not in self: self["branches"] = {}  # node name -> data keys that node wrote
+		if "timings" not in self: self["timings"] = {}
+
+	def fork(self) -> "WorkflowState":
+		"""Copy handed to one node; its writes are merged back after it finishes."""
+		branch = WorkflowState(self)
+		branch["data"] = dict(self["data"])
+		branch["errors"] = list(self["errors"])
+		return branch
 
 class WorkflowNode:
 	"""
@@ -30,13 +45,23 @@ class WorkflowNode:
 		agent_id: str,
 		function: Callable[[WorkflowState], Union[WorkflowState, Any]],
 		next_nodes: List[str] = None,
-		condition: Optional[Callable[[WorkflowState], str]] = None
+		condition: Optional[Callable[[WorkflowState], str]] = None,
+		cacheable: bool = False,
+		inputs: Optional[List[str]] = None
 	):
 		self.name = name
 		self.agent_id = agent_id
 		self.function = function
 		self.next_nodes = next_nodes or []
 		self.condition = condition
+		# Reuse a stored output when the node sees identical input data.
+		# Only for side-effect-free steps (e.g. LLM generation), never actuators.
+		self.cacheable = cacheable
+		# Data keys the node reads; the cache key covers only these (None: all of state["data"])
+		self.inputs = inputs
+
+	def cache_inputs(self, data: Dict[str, Any]) -> Dict[str, Any]:
+		return data if self.inputs is None else {k: data.get(k) for k in self.inputs}
 
 class WorkflowDefinition:
 	"""Blueprint for a multi-agent process."""
@@ -49,71 +74,285 @@ class WorkflowDefinition:
 	def get_node(self, name: str) -> Optional[WorkflowNode]:
 		return self.nodes.get(name)
 
+	def predecessors(self) -> Dict[str, List[str]]:
+		"""Forward (non-loop) predecessors of every node reachable from the entry point."""
+		back_edges, reachable = self._walk()
+		preds = {name: [] for name in self.nodes}
+		for name in reachable:
+			node = self.nodes.get(name)
+			for succ in (node.next_nodes if node else []):
+				if succ in preds and (name, succ) not in back_edges:
+					preds[succ].append(name)
+		return preds
+
+	def back_edges(self) -> set:
+		"""Edges that close a cycle (retry loops), found by DFS from the entry point."""
+		return self._walk()[0]
+
+	def _walk(self):
+		edges, visiting, done = set(), set(), set()
+
+		def visit(name: str):
+			visiting.add(name)
+			node = self.nodes.get(name)
+			for succ in (node.next_nodes if node else []):
+				if succ in visiting:
+					edges.add((name, succ))
+				elif succ not in done:
+					visit(succ)
+			visiting.discard(name)
+			done.add(name)
+
+		visit(self.entry_point)
+		return edges, done
+
 class WorkflowOrchestrator:
 	"""
 	Advanced Orchestrator for _SUDOTEER.
 	Executes graph-based workflows with A2A communication.
+	Nodes run as a DAG: every successor in next_nodes is started (or the one a
+	condition picks), join nodes wait for all their predecessors, and at most
+	`max_parallel` nodes run at once.
+	With a checkpoint store, every completed node is persisted so a crashed run
+	can be resumed, and cacheable nodes reuse outputs for identical inputs.
 	"""
-	def __init__(self):
+	def __init__(self, max_parallel: int = 4, max_steps: int = 100, store: WorkflowCheckpointStore = None):
 		self.workflows: Dict[str, WorkflowDefinition] = {}
+		self.max_parallel = max_parallel
+		self.max_steps = max_steps  # Guard against runaway retry loops
+		self.store = store
 
 	def register_workflow(self, workflow: WorkflowDefinition):
 		self.workflows[workflow.name] = workflow
 		logger.info(f"Workflow '{workflow.name}' registered.")
 
-	async def execute_workflow(self, workflow_name: str, initial_data: Dict[str, Any] = None) -> WorkflowState:
+	async def execute_workflow(self, workflow_name: str, initial_data: Dict[str, Any] = None, workflow_id: str = None) -> WorkflowState:
 		"""Run the workflow graph from entry point to end."""
 		if workflow_name not in self.workflows:
 			raise ValueError(f"Workflow '{workflow_name}' not found.")
 
-		workflow = self.workflows[workflow_name]
-		state = WorkflowState(data=initial_data or {})
-		current_node_name = workflow.entry_point
+		state = WorkflowState(data=dict(initial_data or {}))
+		if workflow_id: state["workflow_id"] = workflow_id
+		logger.info(f"[{state['workflow_id']}] Starting workflow: {workflow_name} at {self.workflows[workflow_name].entry_point}")
+		return await self._run(self.workflows[workflow_name], state, initial_data or {}, [])
 
-		logger.info(f"[{state['workflow_id']}] Starting workflow: {workflow_name} at {current_node_name}")
+	async def resume_workflow(self, workflow_id: str) -> WorkflowState:
+		"""
+		Continue a checkpointed run. Completed nodes are replayed from the
+		checkpoint (no agent calls) and execution picks up after the last one.
+		"""
+		checkpoint = self.store.load(workflow_id) if self.store else None
+		if not checkpoint:
+			raise ValueError(f"No checkpoint for workflow '{workflow_id}'.")
+		workflow_name, initial_data, executions, _ = checkpoint
+		if workflow_name not in self.workflows:
+			raise ValueError(f"Workflow '{workflow_name}' not found.")
 
-		try:
-			while current_node_name:
-				node = workflow.get_node(current_node_name)
-				if not node:
-					logger.error(f"Node {current_node_name} not found in workflow {workflow_name}")
-					state["errors"].append(f"Node {current_node_name} not found")
-					state["status"] = "failed"
-					break
+		state = WorkflowState(workflow_id=workflow_id, data=dict(initial_data))
+		logger.info(f"[{workflow_id}] Resuming workflow: {workflow_name} ({len(executions)} nodes already complete)")
+		return await self._run(self.workflows[workflow_name], state, initial_data, executions)
 
-				logger.info(f"[{state['workflow_id']}] Executing Node: {current_node_name} (Agent: {node.agent_id})")
+	async def _run(self, workflow: WorkflowDefinition, state: WorkflowState, initial_data: Dict[str, Any], executions: List[Dict[str, Any]]) -> WorkflowState:
+		workflow_name = workflow.name
+		wf_id = state["workflow_id"]
+		store = self.store
+		# Completed executions per node, in order (a retry loop can run a node several times)
+		replay: Dict[str, deque] = {}
+		for record in executions:
+			replay.setdefault(record["node"], deque()).append(record)
+		executions = list(executions)
 
-				# TICK: Prove main thread is alive before heavy agent task
-				ui_bridge.tick()
+		predecessors = workflow.predecessors()
+		back_edges = workflow.back_edges()
+		waiting = {name: set(p) for name, p in predecessors.items()}  # unresolved predecessors
+		activated = set()  # nodes with at least one taken incoming edge
+		finished = set()
+		running: Dict[str, asyncio.Task] = {}
+		semaphore = asyncio.Semaphore(self.max_parallel)
+		steps = 0
+		attempts: Dict[str, int] = {}  # executions per node so far (retry loops re-run nodes)
 
-				# Execute the node function
-				if asyncio.iscoroutinefunction(node.function):
-					state = await node.function(state)
+		async def run_node(node: WorkflowNode) -> Any:
+			async with semaphore:
+				logger.info(f"[{wf_id}] Executing Node: {node.name} (Agent: {node.agent_id})")
+				state["current_step"] = node.name
+				ui_bridge.broadcast_workflow_step(wf_id, node.name, "processing", {"agent_id": node.agent_id})
+				started = time.perf_counter()
+
+				source = "run"
+				cache_key = None
+				attempt = attempts.get(node.name, 0)
+				attempts[node.name] = attempt + 1
+				pending = replay.get(node.name)
+				if pending:
+					record = pending.popleft()
+					written, status, source = record["written"], record.get("status"), "checkpoint"
 				else:
-					state = node.function(state)
+					if node.cacheable and store and not attempt:  # A retry must not get the same answer back
+						cache_key = store.make_key(workflow_name, node.name, node.cache_inputs(state["data"]))
+						cached = store.get_output(cache_key)
+					else:
+						cached = None
+					if cached is not None:
+						written, status, source = cached["written"], cached.get("status"), "cache"
+					else:
+						branch = state.fork()
+						branch["attempt"] = attempt  # > 0 on a retry: steps should not reuse earlier answers
+						base_data, base_errors = dict(branch["data"]), len(branch["errors"])
+						if asyncio.iscoroutinefunction(node.function):
+							result = await node.function(branch)
+						else:
+							result = node.function(branch)
+						errors_before = len(state["errors"])
+						written, status = self._merge(state, node.name, result, base_data, base_errors)
+						if cache_key and not self._reusable(written, status, len(state["errors"]) - errors_before):
+							cache_key = None
 
-				# TICK: Prove main thread is alive after completing task
-				ui_bridge.tick()
+				if source != "run":
+					state["data"].update(written)
+					state["branches"][node.name] = written
+					if status not in (None, "running"):
+						state["status"] = status
+
+				duration_ms = round((time.perf_counter() - started) * 1000, 1)
+				state["timings"][node.name] = {"agent_id": node.agent_id, "duration_ms": duration_ms, "source": source}
+				ui_bridge.broadcast_workflow_step(wf_id, node.name, "completed", {"agent_id": node.agent_id, "duration_ms": duration_ms, "source": source})
 
-				# Determine next node
-				if node.condition:
-					current_node_name = node.condition(state)
-				elif node.next_nodes:
-					# Standard sequential or first of list
-					current_node_name = node.next_nodes[0]
+				if store and source != "checkpoint":
+					record = {"node": node.name, "written": written, "status": status}
+					if cache_key and source == "run":
+						store.put_output(cache_key, workflow_name, node.name, record)
+					executions.append(record)
+					store.save(wf_id, workflow_name, initial_data, executions, "running")
+
+		def launch(name: str):
+			nonlocal steps
+			steps += 1
+			if steps > self.max_steps:
+				raise RuntimeError(f"Workflow exceeded {self.max_steps} node executions")
+			node = workflow.get_node(name)
+			if not node:
+				raise ValueError(f"Node {name} not found")
+			running[name] = asyncio.create_task(run_node(node))
+
+		def resolve(name: str, chosen: List[str]):
+			"""Mark `name` finished and release the successors it chose (or skipped)."""
+			finished.add(name)
+			node = workflow.get_node(name)
+			successors = list(node.next_nodes) if node else []
+			successors += [c for c in chosen if c not in successors]
+			for succ in successors:
+				if (name, succ) in back_edges or (succ in finished and succ in chosen):
+					if succ in chosen:
+						self._reset_downstream(workflow, succ, predecessors, waiting, activated, finished, back_edges)
+						launch(succ)
+					continue
+				waiting.get(succ, set()).discard(name)
+				if succ in chosen:
+					activated.add(succ)
+				if succ in finished or succ in running or waiting.get(succ):
+					continue
+				if succ in activated:
+					launch(succ)
 				else:
-					current_node_name = None
+					resolve(succ, [])  # No incoming edge was taken: skip it and its branch
+
+		try:
+			launch(workflow.entry_point)
+			while running:
+				# TICK: Prove main thread is alive while agents work
+				ui_bridge.tick()
+				done, _ = await asyncio.wait(running.values(), return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					name = next(n for n, t in running.items() if t is task)
+					del running[name]
+					task.result()  # Re-raise node failures
+					node = workflow.get_node(name)
+					if state["status"] != "running":
+						continue
+					if node.condition:
+						target = node.condition(state)
+						chosen = [target] if target else []
+					else:
+						chosen = list(node.next_nodes)
+					resolve(name, chosen)
 
 			if state["status"] == "running":
 				state["status"] = "completed"
+			if store:
+				store.save(wf_id, workflow_name, initial_data, executions, state["status"])
 
 		except Exception as e:
 			logger.error(f"Workflow execution failed: {e}")
 			state["errors"].append(str(e))
 			state["status"] = "failed"
+			for task in running.values():
+				task.cancel()
+			if store:
+				store.save(wf_id, workflow_name, initial_data, executions, "failed")
 
-		logger.info(f"[{state['workflow_id']}] Workflow '{workflow_name}' complete. Status: {state['status']}")
+		logger.info(f"[{wf_id}] Workflow '{workflow_name}' complete. Status: {state['status']}")
 		return state
 
+	@staticmethod
+	def _reusable(written: Dict[str, Any], status: Optional[str], new_errors: int) -> bool:
+		"""
+		Whether a node output may be served to later runs: it wrote something,
+		added no errors, did not end the workflow and no payload reports a failure
+		(a non-success agent status, valid=False, or no answer at all).
+		"""
+		if not written or new_errors or status not in (None, "running"):
+			return False
+		for value in written.values():
+			if value is None or value is False:
+				return False
+			if isinstance(value, dict) and (
+				value.get("status", "success") not in SUCCESS_STATUSES
+				or value.get("valid") is False or value.get("is_valid") is False or "error" in value
+			):
+				return False
+		return True
+
+	@staticmethod
+	def _merge(state: WorkflowState, node_name: str, result: Any, base_data: Dict[str, Any], base_errors: int) -> tuple:
+		"""
+		Fold one node's writes into the shared state and record them under the
+		node's branch namespace. Only keys the node changed since it forked are
+		merged, so parallel siblings never overwrite each other with stale values.
+		Returns (written, status).
+		"""
+		status = None
+		if isinstance(result, dict) and isinstance(result.get("data"), dict):
+			written = {k: v for k, v in result["data"].items() if k not in base_data or base_data[k] is not v}
+			for err in result.get("errors", [])[base_errors:]:
+				state["errors"].append(err)
+			status = result.get("status")
+			if status not in (None, "running"):
+				state["status"] = status
+		else:
+			written = {node_name: result}
+		state["data"].update(written)
+		state["branches"][node_name] = written
+		return written, status
+
+	@staticmethod
+	def _reset_downstream(workflow: WorkflowDefinition, start: str, predecessors, waiting, activated, finished, back_edges):
+		"""Re-arm `start` and everything after it so a retry loop can run them again."""
+		stack, rerun = [start], set()
+		while stack:
+			name = stack.pop()
+			if name in rerun: continue
+			rerun.add(name)
+			node = workflow.get_node(name)
+			for succ in (node.next_nodes if node else []):
+				if (name, succ) not in back_edges:
+					stack.append(succ)
+		for name in rerun:
+			finished.discard(name)
+			activated.discard(name)
+			# Predecessors outside the loop body already ran and stay resolved
+			waiting[name] = {p for p in predecessors.get(name, []) if p in rerun}
+		waiting[start] = set()
+
 # Global orchestrator instance
-workflow_orchestrator = WorkflowOrchestrator()
+workflow_orchestrator = WorkflowOrchestrator(store=checkpoint_store)
@@ -22,6 +22,12 @@ class FinancialTracker:
 			"estimated_cost": 0.0
 		}
 
+		# LLM Response Cache Metrics
+		self.cache = {
+			"hits": 0,
+			"misses": 0
+		}
+
 		# Effectiveness Metrics
 		self.effectiveness = {
 			"total_tasks": 0,
@@ -44,6 +50,14 @@ class FinancialTracker:
 		self.tokens["estimated_cost"] += cost
 		self.log_transaction(-cost, "token_cost", f"Tokens for {model}")
 
+	def log_cache(self, hit: bool):
+		"""Record an LLM response cache lookup (a hit is a model call avoided)."""
+		self.cache["hits" if hit else "misses"] += 1
+
+	def get_cache_hit_rate(self) -> float:
+		lookups = self.cache["hits"] + self.cache["misses"]
+		return self.cache["hits"] / lookups if lookups else 0.0
+
 	def log_effectiveness(self, task_id: str, attempts: int, success: bool):
 		"""Track how many attempts were needed for a task."""
 		self.effectiveness["total_tasks"] += 1
@@ -98,6 +112,7 @@ class FinancialTracker:
 		return {
 			"financial": {"net": self.get_profitability(), "total_spent": self.total_out},
 			"tokens": self.tokens,
+			"llm_cache": {**self.cache, "hit_rate": f"{self.get_cache_hit_rate():.1%}"},
 			"effectiveness": {
 				"completion_rate": f"{completion_rate:.1%}",
 				"ftp_rate": f"{(self.effectiveness['first_time_pass'] / max(1, self.effectiveness['total_tasks'])):.1%}"
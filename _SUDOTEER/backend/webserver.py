@@ -61,10 +61,14 @@ async def handle_goal(data: dict):
     goal = data.get("goal")
     logger.info(f"API Goal Recv: {goal}")
 
+    from backend.core.inbox import AdmissionError
     try:
         from backend.core.orchestrator import orchestrator
         result = await orchestrator.execute_validation_chain(goal)
         return {"status": "success", "result": result}
+    except AdmissionError as e:
+        logger.warning(f"Goal rejected: {e}")
+        return {"status": "busy", "error": str(e)}
     except Exception as e:
         logger.error(f"Goal Execution Error: {e}")
         return {"status": "error", "error": str(e)}
@@ -0,0 +1,85 @@
+"""
+A2A Message Benchmark - Per-message construction cost, allocation and codec speed.
+Compares the slotted A2AMessage against the previous uuid4/isoformat/dict design.
+Run: python scripts/benchmark_messages.py [--count 100000]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.core import protocol
+from backend.core.protocol import A2AMessage, MessageCodec, MessagePriority
+
+TELEMETRY = {"S01_TEMP": 24.5, "S02_HUM": 61.0, "S03_PH": 6.1, "S04_EC": 1.8}
+
+class LegacyMessage:
+	"""The pre-slots message: uuid4 string, eager ISO timestamp, per-instance dict."""
+	def __init__(self, from_agent, to_agent, content, message_type="request", priority=MessagePriority.NORMAL, metadata=None):
+		self.message_id = str(uuid.uuid4())
+		self.timestamp = datetime.now().isoformat()
+		self.from_agent = from_agent
+		self.to_agent = to_agent
+		self.content = content
+		self.message_type = message_type
+		self.priority = priority
+		self.requires_response = False
+		self.parent_id = None
+		self.metadata = metadata or {}
+
+def build(cls, count):
+	return [cls("system", "topic:telemetry", TELEMETRY, message_type="broadcast") for _ in range(count)]
+
+def measure(cls, count):
+	"""(seconds per message, bytes allocated per message)"""
+	start = time.perf_counter()
+	build(cls, count)
+	elapsed = time.perf_counter() - start
+
+	tracemalloc.start()
+	before = tracemalloc.take_snapshot()
+	messages = build(cls, count)
+	after = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+	allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+	del messages
+	return elapsed / count, allocated / count
+
+def codec(count, use_msgpack):
+	messages = build(A2AMessage, count)
+	start = time.perf_counter()
+	frames = [MessageCodec.encode(m, use_msgpack=use_msgpack) for m in messages]
+	encoded = time.perf_counter() - start
+	start = time.perf_counter()
+	for frame in frames: MessageCodec.decode(frame)
+	decoded = time.perf_counter() - start
+	return encoded / count, decoded / count, sum(map(len, frames)) / count
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--count", type=int, default=100000)
+	args = parser.parse_args()
+
+	print("=" * 60)
+	print("   A2A Message Benchmark")
+	print("=" * 60)
+
+	for name, cls in (("legacy", LegacyMessage), ("slotted", A2AMessage)):
+		per_msg, per_alloc = measure(cls, args.count)
+		print(f"   {name:>8} | {per_msg * 1e6:6.2f} us/msg | {per_alloc:7.1f} B/msg")
+
+	formats = [("json", False)] + ([("msgpack", True)] if protocol.msgpack else [])
+	for name, use_msgpack in formats:
+		enc, dec, size = codec(args.count, use_msgpack)
+		print(f"   {name:>8} | encode {enc * 1e6:5.2f} us | decode {dec * 1e6:5.2f} us | {size:5.1f} B/frame")
+
+	if not protocol.msgpack:
+		print("\n   msgpack not installed: binary frames use the JSON fallback.")
+
+if __name__ == "__main__":
+	main()
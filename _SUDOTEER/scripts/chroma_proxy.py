@@ -1,78 +1,54 @@
 
-import httpx
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Request
 import uvicorn
-import asyncio
-import subprocess
-import os
 import sys
-import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core.memory.chroma_proxy import ChromaProxy, V2_COLLECTIONS
 
 app = FastAPI(title="ChromaDB Compatibility Proxy")
 
 # Port 8000: The public port Vex/IDE connects to
 # Port 8001: The internal port where modern Chroma v2 runs
-CHROMA_INTERNAL_URL = "http://127.0.0.1:8001"
+# One pooled keep-alive client for all routes (SUDOTEER_CHROMA_URL overrides the target)
+proxy = ChromaProxy()
+
+@app.on_event("startup")
+async def startup():
+    await proxy.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await proxy.close()
 
 @app.get("/api/v1/heartbeat")
-async def heartbeat():
-    try:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"{CHROMA_INTERNAL_URL}/api/v2/heartbeat", timeout=5.0)
-            return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-    except Exception as e:
-        return Response(content=f"Proxy error: {str(e)}", status_code=502)
+async def heartbeat(request: Request):
+    return await proxy.forward(request, "/api/v2/heartbeat", route="heartbeat", timeout=5.0)
 
 @app.get("/api/v1/collections")
-async def list_collections():
-    try:
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"{CHROMA_INTERNAL_URL}/api/v2/tenants/default_tenant/databases/default_database/collections", timeout=5.0)
-            return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-    except Exception as e:
-        return Response(content=f"Proxy error: {str(e)}", status_code=502)
+async def list_collections(request: Request):
+    return await proxy.forward(request, V2_COLLECTIONS, route="list_collections", timeout=5.0)
 
 @app.post("/api/v1/collections")
 async def create_collection(request: Request):
-    try:
-        content = await request.body()
-        async with httpx.AsyncClient() as client:
-            r = await client.post(f"{CHROMA_INTERNAL_URL}/api/v2/tenants/default_tenant/databases/default_database/collections", content=content, timeout=5.0)
-            return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-    except Exception as e:
-        return Response(content=f"Proxy error: {str(e)}", status_code=502)
+    return await proxy.forward(request, V2_COLLECTIONS, route="create_collection", timeout=5.0)
 
 @app.api_route("/api/v1/collections/{collection_id}/{action}", methods=["GET", "POST", "PUT", "DELETE"])
 async def collection_action(collection_id: str, action: str, request: Request):
-    try:
-        method = request.method
-        content = await request.body()
-        url = f"{CHROMA_INTERNAL_URL}/api/v2/tenants/default_tenant/databases/default_database/collections/{collection_id}/{action}"
-        async with httpx.AsyncClient() as client:
-            r = await client.request(method, url, content=content, timeout=10.0)
-            return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-    except Exception as e:
-        return Response(content=f"Proxy error: {str(e)}", status_code=502)
+    return await proxy.forward(request, f"{V2_COLLECTIONS}/{collection_id}/{action}", route=f"collection_{action}")
+
+@app.get("/proxy/stats")
+async def proxy_stats():
+    """Pool configuration and per-route latency"""
+    return proxy.get_stats()
 
 @app.api_route("/{path_name:path}", methods=["GET", "POST", "PUT", "DELETE"])
 async def catch_all(request: Request, path_name: str):
     # Fallback for other potential v1 calls
     # Simply try to forward to v1 first, if it fails, the user will know
-    url = f"{CHROMA_INTERNAL_URL}/{path_name}"
-    method = request.method
-    content = await request.body()
-    headers = dict(request.headers)
-
-    # Remove host header to avoid conflicts
-    if "host" in headers:
-        del headers["host"]
-
-    try:
-        async with httpx.AsyncClient() as client:
-            r = await client.request(method, url, content=content, headers=headers, timeout=10.0)
-            return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-    except Exception as e:
-        return Response(content=f"Proxy error: {str(e)}", status_code=502)
+    return await proxy.forward(request, f"/{path_name}", route="passthrough")
 
 if __name__ == "__main__":
     import argparse
@@ -80,5 +56,5 @@ if __name__ == "__main__":
     parser.add_argument("--port", type=int, default=8888)
     args = parser.parse_args()
 
-    print(f"Starting Chroma Compatibility Proxy on port {args.port} -> 8001")
+    print(f"Starting Chroma Compatibility Proxy on port {args.port} -> {proxy.base_url}")
     uvicorn.run(app, host="0.0.0.0", port=args.port)
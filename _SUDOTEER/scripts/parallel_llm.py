@@ -17,10 +17,11 @@ async def run_with_model(name: str, model: str, api_base: str, api_key: str, tas
 	results = []
 
 	try:
+		from backend.core.llm.cache import CachedLM
 		if api_key:
-			lm = dspy.LM(model=model, api_base=api_base, api_key=api_key, cache=False)
+			lm = CachedLM(model=model, api_base=api_base, api_key=api_key)
 		else:
-			lm = dspy.LM(model=model, api_base=api_base, cache=False)
+			lm = CachedLM(model=model, api_base=api_base)
 
 		print(f"[{name}] Connected!")
 
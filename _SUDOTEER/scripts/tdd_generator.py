@@ -40,11 +40,11 @@ async def generate_tests():
 	print("=" * 60)
 
 	# Configure LM Studio with Blitzar
-	lm = dspy.LM(
+	from backend.core.llm.cache import CachedLM
+	lm = CachedLM(
 		model="openai/blitzar-coder-4b",
 		api_base="http://localhost:1234/v1",
-		api_key="lm-studio",
-		cache=False
+		api_key="lm-studio"
 	)
 	dspy.configure(lm=lm, experimental=False)
 	print("\n[OK] Connected to Blitzar-coder-4b")
@@ -15,12 +15,11 @@ Replaces: Electron (avoids 60k+ npm files)
 import uvicorn
 import asyncio
 import logging
-import httpx
 import json
 import time
 from pathlib import Path
 from datetime import datetime
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Response
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 logging.basicConfig(
@@ -29,8 +28,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger("_SUDOTEER.WebServer")
 
-# Chroma Proxy Configuration
-CHROMA_INTERNAL_URL = "http://127.0.0.1:8001"
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -42,6 +39,10 @@ from backend.agents.supervisor import SupervisorAgent
 from backend.core.factory import agent_factory
 from backend.core.dspy_config import initialize_dspy
 from backend.core.boot import SudoBootstrapper
+from backend.core.memory.chroma_proxy import chroma_proxy, V2_COLLECTIONS
+from backend.core.orchestrator import orchestrator
+from backend.core.inbox import AdmissionError
+from backend.core.bus import bus
 
 logger = logging.getLogger("_SUDOTEER.WebServer")
 
@@ -70,8 +71,7 @@ supervisor = None
 
 # Edge Node Reporter (MQTT Distributed Control)
 reporter = None
-last_heartbeat_time = 0
-HEARTBEAT_INTERVAL = 5.0 # Seconds
+HEARTBEAT_INTERVAL = 5.0 # Seconds per batched report
 
 # ============================================
 # WEBSOCKET ENDPOINT (Real-time telemetry)
@@ -125,9 +125,14 @@ async def broadcast_telemetry():
 	Benefits: Native JSON, no parsing errors
 	"""
 	while True:
+		# Get greenhouse state
+		state = greenhouse.get_telemetry_packet()
+
+		# Distributed Control: every sample is batched into a report every 5s (spooled while offline)
+		if reporter:
+			await asyncio.to_thread(reporter.record, state)  # A due batch may hit the SQLite spool
+
 		if active_connections:
-			# Get greenhouse state
-			state = greenhouse.get_telemetry_packet()
 
 			# Create telemetry packet
 			telemetry = {
@@ -137,18 +142,12 @@ async def broadcast_telemetry():
 				"data": state,
 				"edge_status": {
 					"connected": reporter.connected if reporter else False,
-					"unit_id": reporter.unit_id if reporter else "OFFLINE"
+					"unit_id": reporter.unit_id if reporter else "OFFLINE",
+					"backlog": len(reporter.spool) if reporter else 0
 				},
 				"timestamp": datetime.now().isoformat()
 			}
 
-			# Heartbeat for Distributed Control (JSON report card every 5s)
-			global last_heartbeat_time
-			now_ts = time.time()
-			if reporter and (now_ts - last_heartbeat_time >= HEARTBEAT_INTERVAL):
-				reporter.send_heartbeat(state)
-				last_heartbeat_time = now_ts
-
 			# Broadcast to all clients
 			disconnected = []
 			for connection in active_connections:
@@ -223,44 +222,25 @@ async def handle_command(command: dict, websocket: WebSocket):
 # ============================================
 
 @app.get("/api/v1/heartbeat")
-async def proxy_heartbeat():
-	try:
-		async with httpx.AsyncClient() as client:
-			r = await client.get(f"{CHROMA_INTERNAL_URL}/api/v2/heartbeat", timeout=5.0)
-			return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-	except Exception as e:
-		return Response(content=f"Proxy error: {str(e)}", status_code=502)
+async def proxy_heartbeat(request: Request):
+	return await chroma_proxy.forward(request, "/api/v2/heartbeat", route="heartbeat", timeout=5.0)
 
 @app.get("/api/v1/collections")
-async def proxy_list_collections():
-	try:
-		async with httpx.AsyncClient() as client:
-			r = await client.get(f"{CHROMA_INTERNAL_URL}/api/v2/tenants/default_tenant/databases/default_database/collections", timeout=5.0)
-			return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-	except Exception as e:
-		return Response(content=f"Proxy error: {str(e)}", status_code=502)
+async def proxy_list_collections(request: Request):
+	return await chroma_proxy.forward(request, V2_COLLECTIONS, route="list_collections", timeout=5.0)
 
 @app.post("/api/v1/collections")
 async def proxy_create_collection(request: Request):
-	try:
-		content = await request.body()
-		async with httpx.AsyncClient() as client:
-			r = await client.post(f"{CHROMA_INTERNAL_URL}/api/v2/tenants/default_tenant/databases/default_database/collections", content=content, timeout=5.0)
-			return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-	except Exception as e:
-		return Response(content=f"Proxy error: {str(e)}", status_code=502)
+	return await chroma_proxy.forward(request, V2_COLLECTIONS, route="create_collection", timeout=5.0)
 
 @app.api_route("/api/v1/collections/{collection_id}/{action}", methods=["GET", "POST", "PUT", "DELETE"])
 async def proxy_collection_action(collection_id: str, action: str, request: Request):
-	try:
-		method = request.method
-		content = await request.body()
-		url = f"{CHROMA_INTERNAL_URL}/api/v2/tenants/default_tenant/databases/default_database/collections/{collection_id}/{action}"
-		async with httpx.AsyncClient() as client:
-			r = await client.request(method, url, content=content, timeout=10.0)
-			return Response(content=r.content, status_code=r.status_code, media_type=r.headers.get("content-type"))
-	except Exception as e:
-		return Response(content=f"Proxy error: {str(e)}", status_code=502)
+	return await chroma_proxy.forward(request, f"{V2_COLLECTIONS}/{collection_id}/{action}", route=f"collection_{action}")
+
+@app.get("/api/proxy/stats")
+async def proxy_stats():
+	"""Chroma proxy pool configuration and per-route latency"""
+	return chroma_proxy.get_stats()
 
 # ============================================
 # REST API ENDPOINTS
@@ -282,6 +262,8 @@ async def get_status():
 	return {
 		"status": "online" if graph_ready else "degraded",
 		"agents": len(agent_factory.active_agents),
+		"agent_pool": agent_factory.get_stats(),
+		"load": orchestrator.get_load(),
 		"connections": len(active_connections),
 		"uptime": ui_bridge.get_uptime(),
 		"systems": {
@@ -291,6 +273,22 @@ async def get_status():
 		}
 	}
 
+@app.post("/api/workflows/{workflow_id}/resume")
+async def resume_workflow(workflow_id: str):
+	"""Resume a checkpointed validation chain that stopped mid-way"""
+	try:
+		result = await orchestrator.resume_validation_chain(workflow_id)
+		return {"status": "success", "result": result}
+	except AdmissionError as e:
+		return {"status": "busy", "error": str(e)}
+	except ValueError as e:
+		return {"status": "not_found", "error": str(e)}
+
+@app.post("/api/requests/{message_id}/cancel")
+async def cancel_request(message_id: str):
+	"""Cancel a queued or running A2A request"""
+	return {"cancelled": bus.cancel(message_id)}
+
 @app.get("/api/tasks")
 async def get_tasks():
 	"""Get task queue"""
@@ -446,9 +444,12 @@ async def startup_event():
 
 	# 0. Initialize Edge Node Reporter (Master Overseer Connection)
 	from backend.core.distributed.reporter import GreenhouseReporter
-	reporter = GreenhouseReporter(unit_id="GH-01", broker_address="localhost")
+	reporter = GreenhouseReporter(unit_id="GH-01", broker_address="localhost", batch_interval=HEARTBEAT_INTERVAL)
 	logger.info(f"🛡️ [DISTRIBUTED] Edge Node GH-01 Initialized (MQTT Mode)")
 
+	# Chroma proxy: one pooled keep-alive client for all proxied routes
+	await chroma_proxy.start()
+
 	# 1. Boot Subsystems (DSPy, VectorDB, etc.)
 	SudoBootstrapper.initialize_subsystems()
 
@@ -465,6 +466,13 @@ async def startup_event():
 
 	logger.info("? Background tasks started")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+	"""Send (or spool) the last partial report batch and close pooled connections"""
+	if reporter:
+		await asyncio.to_thread(reporter.stop)
+	await chroma_proxy.close()
+
 # ============================================
 # MAIN (Run Server)
 # ============================================
@@ -479,7 +487,7 @@ def main():
 	print("  _SUDOTEER Web Server (Proxy Mode)")
 	print("="*60)
 	print(f"\n[SERVER] Server starting at: http://localhost:8000")
-	print(f"[CHROMA] Proxying to: {CHROMA_INTERNAL_URL}")
+	print(f"[CHROMA] Proxying to: {chroma_proxy.base_url}")
 	print(f"[FILES] Serving frontend from: {frontend_path}")
 	print(f"\n[OPEN] Open in browser: http://localhost:8000")
 	print("\nPress Ctrl+C to stop\n")
@@ -0,0 +1,164 @@
+"""
+TDD Test Suite: A2A RPC Layer
+Tests deadlines, cancellation propagation, retries, idempotency keys and
+per-pair latency histograms on the bus.
+"""
+import time
+import asyncio
+import pytest
+from backend.core.bus import A2ABus, LatencyHistogram
+from backend.core.inbox import A2ATimeoutError
+from backend.core.protocol import A2AMessage
+
+
+def _msg(to="worker", content="job", sender="caller", **metadata):
+	return A2AMessage(from_agent=sender, to_agent=to, content=content, metadata=metadata)
+
+
+class Hanging:
+	"""Agent whose handler never returns unless told to."""
+	def __init__(self):
+		self.started = 0
+		self.cancelled = 0
+
+	async def handle_request(self, message):
+		self.started += 1
+		try:
+			await asyncio.sleep(3600)
+		except asyncio.CancelledError:
+			self.cancelled += 1
+			raise
+
+
+class Counter:
+	def __init__(self, delay=0.0):
+		self.calls = 0
+		self.delay = delay
+
+	async def handle_request(self, message):
+		self.calls += 1
+		await asyncio.sleep(self.delay)
+		return {"n": self.calls, "deadline": message.metadata.get("deadline")}
+
+
+class TestDeadlines:
+
+	async def test_hung_handler_times_out_and_is_cancelled(self):
+		bus = A2ABus()
+		agent = Hanging()
+		bus.register_agent("worker", agent)
+
+		with pytest.raises(asyncio.TimeoutError):
+			await bus.send_request(_msg(), timeout=0.05)
+		await asyncio.sleep(0.01)
+		assert agent.cancelled == 1
+
+	async def test_deadline_is_carried_in_metadata(self):
+		bus = A2ABus()
+		bus.register_agent("worker", Counter())
+		before = time.time()
+		result = await bus.send_request(_msg(), timeout=5.0)
+		assert before + 4.9 < result["deadline"] <= time.time() + 5.0
+
+	async def test_expired_metadata_deadline_is_not_dispatched(self):
+		bus = A2ABus()
+		agent = Counter()
+		bus.register_agent("worker", agent)
+		with pytest.raises(A2ATimeoutError):
+			await bus.send_request(_msg(deadline=time.time() - 1), retries=3)
+		assert agent.calls == 0
+
+	async def test_nested_requests_inherit_the_parent_deadline(self):
+		bus = A2ABus()
+		inner = Counter()
+
+		class Outer:
+			async def handle_request(self, message):
+				return await bus.send_request(_msg("inner", sender="outer"), timeout=60)
+
+		bus.register_agent("outer", Outer())
+		bus.register_agent("inner", inner)
+		started = time.time()
+		result = await bus.send_request(_msg("outer"), timeout=2.0)
+		assert result["deadline"] <= started + 2.0 + 0.01
+
+
+class TestCancellation:
+
+	async def test_cancel_by_message_id_stops_handler(self):
+		bus = A2ABus()
+		agent = Hanging()
+		bus.register_agent("worker", agent)
+		message = _msg()
+
+		call = asyncio.create_task(bus.send_request(message))
+		await asyncio.sleep(0.02)
+		assert bus.cancel(message.message_id) is True
+
+		with pytest.raises(asyncio.CancelledError):
+			await call
+		await asyncio.sleep(0.01)
+		assert agent.cancelled == 1
+
+	async def test_cancelling_caller_propagates_to_handler(self):
+		bus = A2ABus()
+		agent = Hanging()
+		bus.register_agent("worker", agent)
+
+		call = asyncio.create_task(bus.send_request(_msg()))
+		await asyncio.sleep(0.02)
+		call.cancel()
+		with pytest.raises(asyncio.CancelledError):
+			await call
+		await asyncio.sleep(0.01)
+		assert agent.cancelled == 1
+
+
+class TestRetriesAndIdempotency:
+
+	async def test_timeouts_are_retried(self):
+		bus = A2ABus()
+
+		class Flaky:
+			calls = 0
+			async def handle_request(self, message):
+				Flaky.calls += 1
+				if Flaky.calls == 1:
+					await asyncio.sleep(1.0)
+				return message.metadata["attempt"]
+
+		bus.register_agent("worker", Flaky())
+		assert await bus.send_request(_msg(), timeout=0.05, retries=2) == 1
+
+	async def test_idempotency_key_executes_once(self):
+		bus = A2ABus()
+		agent = Counter(delay=0.05)
+		bus.register_agent("worker", agent)
+
+		results = await asyncio.gather(*(bus.send_request(_msg(idempotency_key="order-1")) for _ in range(3)))
+		again = await bus.send_request(_msg(idempotency_key="order-1"))
+		other = await bus.send_request(_msg(idempotency_key="order-2"))
+
+		assert agent.calls == 2
+		assert all(r["n"] == 1 for r in results) and again["n"] == 1
+		assert other["n"] == 2
+
+
+class TestLatencyHistograms:
+
+	async def test_latency_recorded_per_pair(self):
+		bus = A2ABus()
+		bus.register_agent("worker", Counter(delay=0.02))
+		for _ in range(3):
+			await bus.send_request(_msg(sender="supervisor_01"))
+
+		stats = bus.get_latency_stats()["supervisor_01->worker"]
+		assert stats["count"] == 3 and stats["errors"] == 0
+		assert stats["p50_ms"] == 25.0
+
+	def test_histogram_quantiles(self):
+		h = LatencyHistogram()
+		for ms in [1] * 90 + [400] * 10:
+			h.observe(ms)
+		assert h.quantile(0.5) == 5.0
+		assert h.quantile(0.95) == 500.0
@@ -0,0 +1,91 @@
+"""
+TDD Test Suite: ADE Engine
+Tests lazy, compile-once tool loading shared across agents, invalidation on
+re-registration and the per-agent registry index.
+"""
+import json
+import pytest
+from backend.core.ade_engine import ADEEngine, REGISTRY_VERSION
+
+DOUBLE = "def run(x):\n\treturn x * 2\n"
+TRIPLE = "def run(x):\n\treturn x * 3\n"
+
+
+@pytest.fixture
+def ade(tmp_path):
+	return ADEEngine(registry_path=str(tmp_path / "tool_registry.json"))
+
+
+class TestCompileCache:
+
+	def test_spawn_does_not_compile(self, ade):
+		ade.register_tool("double", DOUBLE, {"target_agents": ["coder"]})
+		tools = ade.get_agent_tools("coder")
+		assert list(tools) == ["double"]
+		assert ade.stats["compiles"] == 0
+
+		assert tools["double"](4) == 8
+		assert ade.stats["compiles"] == 1
+
+	def test_compiled_once_across_agents(self, ade):
+		ade.register_tool("double", DOUBLE, {"target_agents": ["*"]})
+		for i in range(12):
+			assert ade.get_agent_tools(f"agent_{i}")["double"](i) == i * 2
+		assert ade.stats["compiles"] == 1
+
+	def test_identical_code_shares_a_module(self, ade):
+		ade.register_tool("a", DOUBLE, {"target_agents": ["coder"]})
+		ade.register_tool("b", DOUBLE, {"target_agents": ["coder"]})
+		tools = ade.get_agent_tools("coder")
+		assert tools["a"](1) == tools["b"](1) == 2
+		assert ade.stats["compiles"] == 1
+		assert ade.stats["cache_hits"] == 1
+
+	def test_reregistering_code_invalidates(self, ade):
+		ade.register_tool("scale", DOUBLE, {"target_agents": ["coder"]})
+		tool = ade.get_agent_tools("coder")["scale"]
+		assert tool(5) == 10
+
+		ade.register_tool("scale", TRIPLE, {"target_agents": ["coder"]})
+		assert tool(5) == 15  # Existing handles pick up the new code
+		assert ade.stats["compiles"] == 2
+
+	def test_broken_tool_fails_on_call(self, ade):
+		ade.register_tool("broken", "def run(:\n", {"target_agents": ["coder"]})
+		ade.register_tool("norun", "x = 1\n", {"target_agents": ["coder"]})
+		tools = ade.get_agent_tools("coder")
+		with pytest.raises(SyntaxError):
+			tools["broken"]()
+		with pytest.raises(AttributeError):
+			tools["norun"]()
+
+
+class TestAgentIndex:
+
+	def test_index_by_target_agent(self, ade):
+		ade.register_tool("lint", DOUBLE, {"target_agents": ["coder", "tester"]})
+		ade.register_tool("grow", DOUBLE, {"target_agents": ["climate"]})
+		ade.register_tool("log", DOUBLE, {"target_agents": ["*"]})
+
+		assert set(ade.get_agent_tools("coder")) == {"lint", "log"}
+		assert set(ade.get_agent_tools("climate")) == {"grow", "log"}
+		assert set(ade.get_agent_tools("nobody")) == {"log"}
+
+		ade.register_tool("lint", DOUBLE, {"target_agents": ["tester"]})
+		assert set(ade.get_agent_tools("coder")) == {"log"}
+
+	def test_registry_persists_index(self, ade, tmp_path):
+		ade.register_tool("grow", DOUBLE, {"target_agents": ["climate"]})
+		data = json.loads((tmp_path / "tool_registry.json").read_text())
+		assert data["version"] == REGISTRY_VERSION
+		assert data["by_agent"] == {"climate": ["grow"]}
+		assert data["tools"]["grow"]["code_hash"]
+
+		reloaded = ADEEngine(registry_path=str(tmp_path / "tool_registry.json"))
+		assert reloaded.get_agent_tools("climate")["grow"](2) == 4
+
+	def test_legacy_flat_registry_loads(self, tmp_path):
+		path = tmp_path / "legacy.json"
+		path.write_text(json.dumps({"grow": {"code": DOUBLE, "metadata": {"target_agents": ["climate"]}, "status": "pending_validation"}}))
+		ade = ADEEngine(registry_path=str(path))
+		assert ade.get_agent_tools("climate")["grow"](3) == 6
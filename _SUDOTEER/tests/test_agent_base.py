@@ -191,12 +191,12 @@ class TestAgentDVROperations:
 		with patch('dspy.ChainOfThought'), \
 			 patch('backend.core.agent_base.DVRModule'), \
 			 patch('os.makedirs'), \
-			 patch('asyncio.to_thread') as mock_to_thread:
+			 patch('backend.core.agent_base.inference_gateway.offload') as mock_offload:
 			from backend.core.agent_base import BaseAgent
 
 			mock_result = MagicMock()
 			mock_result.subtasks = ["Step 1", "Step 2", "Step 3"]
-			mock_to_thread.return_value = mock_result
+			mock_offload.return_value = mock_result
 
 			class TestAgent(BaseAgent):
 				async def handle_request(self, message):
@@ -217,13 +217,13 @@ class TestAgentDVROperations:
 		with patch('dspy.ChainOfThought'), \
 			 patch('backend.core.agent_base.DVRModule'), \
 			 patch('os.makedirs'), \
-			 patch('asyncio.to_thread') as mock_to_thread:
+			 patch('backend.core.agent_base.inference_gateway.offload') as mock_offload:
 			from backend.core.agent_base import BaseAgent
 
 			mock_result = MagicMock()
 			mock_result.is_valid = True
 			mock_result.feedback = "Looks good"
-			mock_to_thread.return_value = mock_result
+			mock_offload.return_value = mock_result
 
 			class TestAgent(BaseAgent):
 				async def handle_request(self, message):
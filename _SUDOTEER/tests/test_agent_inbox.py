@@ -0,0 +1,175 @@
+"""
+TDD Test Suite: Agent Inboxes & Concurrent Workflows
+Tests per-agent worker pools, re-entrant requests, admission control
+(orchestrator and supervisor) and per-workflow budgets.
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+from backend.core.bus import A2ABus
+from backend.core.inbox import AdmissionError
+from backend.core.protocol import A2AMessage
+
+
+class SlowAgent:
+	def __init__(self, delay=0.05):
+		self.delay = delay
+		self.active = 0
+		self.peak = 0
+
+	async def handle_request(self, message):
+		self.active += 1
+		self.peak = max(self.peak, self.active)
+		await asyncio.sleep(self.delay)
+		self.active -= 1
+		return {"echo": message.content}
+
+
+def _msg(to, content="x", sender="tester"):
+	return A2AMessage(from_agent=sender, to_agent=to, content=content)
+
+
+class TestInboxWorkers:
+
+	async def test_worker_count_bounds_concurrency(self):
+		bus = A2ABus()
+		agent = SlowAgent()
+		bus.register_agent("coder_01", agent, workers=3)
+
+		results = await asyncio.gather(*(bus.send_request(_msg("coder_01", f"task {i}")) for i in range(9)))
+
+		assert agent.peak == 3
+		assert [r["echo"] for r in results] == [f"task {i}" for i in range(9)]
+		assert bus.get_inbox_stats()["coder_01"]["processed"] == 9
+
+	async def test_throughput_scales_with_workers(self):
+		async def timed(workers):
+			bus = A2ABus()
+			bus.register_agent("a", SlowAgent(0.05), workers=workers)
+			started = time.perf_counter()
+			await asyncio.gather(*(bus.send_request(_msg("a")) for _ in range(8)))
+			return time.perf_counter() - started
+
+		assert await timed(4) < await timed(1) / 2
+
+	async def test_reentrant_request_does_not_deadlock(self):
+		bus = A2ABus()
+
+		class Echo:
+			async def handle_request(self, message):
+				if message.content == "ping":
+					return await bus.send_request(_msg("a", "inner", sender="a"))
+				return "pong"
+
+		bus.register_agent("a", Echo(), workers=1)
+		assert await asyncio.wait_for(bus.send_request(_msg("a", "ping")), 1.0) == "pong"
+
+	async def test_full_inbox_rejects(self):
+		bus = A2ABus()
+		bus.register_agent("a", SlowAgent(0.2), workers=1, max_depth=2)
+		pending = [asyncio.create_task(bus.send_request(_msg("a")))]
+		await asyncio.sleep(0.01)  # first request is in flight
+		pending += [asyncio.create_task(bus.send_request(_msg("a"))) for _ in range(2)]
+		await asyncio.sleep(0.01)  # two more are queued
+
+		with pytest.raises(AdmissionError):
+			await bus.send_request(_msg("a"))
+		await asyncio.gather(*pending)
+
+	async def test_handler_errors_reach_the_caller(self):
+		bus = A2ABus()
+
+		class Broken:
+			async def handle_request(self, message):
+				raise ValueError("bad input")
+
+		bus.register_agent("a", Broken())
+		with pytest.raises(ValueError):
+			await bus.send_request(_msg("a"))
+
+
+class TestConcurrentWorkflows:
+
+	async def test_workflows_run_concurrently_up_to_limit(self):
+		from backend.core.orchestrator import AgencyOrchestrator
+		running, peak = [0], [0]
+
+		async def run(*args, **kwargs):
+			running[0] += 1
+			peak[0] = max(peak[0], running[0])
+			await asyncio.sleep(0.05)
+			running[0] -= 1
+			return {"data": {"valid": True}}
+
+		with patch('backend.core.orchestrator.workflow_orchestrator') as mock_wf, \
+			 patch('backend.core.orchestrator.finance_tracker') as mock_fin:
+			mock_wf.execute_workflow = run
+			mock_fin.get_summary_metrics.return_value = {}
+			orch = AgencyOrchestrator(max_concurrent_workflows=2)
+			results = await asyncio.gather(*(orch.execute_validation_chain(f"goal {i}") for i in range(5)))
+
+		assert peak[0] == 2
+		assert all(r == {"valid": True} for r in results)
+		assert orch.get_load()["active_workflows"] == 0
+
+	async def test_admission_control_rejects_when_too_many_wait(self):
+		from backend.core.orchestrator import AgencyOrchestrator
+
+		async def run(*args, **kwargs):
+			await asyncio.sleep(0.1)
+			return {"data": {"valid": True}}
+
+		with patch('backend.core.orchestrator.workflow_orchestrator') as mock_wf, \
+			 patch('backend.core.orchestrator.finance_tracker') as mock_fin:
+			mock_wf.execute_workflow = run
+			mock_fin.get_summary_metrics.return_value = {}
+			orch = AgencyOrchestrator(max_concurrent_workflows=1, max_waiting=1)
+			first = asyncio.create_task(orch.execute_validation_chain("a"))
+			second = asyncio.create_task(orch.execute_validation_chain("b"))
+			await asyncio.sleep(0.01)
+
+			with pytest.raises(AdmissionError):
+				await orch.execute_validation_chain("c")
+			await asyncio.gather(first, second)
+
+	async def test_admission_control_rejects_on_queued_requests(self):
+		from backend.core.orchestrator import AgencyOrchestrator
+		orch = AgencyOrchestrator(max_queued_requests=3)
+		with patch('backend.core.orchestrator.bus') as mock_bus:
+			mock_bus.queue_depth.return_value = 3
+			assert "3 agent requests" in orch.admission_block()
+			assert orch.get_load()["accepting"] is False
+			with pytest.raises(AdmissionError):
+				await orch.execute_validation_chain("a")
+
+			mock_bus.queue_depth.return_value = 2
+			assert orch.admission_block() is None
+
+	async def test_supervisor_defers_when_agency_is_busy(self):
+		from backend.agents.supervisor.agent import SupervisorAgent
+		supervisor = SupervisorAgent(agent_id="supervisor_busy")
+		supervisor.log_interaction = lambda *a, **k: None
+		supervisor.perform_risk_assessment = AsyncMock()
+
+		with patch('backend.core.orchestrator.orchestrator.admission_block', return_value="2 workflows already waiting"):
+			result = await supervisor.forward("design a new irrigation schedule")
+
+		assert result["status"] == "busy" and result["reason"] == "2 workflows already waiting"
+		supervisor.perform_risk_assessment.assert_not_called()
+
+	@patch('backend.utils.finance.finance_tracker.is_stable', return_value=True)
+	async def test_budget_is_per_workflow(self, mock_stable):
+		from backend.core.orchestrator import AgencyOrchestrator, _workflow_started
+		orch = AgencyOrchestrator(budget_limit_hours=1.0)
+
+		async def old_workflow():
+			_workflow_started.set(time.time() - 7200)
+			return orch.check_viability()
+
+		async def new_workflow():
+			_workflow_started.set(time.time())
+			return orch.check_viability()
+
+		assert await asyncio.create_task(old_workflow()) is False
+		assert await asyncio.create_task(new_workflow()) is True
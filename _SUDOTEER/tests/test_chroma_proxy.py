@@ -0,0 +1,132 @@
+"""
+TDD Test Suite: Chroma Compatibility Proxy
+Tests v1 -> v2 forwarding over the shared pooled client, streamed bodies,
+upstream failures and per-route latency metrics.
+"""
+import json
+import importlib.util
+from pathlib import Path
+import httpx
+import pytest
+from backend.core.memory.chroma_proxy import ChromaProxy, V2_COLLECTIONS
+
+
+def streamed(status, obj):
+	"""JSON response with a streamed body, like a real upstream connection."""
+	async def body():
+		yield json.dumps(obj).encode()
+	return httpx.Response(status, headers={"content-type": "application/json"}, content=body())
+
+
+class FakeChroma:
+	"""Upstream Chroma v2 stand-in (httpx MockTransport handler)."""
+	def __init__(self):
+		self.requests = []
+
+	def __call__(self, request: httpx.Request) -> httpx.Response:
+		body = request.read()
+		self.requests.append((request.method, request.url.path, request.url.query.decode(), body, dict(request.headers)))
+		if request.url.path == "/api/v2/heartbeat":
+			return streamed(200, {"nanosecond heartbeat": 1})
+		return streamed(200, {"path": request.url.path, "echo": body.decode()})
+
+
+def load_proxy_script():
+	path = Path(__file__).parent.parent / "scripts" / "chroma_proxy.py"
+	spec = importlib.util.spec_from_file_location("chroma_proxy_script", path)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+@pytest.fixture
+async def proxied():
+	upstream = FakeChroma()
+	script = load_proxy_script()
+	await script.proxy.start(transport=httpx.MockTransport(upstream))
+	client = httpx.AsyncClient(transport=httpx.ASGITransport(app=script.app), base_url="http://proxy")
+	yield client, script.proxy, upstream
+	await client.aclose()
+	await script.proxy.close()
+
+
+class TestForwarding:
+
+	async def test_heartbeat_maps_to_v2(self, proxied):
+		client, proxy, upstream = proxied
+		r = await client.get("/api/v1/heartbeat")
+		assert r.status_code == 200
+		assert r.json() == {"nanosecond heartbeat": 1}
+		assert upstream.requests[0][:2] == ("GET", "/api/v2/heartbeat")
+
+	async def test_collection_query_body_and_params_are_forwarded(self, proxied):
+		client, proxy, upstream = proxied
+		payload = {"query_embeddings": [[0.1, 0.2]], "n_results": 3}
+		r = await client.post("/api/v1/collections/abc/query?limit=5", json=payload)
+		assert r.status_code == 200
+		method, path, query, body, headers = upstream.requests[0]
+		assert (method, path, query) == ("POST", f"{V2_COLLECTIONS}/abc/query", "limit=5")
+		assert json.loads(body) == payload
+		assert headers["content-type"] == "application/json"
+		assert headers.get("host") != "proxy"
+
+	async def test_requests_share_one_pooled_client(self, proxied):
+		client, proxy, upstream = proxied
+		pooled = proxy.client
+		for _ in range(5):
+			await client.get("/api/v1/collections")
+		assert proxy.client is pooled
+		assert len(upstream.requests) == 5
+
+	async def test_large_response_is_streamed_through(self):
+		blob = b"x" * (1 << 20)
+
+		async def chunks():
+			for i in range(0, len(blob), 65536):
+				yield blob[i:i + 65536]
+
+		proxy = ChromaProxy(base_url="http://chroma")
+		await proxy.start(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=chunks())))
+		script = load_proxy_script()
+		script.proxy = proxy
+		async with httpx.AsyncClient(transport=httpx.ASGITransport(app=script.app), base_url="http://proxy") as client:
+			r = await client.get("/api/v1/heartbeat")
+		assert r.content == blob
+		await proxy.close()
+
+	async def test_upstream_down_returns_502(self):
+		def refuse(request):
+			raise httpx.ConnectError("connection refused", request=request)
+
+		proxy = ChromaProxy(base_url="http://chroma")
+		await proxy.start(transport=httpx.MockTransport(refuse))
+		script = load_proxy_script()
+		script.proxy = proxy
+		async with httpx.AsyncClient(transport=httpx.ASGITransport(app=script.app), base_url="http://proxy") as client:
+			r = await client.get("/api/v1/heartbeat")
+		assert r.status_code == 502
+		assert "Proxy error" in r.text
+		assert proxy.get_stats()["routes"]["heartbeat"]["errors"] == 1
+		await proxy.close()
+
+
+class TestMetrics:
+
+	async def test_per_route_latency(self, proxied):
+		client, proxy, upstream = proxied
+		await client.get("/api/v1/heartbeat")
+		await client.get("/api/v1/heartbeat")
+		await client.post("/api/v1/collections/abc/add", json={"ids": ["1"]})
+
+		stats = (await client.get("/proxy/stats")).json()
+		assert stats["routes"]["heartbeat"]["requests"] == 2
+		assert stats["routes"]["collection_add"]["requests"] == 1
+		assert stats["routes"]["heartbeat"]["mean_ms"] >= 0
+		assert stats["max_connections"] == proxy.limits.max_connections
+
+	def test_pool_limits_are_configurable(self, monkeypatch):
+		monkeypatch.setenv("SUDOTEER_CHROMA_MAX_CONNECTIONS", "7")
+		proxy = ChromaProxy(max_keepalive=3, keepalive_expiry=5.0)
+		assert proxy.limits.max_connections == 7
+		assert proxy.limits.max_keepalive_connections == 3
+		assert proxy.limits.keepalive_expiry == 5.0
@@ -0,0 +1,240 @@
+"""
+TDD Test Suite: Edge Reporter
+Tests batched columnar reports, offline spooling to disk and ordered,
+acknowledged replay once the Master broker is reachable again.
+"""
+import json
+import time
+import threading
+import pytest
+import paho.mqtt.client as mqtt
+from backend.core.distributed.reporter import EdgeSpool, GreenhouseReporter
+
+
+class FakeInfo:
+	def __init__(self, acked=True):
+		self.rc = mqtt.MQTT_ERR_SUCCESS
+		self.acked = acked
+
+	def wait_for_publish(self, timeout=None):
+		pass
+
+	def is_published(self):
+		return self.acked
+
+
+class FakeMQTTClient:
+	"""In-process stand-in for paho's client: records calls, never touches the network."""
+	def __init__(self):
+		self.published = []
+		self.subscribed = []
+		self.calls = []
+		self.ack = True
+
+	def reconnect_delay_set(self, min_delay=1, max_delay=120):
+		self.calls.append(("reconnect_delay_set", min_delay, max_delay))
+
+	def connect_async(self, host, port=1883, keepalive=60):
+		self.calls.append(("connect_async", host, port))
+
+	def loop_start(self):
+		self.calls.append(("loop_start",))
+
+	def loop_stop(self):
+		self.calls.append(("loop_stop",))
+
+	def disconnect(self):
+		self.calls.append(("disconnect",))
+
+	def subscribe(self, topic):
+		self.subscribed.append(topic)
+
+	def publish(self, topic, payload, qos=0):
+		self.published.append((topic, payload, qos))
+		return FakeInfo(self.ack)
+
+	def status_reports(self):
+		return [json.loads(p) for t, p, _ in self.published if t.endswith("/status")]
+
+
+@pytest.fixture
+def client():
+	return FakeMQTTClient()
+
+
+@pytest.fixture
+def spool(tmp_path):
+	spool = EdgeSpool(str(tmp_path / "spool.sqlite"))
+	yield spool
+	spool.close()
+
+
+def make_reporter(client, spool, **kwargs):
+	kwargs.setdefault("batch_interval", 5.0)
+	kwargs.setdefault("replay_rate", 0)
+	return GreenhouseReporter(unit_id="GH-T", client=client, spool=spool, **kwargs)
+
+
+def wait_replay(reporter):
+	if reporter._replayer:
+		reporter._replayer.join(timeout=5)
+
+
+class TestConnection:
+
+	def test_connect_is_non_blocking(self, client, spool):
+		started = time.perf_counter()
+		reporter = make_reporter(client, spool)
+		assert time.perf_counter() - started < 0.5
+		assert [c[0] for c in client.calls] == ["reconnect_delay_set", "connect_async", "loop_start"]
+		assert reporter.connected is False
+
+	def test_on_connect_subscribes_and_announces(self, client, spool):
+		reporter = make_reporter(client, spool)
+		reporter.on_connect(client, None, {}, 0)
+		assert reporter.connected is True
+		assert client.subscribed == ["greenhouse/GH-T/commands"]
+		alert = json.loads(client.published[0][1])
+		assert alert["msg"] == "Edge Node Online"
+		assert alert["backlog"] == 0
+
+
+class TestBatching:
+
+	def test_samples_batch_into_one_columnar_message(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=5.0)
+		reporter.on_connect(client, None, {}, 0)
+		for i in range(6):
+			reporter.record({"temperature": 20 + i, "humidity": 60}, now=1000.0 + i)
+
+		reports = client.status_reports()
+		assert len(reports) == 1
+		report = reports[0]
+		assert report["keys"] == ["humidity", "temperature"]
+		assert report["dt"] == [0, 1, 2, 3, 4, 5]
+		assert [row[1] for row in report["rows"]] == [20, 21, 22, 23, 24, 25]
+		assert client.published[-1][2] == 1  # QoS 1
+		assert reporter.stats["published"] == 1
+
+	def test_full_batch_is_sent_early(self, client, spool):
+		reporter = make_reporter(client, spool, max_batch=3)
+		reporter.on_connect(client, None, {}, 0)
+		for i in range(3):
+			reporter.record({"t": i}, now=1000.0)
+		assert len(client.status_reports()) == 1
+
+	def test_stop_flushes_partial_batch(self, client, spool):
+		reporter = make_reporter(client, spool)
+		reporter.on_connect(client, None, {}, 0)
+		reporter.record({"t": 1}, now=1000.0)
+		reporter.stop()
+		assert len(client.status_reports()) == 1
+		assert ("loop_stop",) in client.calls
+		assert len(spool) == 0
+
+	def test_stop_spools_unacknowledged_batch(self, client, spool):
+		reporter = make_reporter(client, spool)
+		reporter.on_connect(client, None, {}, 0)
+		client.ack = False
+		reporter.record({"t": 1}, now=1000.0)
+		reporter.stop(timeout=0.01)
+		assert len(spool) == 1  # Sent again from the spool on the next start
+		assert reporter.stats["published"] == 0
+
+
+class TestOfflineSpool:
+
+	def test_batches_are_spooled_while_offline(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=1.0)
+		for i in range(6):
+			reporter.record({"t": i}, now=1000.0 + i)
+		assert client.status_reports() == []
+		assert len(spool) == 3
+		assert reporter.get_status()["backlog"] == 3
+
+	def test_replay_on_reconnect_is_ordered_and_acked(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=1.0)
+		for i in range(6):
+			reporter.record({"t": i}, now=1000.0 + i)
+
+		reporter.on_connect(client, None, {}, 0)
+		wait_replay(reporter)
+
+		reports = client.status_reports()
+		assert [r["t0"] for r in reports] == [1000.0, 1002.0, 1004.0]
+		assert all(qos == 1 for t, _, qos in client.published if t.endswith("/status"))
+		assert len(spool) == 0
+		assert reporter.stats["replayed"] == 3
+
+	def test_unacknowledged_replay_keeps_the_message(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=1.0)
+		reporter.record({"t": 0}, now=1000.0)
+		reporter.record({"t": 1}, now=1001.0)
+		client.ack = False
+
+		reporter.on_connect(client, None, {}, 0)
+		wait_replay(reporter)
+		assert len(spool) == 1
+
+	def test_new_batches_queue_behind_backlog(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=1.0)
+		reporter.record({"t": 0}, now=1000.0)
+		reporter.record({"t": 1}, now=1001.0)  # spooled while offline
+		reporter.connected = True  # connected, replay not yet run
+		reporter._start_replay = lambda: None
+		reporter.record({"t": 2}, now=1002.0)
+		reporter.record({"t": 3}, now=1003.0)
+
+		assert client.status_reports() == []
+		assert len(spool) == 2
+		reporter._replay()
+		assert [r["t0"] for r in client.status_reports()] == [1000.0, 1002.0]
+
+	def test_disconnect_stops_live_publishing(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=1.0)
+		reporter.on_connect(client, None, {}, 0)
+		reporter.on_disconnect(client, None, 1)
+		reporter.record({"t": 0}, now=1000.0)
+		reporter.record({"t": 1}, now=1001.0)
+		assert client.status_reports() == []
+		assert len(spool) == 1
+
+	def test_spool_is_bounded_oldest_first(self, tmp_path):
+		spool = EdgeSpool(str(tmp_path / "small.sqlite"), max_rows=3)
+		for i in range(5):
+			spool.push("topic", str(i))
+		assert len(spool) == 3
+		assert spool.dropped == 2
+		assert [payload for _, _, payload in spool.peek(10)] == ["2", "3", "4"]
+		spool.close()
+
+	def test_spool_survives_restart(self, tmp_path):
+		path = str(tmp_path / "persist.sqlite")
+		spool = EdgeSpool(path)
+		spool.push("topic", "kept")
+		spool.push("topic", "also kept")
+		spool.close()
+
+		reopened = EdgeSpool(path)
+		assert len(reopened) == 2
+		seq, _, payload = reopened.peek(1)[0]
+		assert payload == "kept"
+		reopened.ack(seq)
+		assert len(reopened) == 1
+		reopened.close()
+
+	def test_single_replayer_across_threads(self, client, spool):
+		reporter = make_reporter(client, spool, batch_interval=1.0)
+		reporter.record({"t": 0}, now=1000.0)
+		reporter.record({"t": 1}, now=1001.0)
+		reporter.connected = True
+		started = []
+		reporter._replay = lambda: (started.append(1), time.sleep(0.05))
+
+		threads = [threading.Thread(target=reporter._start_replay) for _ in range(8)]
+		for t in threads:
+			t.start()
+		for t in threads:
+			t.join()
+		wait_replay(reporter)
+		assert len(started) == 1
@@ -0,0 +1,94 @@
+"""
+TDD Test Suite: Industrial Telemetry Stream
+Tests the sensory ring buffers, incremental windows, per-channel aggregates
+and the frozen frames published by the IndustrialBridge.
+"""
+import pytest
+from backend.core.hardware.sensory_engine import SensoryEngine
+from backend.core.industrial_bridge import IndustrialBridge
+from backend.core.topics import FrozenDict, TelemetryAggregator
+
+
+@pytest.fixture
+def engine(monkeypatch):
+	engine = SensoryEngine(polling_rate=0.1)
+	engine.buffer_size = 5
+	monkeypatch.setattr("backend.core.industrial_bridge.sensory_engine", engine)
+	return engine
+
+
+class TestSensoryBuffers:
+
+	def test_ring_buffer_keeps_last_samples(self, engine):
+		for i in range(8):
+			engine.record_samples({"temp_air": float(i), "ph_nutrient": None})
+
+		assert list(engine.raw_buffer["temp_air"]) == [3.0, 4.0, 5.0, 6.0, 7.0]
+		assert list(engine.seq_buffer["temp_air"]) == [4, 5, 6, 7, 8]
+		assert "ph_nutrient" not in engine.raw_buffer
+
+	def test_window_returns_only_new_samples(self, engine):
+		for i in range(4):
+			engine.record_samples({"temp_air": 20.0 + i})
+
+		assert engine.window(2)["temp_air"] == ((3, 22.0), (4, 23.0))
+		assert engine.window(4)["temp_air"] == ()
+		assert len(engine.window(0)["temp_air"]) == 4
+
+	def test_channel_stats(self, engine):
+		for value in (10.0, 12.0, 14.0):
+			engine.record_samples({"temp_air": value})
+
+		stats = engine.channel_stats()["temp_air"]
+		assert stats["last"] == 14.0
+		assert stats["mean"] == 12.0
+		assert (stats["min"], stats["max"]) == (10.0, 14.0)
+		assert stats["slope"] == pytest.approx(20.0)  # +2 per 0.1 s sample
+
+	def test_flat_or_single_sample_has_zero_slope(self, engine):
+		engine.record_samples({"temp_air": 5.0})
+		assert engine.channel_stats()["temp_air"]["slope"] == 0.0
+
+
+class TestBridgeFrames:
+
+	async def test_frames_are_incremental(self, engine):
+		bridge = IndustrialBridge(mode="simulation")
+		for i in range(3):
+			engine.record_samples({"temp_air": float(i)})
+		first = bridge.build_frame()
+		engine.record_samples({"temp_air": 9.0})
+		second = bridge.build_frame()
+
+		assert (first["since"], first["seq"]) == (0, 3)
+		assert len(first["window"]["temp_air"]) == 3
+		assert (second["since"], second["seq"]) == (3, 4)
+		assert second["window"]["temp_air"] == ((4, 9.0),)
+		assert second["stats"]["temp_air"]["last"] == 9.0
+
+	async def test_frames_are_immutable_and_detached(self, engine):
+		bridge = IndustrialBridge(mode="simulation")
+		engine.record_samples({"temp_air": 1.0})
+		engine.latent_states["vpd"] = 1.2
+		frame = bridge.build_frame()
+
+		assert isinstance(frame, FrozenDict)
+		with pytest.raises(TypeError):
+			frame["latent"]["vpd"] = 0.0
+		with pytest.raises(TypeError):
+			frame.update({"mode": "hardware"})
+
+		engine.latent_states["vpd"] = 2.0
+		engine.record_samples({"temp_air": 2.0})
+		assert frame["latent"]["vpd"] == 1.2
+		assert frame["window"]["temp_air"] == ((1, 1.0),)
+
+	async def test_frames_summarise_on_the_bus(self, engine):
+		bridge = IndustrialBridge(mode="simulation")
+		engine.record_samples({"temp_air": 21.5})
+		agg = TelemetryAggregator("telemetry/industrial", 1.0)
+		agg.add(bridge.build_frame(), now=0.0)
+
+		fields = agg.flush(now=1.0)["fields"]
+		assert fields["window.temp_air"]["max"] == 21.5
+		assert fields["stats.temp_air.mean"]["mean"] == 21.5
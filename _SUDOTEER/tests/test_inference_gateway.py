@@ -0,0 +1,141 @@
+"""
+TDD Test Suite: Inference Gateway
+Tests per-backend concurrency caps, priority ordering, request coalescing and
+the dedicated offload pool.
+"""
+import time
+import asyncio
+import threading
+import pytest
+from backend.core.llm.gateway import InferenceGateway, LLMPriority
+
+
+def _start(target, *args):
+	t = threading.Thread(target=target, args=args)
+	t.start()
+	return t
+
+
+class TestConcurrencyLimits:
+
+	def test_in_flight_never_exceeds_limit(self):
+		gateway = InferenceGateway(default_limit=2)
+		active, peak = [0], [0]
+		lock = threading.Lock()
+
+		def call():
+			with lock:
+				active[0] += 1
+				peak[0] = max(peak[0], active[0])
+			time.sleep(0.02)
+			with lock:
+				active[0] -= 1
+			return "ok"
+
+		threads = [_start(gateway.run, "lmstudio", call) for _ in range(8)]
+		for t in threads: t.join()
+
+		assert peak[0] == 2
+		stats = gateway.get_stats()["lmstudio"]
+		assert stats["completed"] == 8
+		assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+	def test_backends_are_isolated(self):
+		gateway = InferenceGateway(default_limit=1)
+		gate = threading.Event()
+		blocker = _start(gateway.run, "ollama", gate.wait)
+		time.sleep(0.02)
+
+		# A saturated Ollama must not delay LM Studio
+		assert gateway.run("lmstudio", lambda: "fast") == "fast"
+		gate.set()
+		blocker.join()
+
+
+class TestPriorities:
+
+	def test_safety_jumps_ahead_of_bulk(self):
+		gateway = InferenceGateway(default_limit=1)
+		gate = threading.Event()
+		order = []
+
+		blocker = _start(gateway.run, "lmstudio", gate.wait)
+		time.sleep(0.02)
+		bulk = _start(gateway.run, "lmstudio", lambda: order.append("bulk"), None, LLMPriority.BULK)
+		time.sleep(0.02)
+		safety = _start(gateway.run, "lmstudio", lambda: order.append("safety"), None, LLMPriority.SAFETY)
+		time.sleep(0.02)
+
+		gate.set()
+		for t in (blocker, bulk, safety): t.join()
+
+		assert order == ["safety", "bulk"]
+		assert set(gateway.get_stats()["lmstudio"]["queue_time_ms"]) == {"NORMAL", "BULK", "SAFETY"}
+
+	def test_priority_context_is_inherited(self):
+		gateway = InferenceGateway()
+		with gateway.priority(LLMPriority.SAFETY):
+			gateway.run("lmstudio", lambda: None)
+		assert "SAFETY" in gateway.get_stats()["lmstudio"]["queue_time_ms"]
+
+
+class TestCoalescing:
+
+	def test_identical_in_flight_requests_share_one_call(self):
+		gateway = InferenceGateway(default_limit=4)
+		calls = []
+		release = threading.Event()
+		results = []
+
+		def call():
+			calls.append(1)
+			release.wait()
+			return ["answer"]
+
+		threads = [_start(lambda: results.append(gateway.run("lmstudio", call, key="same-prompt"))) for _ in range(3)]
+		time.sleep(0.05)
+		release.set()
+		for t in threads: t.join()
+
+		assert len(calls) == 1
+		assert results == [["answer"]] * 3
+		assert gateway.get_stats()["lmstudio"]["coalesced"] == 2
+
+	def test_errors_propagate_to_coalesced_waiters(self):
+		gateway = InferenceGateway()
+
+		def boom():
+			raise RuntimeError("backend down")
+
+		with pytest.raises(RuntimeError):
+			gateway.run("lmstudio", boom, key="k")
+		# The failed key is not left pending
+		assert gateway.run("lmstudio", lambda: "retry", key="k") == "retry"
+
+
+class TestOffload:
+
+	async def test_queued_calls_do_not_occupy_default_executor(self):
+		gateway = InferenceGateway(default_limit=1, workers=64)
+		gate = threading.Event()
+		names = []
+
+		def call():
+			names.append(threading.current_thread().name)
+			gate.wait()
+
+		# Far more waiters than the default executor has threads
+		burst = [asyncio.ensure_future(gateway.offload(gateway.run, "lmstudio", call)) for _ in range(40)]
+		await asyncio.sleep(0.05)
+		assert await asyncio.wait_for(asyncio.to_thread(lambda: "unrelated"), 1.0) == "unrelated"
+		assert gateway.get_stats()["lmstudio"]["queued"] == 39
+
+		gate.set()
+		await asyncio.gather(*burst)
+		assert all(name.startswith("llm") for name in names)
+
+	async def test_offload_keeps_priority_context(self):
+		gateway = InferenceGateway()
+		with gateway.priority(LLMPriority.INTERACTIVE):
+			await gateway.offload(gateway.run, "lmstudio", lambda: None)
+		assert set(gateway.get_stats()["lmstudio"]["queue_time_ms"]) == {"INTERACTIVE"}
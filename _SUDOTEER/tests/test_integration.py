@@ -32,6 +32,7 @@ class TestAgentWorkflowIntegration:
 					"valid": True
 				}
 			})
+			mock_bus.queue_depth.return_value = 0  # Nothing queued: admitted
 			mock_fin.is_stable.return_value = True
 			mock_fin.get_summary_metrics.return_value = {
 				"total_tasks": 1,
@@ -0,0 +1,190 @@
+"""
+TDD Test Suite: Lazy Agents
+Tests on-demand agent materialization behind bus proxies, idle eviction and
+DSPy modules built on first use.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+import backend.core.factory as factory_module
+from backend.core.bus import A2ABus
+from backend.core.factory import AgentFactory, LazyAgent
+from backend.core.protocol import A2AMessage
+
+
+class Worker:
+	built = 0
+
+	def __init__(self, agent_id, role):
+		Worker.built += 1
+		self.agent_id = agent_id
+		self.role = role
+		self.calls = 0
+
+	async def handle_request(self, message):
+		self.calls += 1
+		await asyncio.sleep(message.content.get("delay", 0))
+		return {"calls": self.calls, "instance": id(self)}
+
+	def describe(self):
+		return f"{self.role}:{self.agent_id}"
+
+	async def work(self, delay):
+		await asyncio.sleep(delay)
+		return self.agent_id
+
+
+class Reactive(Worker):
+	async def initialize(self):
+		pass
+
+
+@pytest.fixture
+def factory(monkeypatch):
+	bus = A2ABus()
+	monkeypatch.setattr(factory_module, "bus", bus)
+	Worker.built = 0
+	factory = AgentFactory()
+	factory.register_role("worker", Worker)
+	factory.register_role("reactive", Reactive)
+	factory.bus = bus
+	return factory
+
+
+def request(factory, to, **content):
+	content.setdefault("task", "ping")
+	return factory.bus.send_request(A2AMessage(from_agent="caller", to_agent=to, content=content), timeout=5.0)
+
+
+class TestMaterialization:
+
+	async def test_lazy_spawn_builds_nothing(self, factory):
+		for i in range(12):
+			agent = factory.spawn_agent("worker", f"worker_{i:02d}", lazy=True)
+			assert isinstance(agent, LazyAgent)
+		assert Worker.built == 0
+		assert factory.get_stats()["live"] == 0
+
+	async def test_first_request_materializes_once(self, factory):
+		factory.spawn_agent("worker", "worker_01", lazy=True)
+		first = await request(factory, "worker_01")
+		second = await request(factory, "worker_01")
+		assert Worker.built == 1
+		assert second["calls"] == 2
+		assert first["instance"] == second["instance"]
+		assert factory.stats["materialized"] == 1
+
+	async def test_attribute_access_materializes(self, factory):
+		agent = factory.spawn_agent("worker", "worker_01", lazy=True)
+		assert factory.get_agent("worker_01") is agent
+		assert Worker.built == 0
+		assert agent.describe() == "worker:worker_01"
+		assert Worker.built == 1
+
+	async def test_reactive_agents_stay_eager(self, factory):
+		agent = factory.spawn_agent("reactive", "reactive_01", lazy=True)
+		assert isinstance(agent, Reactive)
+		assert Worker.built == 1
+
+	async def test_default_spawn_is_eager(self, factory):
+		agent = factory.spawn_agent("worker", "worker_01")
+		assert isinstance(agent, Worker)
+
+
+class TestEviction:
+
+	async def test_idle_agent_is_evicted_and_rebuilt(self, factory):
+		proxy = factory.spawn_agent("worker", "worker_01", lazy=True)
+		first = await request(factory, "worker_01")
+
+		assert factory.evict_idle(idle_timeout=3600) == 0
+		assert factory.evict_idle(idle_timeout=0) == 1
+		assert not proxy.is_materialized
+
+		again = await request(factory, "worker_01")
+		assert again["calls"] == 1  # Fresh instance
+		assert Worker.built == 2
+		assert factory.stats == {"materialized": 2, "evicted": 1}
+
+	async def test_busy_agent_is_not_evicted(self, factory):
+		proxy = factory.spawn_agent("worker", "worker_01", lazy=True)
+		pending = asyncio.create_task(request(factory, "worker_01", delay=0.1))
+		await asyncio.sleep(0.02)
+		assert proxy.in_flight == 1
+		assert factory.evict_idle(idle_timeout=0) == 0
+		await pending
+		assert factory.evict_idle(idle_timeout=0) == 1
+
+	async def test_delegated_call_is_not_evicted(self, factory):
+		proxy = factory.spawn_agent("worker", "worker_01", lazy=True)
+		pending = asyncio.create_task(proxy.work(0.1))
+		await asyncio.sleep(0.02)
+		assert proxy.in_flight == 1
+		assert factory.evict_idle(idle_timeout=0) == 0
+		assert await pending == "worker_01"
+		assert proxy.in_flight == 0
+		assert factory.evict_idle(idle_timeout=0) == 1
+
+	async def test_sync_delegation_is_released(self, factory):
+		proxy = factory.spawn_agent("worker", "worker_01", lazy=True)
+		assert proxy.describe() == "worker:worker_01"
+		assert proxy.in_flight == 0
+		assert proxy.agent_id == "worker_01"  # Plain attributes are returned as-is
+
+	async def test_background_eviction(self, factory):
+		factory.idle_timeout = 0.02
+		proxy = factory.spawn_agent("worker", "worker_01", lazy=True)
+		await request(factory, "worker_01")
+		factory.start_idle_eviction(interval=0.01)
+		await asyncio.sleep(0.06)
+		assert not proxy.is_materialized
+		factory._evictor.cancel()
+
+
+class TestLazyDSPyModules:
+
+	def test_dvr_built_on_first_use(self):
+		from backend.core.agent_base import BaseAgent
+
+		class Agent(BaseAgent):
+			async def handle_request(self, message):
+				return None
+			async def forward(self, *args, **kwargs):
+				return None
+
+		with patch("backend.core.agent_base.DVRModule") as dvr_cls, patch("os.makedirs"):
+			agent = Agent(agent_id="lazy_01", role="coder")
+			dvr_cls.assert_not_called()
+			assert agent.dvr is agent.dvr
+			dvr_cls.assert_called_once_with("coder")
+
+	def test_supervisor_predictors_built_on_first_use(self):
+		from backend.agents.supervisor.agent import SupervisorAgent
+
+		with patch("dspy.Predict") as predict, patch("os.makedirs"):
+			supervisor = SupervisorAgent(agent_id="supervisor_lazy")
+			predict.assert_not_called()
+			router = supervisor.router
+			assert supervisor.router is router
+			assert predict.call_count == 1
+
+			supervisor.batch_router = "stub"
+			assert supervisor.batch_router == "stub"
+			assert predict.call_count == 1
+
+	def test_unaccessed_predictors_are_visible_to_dspy(self, tmp_path):
+		from backend.agents.supervisor.agent import SupervisorAgent
+
+		with patch("os.makedirs"):
+			supervisor = SupervisorAgent(agent_id="supervisor_lazy")
+			names = [name for name, _ in supervisor.named_predictors()]
+			assert {"router", "batch_router", "narrator", "dvr.decomposer.predict"} <= set(names)
+
+			path = str(tmp_path / "supervisor.json")
+			supervisor.router.demos = [{"user_goal": "water", "agent": "climate"}]
+			supervisor.save(path)
+
+			restored = SupervisorAgent(agent_id="supervisor_restored")
+			restored.load(path)
+			assert "router" in restored.__dict__
+			assert len(restored.router.demos) == 1
@@ -0,0 +1,132 @@
+"""
+TDD Test Suite: LLM Response Cache
+Tests content-addressed lookups, eviction, opt-out (including across the bus),
+the async LM path and finance metrics.
+"""
+import pytest
+from unittest.mock import patch
+import dspy
+from backend.core.llm.cache import LLMResponseCache, CachedLM
+
+
+@pytest.fixture
+def cache(tmp_path):
+	return LLMResponseCache(path=str(tmp_path / "responses.sqlite"), max_bytes=10_000)
+
+
+class TestResponseCache:
+	"""Storage-level behaviour."""
+
+	def test_round_trip(self, cache):
+		key = cache.make_key("m", None, [{"role": "user", "content": "hi"}], {"temperature": 0.0})
+		assert cache.get(key) is None
+
+		cache.put(key, "m", ["hello"])
+		assert cache.get(key) == ["hello"]
+
+	def test_key_depends_on_model_messages_and_temperature(self, cache):
+		msgs = [{"role": "user", "content": "route this"}]
+		base = cache.make_key("m", None, msgs, {"temperature": 0.0})
+
+		assert base == cache.make_key("m", None, list(msgs), {"temperature": 0.0})
+		assert base != cache.make_key("other", None, msgs, {"temperature": 0.0})
+		assert base != cache.make_key("m", None, msgs, {"temperature": 0.7})
+		assert base != cache.make_key("m", None, [{"role": "user", "content": "route that"}], {"temperature": 0.0})
+
+	def test_size_based_eviction_drops_least_recent(self, cache):
+		blob = "x" * 3000
+		for i in range(3):
+			cache.put(f"k{i}", "m", [blob])
+		cache.get("k0")  # refresh k0 so k1 is now the oldest
+		cache.put("k3", "m", [blob])
+
+		assert cache.get("k1") is None
+		assert cache.get("k0") == [blob]
+		assert cache.get("k3") == [blob]
+
+	def test_shared_between_instances(self, tmp_path):
+		path = str(tmp_path / "shared.sqlite")
+		LLMResponseCache(path=path).put("k", "m", ["from agency"])
+		assert LLMResponseCache(path=path).get("k") == ["from agency"]
+
+
+class TestCachedLM:
+	"""LM-level behaviour with the model call mocked out."""
+
+	def _lm(self, cache):
+		return CachedLM(model="openai/test-model", api_base="http://localhost:1/v1", api_key="x", response_cache=cache)
+
+	def test_second_identical_call_hits_cache(self, cache):
+		with patch.object(dspy.LM, "__call__", return_value=["answer"]) as mock_call, \
+			 patch("backend.utils.finance.finance_tracker") as mock_fin:
+			lm = self._lm(cache)
+			msgs = [{"role": "user", "content": "Route: water the tomatoes"}]
+
+			assert lm(messages=msgs) == ["answer"]
+			assert lm(messages=msgs) == ["answer"]
+
+			mock_call.assert_called_once()
+			assert cache.get_stats()["hits"] == 1
+			mock_fin.log_cache.assert_any_call(True)
+
+	def test_per_call_and_block_opt_out(self, cache):
+		with patch.object(dspy.LM, "__call__", return_value=["sample"]) as mock_call, \
+			 patch("backend.utils.finance.finance_tracker"):
+			lm = self._lm(cache)
+			msgs = [{"role": "user", "content": "Narrate the mission"}]
+
+			lm(messages=msgs, no_cache=True)
+			lm(messages=msgs, no_cache=True)
+			with cache.disabled():
+				lm(messages=msgs)
+
+			assert mock_call.call_count == 3
+			assert "no_cache" not in mock_call.call_args.kwargs
+			assert cache.get_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+	async def test_async_path_hits_cache(self, cache):
+		with patch.object(dspy.LM, "__call__", return_value=["answer"]) as mock_call, \
+			 patch("backend.utils.finance.finance_tracker"):
+			lm = self._lm(cache)
+			msgs = [{"role": "user", "content": "Route: vent the greenhouse"}]
+
+			assert await lm.acall(messages=msgs) == ["answer"]
+			assert lm(messages=msgs) == ["answer"]
+			assert await lm.acall(messages=msgs) == ["answer"]
+
+			mock_call.assert_called_once()
+			assert cache.get_stats()["hits"] == 2
+
+	async def test_request_metadata_opts_out_across_the_bus(self, cache):
+		from backend.core.bus import A2ABus
+		from backend.core.inbox import NO_CACHE_KEY
+		from backend.core.protocol import A2AMessage
+
+		lm = self._lm(cache)
+		msgs = [{"role": "user", "content": "Retry: generate the pump driver"}]
+
+		class Agent:
+			async def handle_request(self, message):
+				return await lm.acall(messages=msgs)
+
+		bus = A2ABus()
+		bus.register_agent("coder_01", Agent())
+		with patch.object(dspy.LM, "__call__", return_value=["code"]) as mock_call, \
+			 patch("backend.utils.finance.finance_tracker"):
+			await bus.send_request(A2AMessage(from_agent="orchestrator", to_agent="coder_01", content={"task": "t"}))
+			await bus.send_request(A2AMessage(from_agent="orchestrator", to_agent="coder_01", content={"task": "t"}, metadata={NO_CACHE_KEY: True}))
+
+			assert mock_call.call_count == 2
+			assert cache.get_stats()["hits"] == 0
+
+
+def test_finance_tracker_reports_cache_hit_rate():
+	from backend.utils.finance import FinancialTracker
+	tracker = FinancialTracker()
+	tracker.log_cache(True)
+	tracker.log_cache(True)
+	tracker.log_cache(False)
+
+	metrics = tracker.get_summary_metrics()
+	assert metrics["llm_cache"]["hits"] == 2
+	assert metrics["llm_cache"]["hit_rate"] == "66.7%"
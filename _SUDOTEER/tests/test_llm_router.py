@@ -0,0 +1,197 @@
+"""
+TDD Test Suite: LLM Router
+Tests weighted least-outstanding routing, failover/ejection, model-class pinning
+and re-admission after health probes.
+"""
+import time
+import threading
+import pytest
+from backend.core.llm.router import RoutingLM, LLMEndpoint, route, pin_signature, is_endpoint_error
+
+
+class FakeLM:
+	"""Stands in for a dspy.LM; records calls and optionally fails or blocks."""
+	def __init__(self, name, fail=False, delay=0.0):
+		self.name = name
+		self.fail = fail
+		self.delay = delay
+		self.calls = 0
+
+	def __call__(self, prompt=None, messages=None, **kwargs):
+		self.calls += 1
+		if self.delay: time.sleep(self.delay)
+		if self.fail: raise ConnectionError(f"{self.name} down")
+		return [self.name]
+
+
+class GenerateWidget:
+	"""Signature stand-in for pinning tests."""
+
+
+class TestLoadBalancing:
+
+	def test_idle_router_prefers_heavier_weight(self):
+		big, small = FakeLM("big"), FakeLM("small")
+		router = RoutingLM([LLMEndpoint("small", small, weight=1.0), LLMEndpoint("big", big, weight=2.0)])
+		assert router(prompt="hi") == ["big"]
+
+	def test_concurrent_calls_spread_by_outstanding_requests(self):
+		a, b = FakeLM("a", delay=0.05), FakeLM("b", delay=0.05)
+		router = RoutingLM([LLMEndpoint("a", a), LLMEndpoint("b", b)])
+
+		threads = [threading.Thread(target=router, kwargs={"prompt": "x"}) for _ in range(6)]
+		for t in threads: t.start()
+		for t in threads: t.join()
+
+		assert a.calls == 3 and b.calls == 3
+		assert all(e["outstanding"] == 0 for e in router.get_status())
+
+
+class TestFailover:
+
+	def test_failed_endpoint_is_ejected_and_call_fails_over(self):
+		bad, good = FakeLM("bad", fail=True), FakeLM("good")
+		router = RoutingLM([LLMEndpoint("bad", bad, weight=5.0), LLMEndpoint("good", good)])
+
+		assert router(prompt="hi") == ["good"]
+		status = {e["name"]: e for e in router.get_status()}
+		assert status["bad"]["healthy"] is False and status["bad"]["errors"] == 1
+
+		# Ejected endpoint is not tried again
+		router(prompt="again")
+		assert bad.calls == 1
+
+	def test_all_endpoints_failing_raises_last_error(self):
+		router = RoutingLM([LLMEndpoint("a", FakeLM("a", fail=True)), LLMEndpoint("b", FakeLM("b", fail=True))])
+		with pytest.raises(ConnectionError):
+			router(prompt="hi")
+		with pytest.raises(RuntimeError):
+			router(prompt="hi")
+
+	def test_request_errors_do_not_eject(self):
+		class BadRequest(Exception):
+			status_code = 400
+
+		calls = []
+		def lm(prompt=None, messages=None, **kwargs):
+			calls.append(1)
+			raise BadRequest("context window exceeded")
+
+		endpoint = LLMEndpoint("a", lm)
+		router = RoutingLM([endpoint, LLMEndpoint("b", FakeLM("b"), weight=0.1)])
+		with pytest.raises(BadRequest):
+			router(prompt="hi")
+		assert endpoint.healthy is True and len(calls) == 1
+
+	def test_server_errors_eject(self):
+		class ServiceUnavailable(Exception):
+			status_code = 503
+
+		assert is_endpoint_error(ServiceUnavailable())
+		assert is_endpoint_error(TimeoutError())
+		assert not is_endpoint_error(ValueError("unparsable output"))
+
+
+class TestModelClasses:
+
+	def test_route_pins_calls_to_matching_class(self):
+		general, coder = FakeLM("general"), FakeLM("coder")
+		router = RoutingLM([
+			LLMEndpoint("general", general, weight=10.0),
+			LLMEndpoint("coder", coder, model_classes=["coder"])
+		])
+		pin_signature(GenerateWidget, "coder")
+
+		with route(GenerateWidget):
+			assert router(prompt="code") == ["coder"]
+		assert router(prompt="chat") == ["general"]
+
+	def test_unserved_class_falls_back_to_any_healthy_endpoint(self):
+		router = RoutingLM([LLMEndpoint("general", FakeLM("general"))])
+		with route("reasoning"):
+			assert router(prompt="think") == ["general"]
+
+	def test_route_follows_worker_threads(self):
+		import asyncio
+		coder = FakeLM("coder")
+		router = RoutingLM([LLMEndpoint("general", FakeLM("general"), weight=10.0), LLMEndpoint("coder", coder, model_classes=["coder"])])
+
+		async def call():
+			with route("coder"):
+				return await asyncio.to_thread(router, prompt="x")
+
+		assert asyncio.run(call()) == ["coder"]
+
+
+class TestHealthChecks:
+
+	def test_probe_readmits_recovered_endpoint(self, monkeypatch):
+		lm = FakeLM("a", fail=True)
+		endpoint = LLMEndpoint("a", lm, health_url="http://127.0.0.1:1/models")
+		router = RoutingLM([endpoint, LLMEndpoint("b", FakeLM("b"))])
+		router(prompt="hi")
+		assert endpoint.healthy is False
+
+		monkeypatch.setattr(RoutingLM, "probe", staticmethod(lambda url, timeout=1.0: True))
+		router.check_health()
+		assert endpoint.healthy is True
+
+	def test_endpoint_without_health_url_returns_after_cooldown(self):
+		endpoint = LLMEndpoint("a", FakeLM("a"))
+		router = RoutingLM([endpoint], eject_cooldown=0.0)
+		router.eject(endpoint, "timeout")
+		endpoint.ejected_at -= 1
+		router.check_health()
+		assert endpoint.healthy is True
+
+	def test_check_health_reports_healthy_count(self, monkeypatch):
+		router = RoutingLM([LLMEndpoint("a", FakeLM("a"), health_url="http://a/models"), LLMEndpoint("b", FakeLM("b"), health_url="http://b/models")])
+		monkeypatch.setattr(RoutingLM, "probe", staticmethod(lambda url, timeout=1.0: url.startswith("http://a")))
+		assert router.check_health() == 1
+
+
+class TestAutoConfigure:
+
+	def test_no_healthy_backend_configures_and_recovers(self, monkeypatch):
+		from backend.core.dspy_config import DSPyConfig
+		monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+		up, configure, started = [False], [], []
+		monkeypatch.setattr(RoutingLM, "probe", staticmethod(lambda url, timeout=1.0: up[0]))
+		monkeypatch.setattr(RoutingLM, "start_health_checks", lambda self: started.append(self))
+		monkeypatch.setattr("dspy.configure", lambda **kwargs: configure.append(kwargs))
+
+		config = DSPyConfig()
+		assert config.configure("auto") is True
+		assert configure == [{"lm": config.router, "experimental": False}]
+		assert started == [config.router]  # Prober runs so a backend that comes up is re-admitted
+		assert not any(e["healthy"] for e in config.router.get_status())
+
+		up[0] = True
+		assert config.router.check_health() == len(config.router.endpoints)
+
+	def test_no_backend_configured_falls_back_to_local(self, monkeypatch):
+		from backend.core.dspy_config import DSPyConfig
+		monkeypatch.setattr(DSPyConfig, "_build_endpoints", lambda self: [])
+		monkeypatch.setattr(DSPyConfig, "_local", lambda self: "local")
+		config = DSPyConfig()
+		assert config.configure("auto") == "local"
+
+	async def test_async_init_probes_off_the_loop(self, monkeypatch):
+		import threading
+		import backend.core.dspy_config as dspy_config_module
+		from backend.core.dspy_config import DSPyConfig, initialize_dspy_async
+		monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+		loop_thread, probe_threads = threading.current_thread(), []
+
+		def probe(url, timeout=1.0):
+			probe_threads.append(threading.current_thread())
+			return True
+
+		monkeypatch.setattr(RoutingLM, "probe", staticmethod(probe))
+		monkeypatch.setattr(RoutingLM, "start_health_checks", lambda self: None)
+		monkeypatch.setattr("dspy.configure", lambda **kwargs: None)
+		monkeypatch.setattr(dspy_config_module, "dspy_config", DSPyConfig())
+
+		assert await initialize_dspy_async() is True
+		assert probe_threads and loop_thread not in probe_threads
+		assert dspy_config_module.dspy_config.lm is dspy_config_module.dspy_config.router
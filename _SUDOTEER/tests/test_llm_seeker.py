@@ -0,0 +1,138 @@
+"""
+TDD Test Suite: LLM Seeker
+Tests concurrent probing, model/latency capture and TTL caching against
+in-process fake backends.
+"""
+import time
+import asyncio
+import pytest
+from aiohttp import web
+from backend.core.llm.seeker import LLMSeekerEngine
+
+
+async def _serve(path, payload, delay=0.0, hits=None):
+	async def handler(request):
+		if hits is not None: hits.append(request.path)
+		if delay: await asyncio.sleep(delay)
+		return web.json_response(payload)
+
+	app = web.Application()
+	app.router.add_get(path, handler)
+	runner = web.AppRunner(app)
+	await runner.setup()
+	site = web.TCPSite(runner, "127.0.0.1", 0)
+	await site.start()
+	port = site._server.sockets[0].getsockname()[1]
+	return runner, port
+
+
+@pytest.fixture
+async def backends():
+	runners = []
+	hits = []
+	ollama, ollama_port = await _serve("/api/tags", {"models": [{"name": "qwen3:1.7b"}]}, delay=0.2, hits=hits)
+	studio, studio_port = await _serve("/v1/models", {"data": [{"id": "qwen3-4b"}, {"id": "coder-7b"}]}, delay=0.2, hits=hits)
+	runners += [ollama, studio]
+
+	seeker = LLMSeekerEngine(ttl=60.0)
+	seeker.standard_ports = {"Ollama": ollama_port, "LM Studio": studio_port, "VLLM": 1}
+	yield seeker, hits
+	for r in runners: await r.cleanup()
+
+
+async def test_local_scan_records_models_and_latency(backends):
+	seeker, _ = backends
+	nodes = await seeker.scan_local_host()
+
+	by_provider = {n["provider"]: n for n in nodes}
+	assert set(by_provider) == {"Ollama", "LM Studio"}
+	assert by_provider["Ollama"]["models"] == ["qwen3:1.7b"]
+	assert by_provider["LM Studio"]["models"] == ["qwen3-4b", "coder-7b"]
+	assert all(n["latency_ms"] >= 200 for n in nodes)
+	assert seeker.get_connection_string() == nodes[0]["url"]
+
+
+async def test_probes_run_concurrently(backends):
+	seeker, _ = backends
+	started = time.perf_counter()
+	await seeker.scan(["127.0.0.1", "localhost"], force=True)
+	# Four slow (0.2 s) probes plus refused ports finish in about one probe's time
+	assert time.perf_counter() - started < 0.6
+
+
+async def test_results_are_cached_for_ttl(backends):
+	seeker, hits = backends
+	first = await seeker.scan_local_host()
+	second = await seeker.scan_local_host()
+	assert second is first and len(hits) == 2
+
+	await seeker.scan_local_host(force=True)
+	assert len(hits) == 4
+
+
+async def test_network_scan_sweeps_whole_subnet(monkeypatch):
+	seeker = LLMSeekerEngine()
+	swept, probed = [], []
+	active, peak = [0], [0]
+
+	async def fake_port_open(semaphore, host, port):
+		async with semaphore:
+			active[0] += 1
+			peak[0] = max(peak[0], active[0])
+			await asyncio.sleep(0)
+			active[0] -= 1
+		swept.append((host, port))
+		return (host, port) == ("10.0.0.7", seeker.standard_ports["Ollama"])
+
+	async def fake_probe(session, semaphore, host, provider, port):
+		probed.append((host, provider))
+		return None
+
+	monkeypatch.setattr(seeker, "_port_open", fake_port_open)
+	monkeypatch.setattr(seeker, "_probe", fake_probe)
+	await seeker.scan_network(subnet="10.0.0")
+	hosts = {h for h, _ in swept}
+	assert len(hosts) == 254 and "10.0.0.1" in hosts and "10.0.0.254" in hosts
+	assert len(swept) == 254 * len(seeker.standard_ports)
+	assert peak[0] <= seeker.sweep_concurrency
+	assert probed == [("10.0.0.7", "Ollama")]  # HTTP only where the port accepted
+
+
+async def test_sweep_finds_listening_ports(backends):
+	seeker, _ = backends
+	nodes = await seeker.scan(["127.0.0.1"], force=True, sweep=True)
+	assert {n["provider"] for n in nodes} == {"Ollama", "LM Studio"}
+
+
+async def test_local_subnet_resolves_off_the_loop(monkeypatch):
+	import threading
+	import backend.core.llm.seeker as seeker_module
+	loop_thread, resolved_on = threading.current_thread(), []
+
+	def gethostbyname(name):
+		resolved_on.append(threading.current_thread())
+		return "192.168.4.20"
+
+	monkeypatch.setattr(seeker_module.socket, "gethostbyname", gethostbyname)
+	assert await LLMSeekerEngine.local_subnet() == "192.168.4"
+	assert resolved_on and loop_thread not in resolved_on
+
+
+async def test_nodes_that_stop_answering_are_dropped(monkeypatch):
+	seeker = LLMSeekerEngine()
+	seeker.standard_ports = {"Ollama": 11434, "LM Studio": 1234}
+	alive = {("127.0.0.1", 11434), ("127.0.0.1", 1234), ("10.0.0.5", 1234)}
+
+	async def fake_probe(session, semaphore, host, provider, port):
+		if (host, port) in alive:
+			return {"provider": provider, "url": f"http://{host}:{port}", "status": "active", "latency_ms": 1.0, "models": []}
+		return None
+
+	monkeypatch.setattr(seeker, "_probe", fake_probe)
+	await seeker.scan_local_host()
+	await seeker.scan(["10.0.0.5"])
+	assert len(seeker.discovered_nodes) == 3
+
+	alive.discard(("127.0.0.1", 1234))
+	await seeker.scan_local_host(force=True)
+	assert {n["url"] for n in seeker.discovered_nodes} == {"http://127.0.0.1:11434", "http://10.0.0.5:1234"}
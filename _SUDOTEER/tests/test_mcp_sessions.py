@@ -0,0 +1,207 @@
+"""
+TDD Test Suite: MCP Session Manager
+Tests persistent per-server sessions, concurrent tool calls over one session,
+cached tool discovery, restart with backoff after a server crash (including one
+that dies while idle) and fail-fast calls while a crashed server backs off.
+"""
+import time
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from backend.core.mcp_manager import MCPManager, MCPServerSession, CONNECTION_CLOSED
+
+
+class ConnectionClosed(Exception):
+	"""Shape of the SDK error raised for requests cut off by a dead server."""
+	def __init__(self):
+		super().__init__("Connection closed")
+		self.error = SimpleNamespace(code=CONNECTION_CLOSED, message="Connection closed")
+
+
+class FakeServer:
+	"""In-process MCP server stand-in; counts spawns like subprocess launches."""
+	def __init__(self, tools=("read_sensor", "control_pump"), delay=0.05, fail_spawns=0):
+		self.tools = tools
+		self.delay = delay
+		self.fail_spawns = fail_spawns
+		self.spawns = 0
+		self.list_calls = 0
+		self.active = 0
+		self.peak = 0
+		self.pings = 0
+		self.crashed = False
+
+	@asynccontextmanager
+	async def connector(self, params):
+		self.spawns += 1
+		if self.fail_spawns:
+			self.fail_spawns -= 1
+			raise OSError("server exited during initialize")
+		self.crashed = False
+		yield self
+
+	async def list_tools(self):
+		self.list_calls += 1
+		return SimpleNamespace(tools=[SimpleNamespace(name=t) for t in self.tools])
+
+	async def send_ping(self):
+		self.pings += 1
+		if self.crashed:
+			raise ConnectionClosed()
+
+	async def call_tool(self, name, arguments):
+		if self.crashed:
+			raise ConnectionClosed()
+		self.active += 1
+		self.peak = max(self.peak, self.active)
+		try:
+			await asyncio.sleep(self.delay)
+		finally:
+			self.active -= 1
+		return {"tool": name, "args": arguments}
+
+
+@pytest.fixture
+async def server():
+	return FakeServer()
+
+
+@pytest.fixture
+async def manager(server):
+	manager = MCPManager(connector=server.connector)
+	manager.registry = {"hardware": {"command": "python", "args": ["backend/mcp_server.py"]}}
+	yield manager
+	await manager.close()
+
+
+class TestPersistentSession:
+
+	async def test_one_spawn_for_many_calls(self, manager, server):
+		for i in range(10):
+			result = await manager.call_tool("hardware", "read_sensor", {"i": i})
+			assert result == {"tool": "read_sensor", "args": {"i": i}}
+		assert server.spawns == 1
+		assert manager.sessions["hardware"].stats["calls"] == 10
+
+	async def test_concurrent_calls_are_multiplexed(self, manager, server):
+		results = await asyncio.gather(*(manager.call_tool("hardware", "read_sensor", {"i": i}) for i in range(20)))
+		assert [r["args"]["i"] for r in results] == list(range(20))
+		assert server.spawns == 1
+		assert server.peak == 20  # All in flight on the one session
+
+	async def test_server_params_share_a_session(self, manager, server):
+		params = manager._params(manager.registry["hardware"])
+		await manager.call_tool(params, "read_sensor", {})
+		await manager.call_tool(params, "read_sensor", {})
+		assert server.spawns == 1
+
+	async def test_start_internal_server_warms_session(self, manager, server):
+		await manager.start_internal_server()
+		await asyncio.sleep(0.01)
+		assert manager.sessions["hardware"].is_ready
+		assert server.spawns == 1
+
+
+class TestToolCache:
+
+	async def test_list_tools_is_cached(self, manager, server):
+		first = await manager.get_all_tools()
+		second = await manager.get_all_tools()
+		assert [t.name for t in first["hardware"].tools] == ["read_sensor", "control_pump"]
+		assert second["hardware"] is first["hardware"]
+		assert server.list_calls == 1
+
+		await manager.get_all_tools(refresh=True)
+		assert server.list_calls == 2
+
+	async def test_failed_discovery_is_skipped(self, server):
+		manager = MCPManager(connector=server.connector)
+		manager.registry = {"hardware": {"command": "python", "args": []}}
+		manager.session("hardware").start_timeout = 0.05
+		server.fail_spawns = 100
+		assert await manager.get_all_tools() == {}
+		await manager.close()
+
+
+class TestRestart:
+
+	async def test_crash_restarts_with_backoff(self, server):
+		session = MCPServerSession("hw", params=None, connector=server.connector, backoff_initial=0.01)
+		assert (await session.call_tool("read_sensor"))["tool"] == "read_sensor"
+		await session.list_tools()
+
+		server.crashed = True
+		with pytest.raises(ConnectionClosed):
+			await session.call_tool("read_sensor")
+
+		# Next call waits for the restarted session; the tool cache was dropped with the old one
+		assert (await session.call_tool("read_sensor"))["tool"] == "read_sensor"
+		assert server.spawns == 2
+		assert session.stats["restarts"] == 1
+		await session.list_tools()
+		assert server.list_calls == 2
+		await session.close()
+
+	async def test_failed_starts_back_off_exponentially(self):
+		server = FakeServer(fail_spawns=3)
+		session = MCPServerSession("hw", params=None, connector=server.connector, backoff_initial=0.01, backoff_max=0.04)
+		with pytest.raises(ConnectionError, match="server exited during initialize"):
+			await session.call_tool("read_sensor")
+		await asyncio.sleep(0.15)  # 0.01 + 0.02 + 0.04 of backoff
+		assert (await session.call_tool("read_sensor"))["tool"] == "read_sensor"
+		assert server.spawns == 4
+		assert session.backoff == 0.01  # Reset after a successful start
+		await session.close()
+
+	async def test_backing_off_server_fails_fast(self):
+		server = FakeServer(fail_spawns=100)
+		session = MCPServerSession("hw", params=None, connector=server.connector, backoff_initial=10.0)
+		with pytest.raises(ConnectionError):
+			await session.call_tool("read_sensor")
+		started = time.perf_counter()
+		with pytest.raises(ConnectionError):
+			await session.call_tool("read_sensor")
+		assert time.perf_counter() - started < 0.5  # Not the 15s start_timeout
+		assert server.spawns == 1
+		await session.close()
+
+	async def test_server_dying_while_idle_is_restarted(self, server):
+		session = MCPServerSession("hw", params=None, connector=server.connector, backoff_initial=0.01, keepalive=0.01)
+		await session.call_tool("read_sensor")
+		server.crashed = True  # No call in flight to notice
+		await asyncio.sleep(0.1)
+		assert server.spawns == 2
+		assert session.stats["restarts"] == 1
+		assert session.is_ready
+		assert (await session.call_tool("read_sensor"))["tool"] == "read_sensor"
+		await session.close()
+
+	async def test_busy_session_is_not_pinged(self, server):
+		server.delay = 0.1
+		session = MCPServerSession("hw", params=None, connector=server.connector, keepalive=0.01)
+		await session.call_tool("read_sensor")
+		before = server.pings
+		await session.call_tool("read_sensor")
+		assert server.pings == before
+		await session.close()
+
+	async def test_tool_errors_do_not_restart(self, server):
+		async def bad_tool(name, arguments):
+			raise ValueError("unknown tool")
+		server.call_tool = bad_tool
+		session = MCPServerSession("hw", params=None, connector=server.connector, backoff_initial=0.01)
+		with pytest.raises(ValueError):
+			await session.call_tool("nope")
+		await asyncio.sleep(0.03)
+		assert server.spawns == 1
+		assert session.is_ready
+		await session.close()
+
+	async def test_unavailable_server_fails_fast(self):
+		server = FakeServer(fail_spawns=100)
+		manager = MCPManager(connector=server.connector)
+		manager.registry = {"hardware": {"command": "python", "args": []}}
+		manager.session("hardware").start_timeout = 0.05
+		assert await manager.call_tool("hardware", "read_sensor", {}) is None
+		await manager.close()
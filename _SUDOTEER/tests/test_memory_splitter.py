@@ -98,3 +98,183 @@ async def test_split_storage_with_facts():
 		assert "facts" in result
 		assert len(result["facts"]) == 2
 		assert result["facts"][0]["key"] == "status"
+
+def _make_splitter():
+	with patch('dspy.ChainOfThought'):
+		return MemorySplitter()
+
+def test_protocol_alpha_short_text_single_chunk():
+	"""
+	TDD: Text under the chunk size is returned untouched.
+	"""
+	splitter = _make_splitter()
+	text = "A short note.\n\nWith two paragraphs."
+
+	assert splitter.chunk_text(text, protocol="alpha") == [text]
+
+def test_protocol_alpha_respects_size_and_overlap():
+	"""
+	TDD: Chunks stay within 200 tokens and each one opens with the
+	last 20 tokens of its predecessor.
+	"""
+	splitter = _make_splitter()
+	text = " ".join(f"w{i}" for i in range(1000))
+
+	chunks = splitter.chunk_text(text, protocol="alpha")
+
+	assert len(chunks) > 1
+	assert all(len(c.split()) <= 200 for c in chunks)
+	for prev, nxt in zip(chunks, chunks[1:]):
+		assert prev.split()[-20:] == nxt.split()[:20]
+
+	# Every token is covered, in order, once the overlaps are dropped
+	rebuilt = chunks[0].split()
+	for c in chunks[1:]:
+		rebuilt.extend(c.split()[20:])
+	assert rebuilt == text.split()
+
+def test_protocol_alpha_prefers_paragraph_boundaries():
+	"""
+	TDD: Cuts land on paragraph breaks before lines, sentences or words.
+	"""
+	splitter = _make_splitter()
+	paragraph = "alpha beta gamma. " * 20  # 60 tokens
+	text = "\n\n".join([paragraph.strip()] * 10)
+
+	chunks = splitter.chunk_text(text, protocol="alpha")
+
+	# First chunk packs three whole paragraphs (180 tokens) and stops at the break
+	assert len(chunks[0].split()) == 180
+	assert chunks[0].endswith("gamma.")
+	assert all(len(c.split()) <= 200 for c in chunks)
+
+class _TopicEmbed:
+	"""Fake local model: 'pump' sentences and 'light' sentences point in different directions."""
+	def __init__(self):
+		self.calls = []
+
+	def __call__(self, sentences):
+		self.calls.append(list(sentences))
+		return [[1.0, 0.1] if "pump" in s else [0.1, 1.0] for s in sentences]
+
+def test_protocol_beta_splits_at_topic_boundary():
+	"""
+	TDD: Protocol Beta cuts where adjacent sentence similarity drops.
+	"""
+	from backend.core.memory.embedder import SentenceEmbedder
+	splitter = _make_splitter()
+	splitter.embedder = SentenceEmbedder(embed_fn=_TopicEmbed())
+
+	text = "The pump runs. The pump is primed. The pump is quiet. The light is on. The light is dim. The light fades."
+	chunks = splitter.chunk_text(text, protocol="beta")
+
+	assert chunks == [
+		"The pump runs. The pump is primed. The pump is quiet.",
+		"The light is on. The light is dim. The light fades."
+	]
+
+def test_protocol_beta_reuses_cached_sentence_embeddings():
+	"""
+	TDD: Re-chunking an edited document only embeds the new sentences.
+	"""
+	from backend.core.memory.embedder import SentenceEmbedder
+	model = _TopicEmbed()
+	splitter = _make_splitter()
+	splitter.embedder = SentenceEmbedder(embed_fn=model, batch_size=2)
+
+	splitter.chunk_text("The pump runs. The pump is primed. The light is on.", protocol="beta")
+	assert sum(len(c) for c in model.calls) == 3
+	assert len(model.calls) == 2  # batched 2 + 1
+
+	model.calls.clear()
+	splitter.chunk_text("The pump runs. The pump is primed. The light is on. The light fades.", protocol="beta")
+	assert model.calls == [["The light fades."]]
+
+def test_protocol_beta_falls_back_without_embedder():
+	"""
+	TDD: With no local model, Protocol Beta still groups sentences by size.
+	"""
+	from backend.core.memory.embedder import SentenceEmbedder
+	splitter = _make_splitter()
+	splitter.embedder = SentenceEmbedder()
+	splitter.embedder._load_failed = True
+
+	text = "Short one. Short two. Short three."
+	assert splitter.chunk_text(text, protocol="beta") == [text]
+
+@pytest.mark.asyncio
+async def test_sift_query_confident_keywords_skip_llm():
+	"""
+	TDD: Queries with clear keyword evidence are routed locally.
+	"""
+	with patch('dspy.ChainOfThought') as mock_cot:
+		mock_sifter_instance = MagicMock()
+		mock_cot.return_value = mock_sifter_instance
+
+		splitter = MemorySplitter()
+
+		assert await splitter.sift_query("Describe concepts similar to VPD") == "semantic"
+		assert await splitter.sift_query("Show the workflow and what depends on the pump") == "relational"
+		mock_sifter_instance.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_sift_query_memoizes_llm_decision():
+	"""
+	TDD: An escalated decision is reused for the same normalized query.
+	"""
+	with patch('dspy.ChainOfThought') as mock_cot:
+		mock_sifter_instance = MagicMock()
+		mock_cot.return_value = mock_sifter_instance
+		mock_response = MagicMock()
+		mock_response.strategy = "Relational Strategy"
+		mock_sifter_instance.return_value = mock_response
+
+		splitter = MemorySplitter()
+
+		assert await splitter.sift_query("How is Agent A connected to Agent B?") == "relational"
+		assert await splitter.sift_query("  how is agent a connected to agent b ") == "relational"
+		mock_sifter_instance.assert_called_once()
+
+def test_sift_router_learns_from_history():
+	"""
+	TDD: Once trained on enough past decisions, the local model answers alone.
+	"""
+	from backend.core.memory.sift_router import SiftRouter
+	router = SiftRouter(min_examples=10)
+
+	assert router.classify("Which sensors feed the irrigation controller?") is None
+
+	for i in range(10):
+		router.learn(f"which sensors feed controller {i}", "relational")
+		router.learn(f"summary of the crop notes {i}", "semantic")
+
+	assert router.classify("Which sensors feed the irrigation controller?") == "relational"
+	assert router.get_stats()["escalated"] == 20
+
+def test_protocol_beta_keeps_single_topic_whole():
+	"""
+	TDD: The boundary threshold is absolute; a one-topic document is not cut.
+	"""
+	from backend.core.memory.embedder import SentenceEmbedder
+	splitter = _make_splitter()
+	splitter.embedder = SentenceEmbedder(embed_fn=_TopicEmbed())
+
+	text = "The pump runs. The pump is primed. The pump is quiet. The pump hums."
+	assert splitter.chunk_text(text, protocol="beta") == [text]
+
+def test_embedder_latches_first_call_failure():
+	"""
+	TDD: A model that fails on its first call is not retried on every chunk.
+	"""
+	from backend.core.memory.embedder import SentenceEmbedder
+	calls = []
+
+	def broken(sentences):
+		calls.append(sentences)
+		raise RuntimeError("model download failed")
+
+	embedder = SentenceEmbedder(embed_fn=broken)
+	assert embedder.embed(["a.", "b."]) is None
+	assert embedder.embed(["c."]) is None
+	assert len(calls) == 1
+	assert embedder.available is False
@@ -0,0 +1,218 @@
+"""
+TDD Test Suite: Modbus Connection Pool
+Tests multi-PLC addressing, per-device serialization, reconnect backoff,
+simulation fallback when a device is offline and failed writes to online ones.
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from backend.core.hardware import modbus_driver as driver_module
+from backend.core.hardware.modbus_driver import ModbusDriver, PLCConnection
+
+
+class FakeResult:
+	def __init__(self, value, error=False):
+		self.registers = [value]
+		self.error = error
+
+	def isError(self):
+		return self.error
+
+
+class FakeClient:
+	"""Stands in for AsyncModbusTcpClient; one instance per device."""
+	def __init__(self, host, alive=True, delay=0.05):
+		self.host = host
+		self.alive = alive
+		self.delay = delay
+		self.active = 0
+		self.peak = 0
+		self.calls = []
+		self.reject_writes = False  # Answer writes with a Modbus exception response
+
+	async def connect(self):
+		return self.alive
+
+	def close(self):
+		pass
+
+	async def read_holding_registers(self, address, *, count=1, device_id=1, no_response_expected=False):
+		self.active += 1
+		self.peak = max(self.peak, self.active)
+		self.calls.append((address, device_id))
+		await asyncio.sleep(self.delay)
+		self.active -= 1
+		return FakeResult(2150)
+
+	async def write_register(self, address, value, *, device_id=1, no_response_expected=False):
+		self.calls.append((address, value, device_id))
+		return FakeResult(value, error=self.reject_writes)
+
+	async def write_registers(self, address, values, *, device_id=1, no_response_expected=False):
+		self.calls.append(("many", address, values, device_id))
+		return FakeResult(values[0])
+
+
+@pytest.fixture
+def plant(monkeypatch):
+	"""Two PLCs (north alive, south dead) and a PLC_MAP spread across them."""
+	clients = {}
+
+	def new_client(conn):
+		client = clients.setdefault(conn.key, FakeClient(conn.host, alive=conn.host != "10.0.0.2"))
+		return client
+
+	monkeypatch.setattr(PLCConnection, "_new_client", new_client)
+	monkeypatch.setattr(driver_module, "PLC_MAP", {
+		"N_TEMP": {"addr": 1, "type": "float", "device": "north"},
+		"N_HUM": {"addr": 2, "type": "float", "device": "north"},
+		"N2_TEMP": {"addr": 1, "type": "float", "device": "north_unit2"},
+		"S_TEMP": {"addr": 1, "type": "float", "device": "south"},
+		"N_PUMP": {"addr": 100, "type": "bool", "device": "north"}
+	})
+	sim = MagicMock()
+	sim.get_sensor_readings.return_value = {"S_TEMP": 19.0}
+	monkeypatch.setattr(driver_module, "greenhouse_sim", sim)
+
+	driver = ModbusDriver(devices={
+		"north": {"host": "10.0.0.1", "port": 502, "unit_id": 1},
+		"north_unit2": {"host": "10.0.0.1", "port": 502, "unit_id": 2},
+		"south": {"host": "10.0.0.2", "port": 502, "unit_id": 1},
+	})
+	return driver, clients
+
+
+class TestPoolAddressing:
+
+	async def test_devices_are_keyed_by_host_port_unit(self, plant):
+		driver, clients = plant
+		assert await driver.connect() is True
+
+		assert await driver.read_sensor("N2_TEMP") == 21.5
+		assert clients[("10.0.0.1", 502, 2)].calls == [(1, 2)]
+		assert set(driver.get_stats()) == {"10.0.0.1:502/1", "10.0.0.1:502/2", "10.0.0.2:502/1", "127.0.0.1:502/1"}
+
+	async def test_writes_use_the_named_device(self, plant):
+		driver, clients = plant
+		await driver.connect()
+		assert await driver.write_actuator("N_PUMP", True) is True
+		assert clients[("10.0.0.1", 502, 1)].calls == [(100, 1, 1)]
+		assert driver.get_stats()["10.0.0.1:502/1"]["writes"] == 1
+
+	async def test_unknown_device_raises(self, plant, monkeypatch):
+		driver, _ = plant
+		monkeypatch.setitem(driver_module.PLC_MAP, "X_TEMP", {"addr": 1, "type": "float", "device": "nowhere"})
+		with pytest.raises(KeyError, match="nowhere"):
+			await driver.read_sensor("X_TEMP")
+
+
+class TestWriteFailures:
+
+	async def test_exception_response_fails_the_request_not_the_link(self, plant):
+		driver, clients = plant
+		await driver.connect()
+		clients[("10.0.0.1", 502, 1)].reject_writes = True
+
+		assert await driver.write_actuator("N_PUMP", True) is False
+		conn = driver.connection("north")
+		assert conn.is_connected is True and conn.stats["errors"] == 1
+		assert await driver.read_sensor("N_TEMP") == 21.5  # Still read from the PLC
+		driver_module.greenhouse_sim.set_actuator.assert_not_called()
+
+	async def test_failed_batch_reports_false(self, plant):
+		driver, clients = plant
+		await driver.connect()
+		clients[("10.0.0.1", 502, 1)].reject_writes = True
+
+		assert await driver.write_actuators({"N_PUMP": True}) == {"N_PUMP": False}
+		driver_module.greenhouse_sim.set_actuator.assert_not_called()
+
+
+class TestScheduling:
+
+	async def test_concurrent_across_devices_serialized_per_device(self, plant):
+		driver, clients = plant
+		await driver.connect()
+
+		started = time.perf_counter()
+		await asyncio.gather(*(driver.read_sensor(k) for k in ("N_TEMP", "N_HUM", "N2_TEMP", "N2_TEMP")))
+		elapsed = time.perf_counter() - started
+
+		assert clients[("10.0.0.1", 502, 1)].peak == 1
+		assert clients[("10.0.0.1", 502, 2)].peak == 1
+		assert elapsed < 0.15  # Two devices x two serialized 50 ms reads, in parallel
+
+	async def test_dead_plc_falls_back_without_blocking_others(self, plant):
+		driver, _ = plant
+		await driver.connect()
+
+		started = time.perf_counter()
+		north, south = await asyncio.gather(driver.read_sensor("N_TEMP"), driver.read_sensor("S_TEMP"))
+		assert north == 21.5
+		assert south == 19.0  # Simulation fallback
+		assert time.perf_counter() - started < 0.1
+		assert driver.get_stats()["10.0.0.2:502/1"]["connected"] is False
+
+
+class TestReconnect:
+
+	async def test_failed_device_backs_off_exponentially(self, plant):
+		driver, clients = plant
+		await driver.connect()
+		conn = driver.connection("north")
+
+		conn.mark_failed(IOError("socket closed"))
+		first = conn.next_attempt - time.monotonic()
+		conn.mark_failed(IOError("socket closed"))
+		second = conn.next_attempt - time.monotonic()
+
+		assert second == pytest.approx(2 * first, rel=0.1)
+		assert conn.get_stats()["errors"] == 2
+
+		conn.ensure_connecting()  # Backoff not elapsed: no attempt
+		assert conn.stats["reconnects"] == 0
+
+	async def test_reconnects_in_background_after_backoff(self, plant):
+		driver, clients = plant
+		await driver.connect()
+		conn = driver.connection("north")
+		conn.mark_failed(IOError("socket closed"))
+		conn.next_attempt = 0.0
+
+		# The read during reconnection is served by the simulation, not delayed
+		await driver.read_sensor("N_TEMP")
+		await asyncio.sleep(0.01)
+
+		assert conn.stats["reconnects"] == 1
+		assert conn.is_connected is True
+		assert conn.backoff == conn.backoff_initial
+		assert await driver.read_sensor("N_TEMP") == 21.5
+
+	async def test_no_reconnects_in_pure_simulation(self, plant):
+		driver, clients = plant
+		assert await driver.read_sensor("S_TEMP") == 19.0
+		assert clients == {}
+
+
+class TestBatchedWrites:
+
+	async def test_consecutive_registers_share_one_request(self, plant, monkeypatch):
+		driver, clients = plant
+		monkeypatch.setattr(driver_module, "PLC_MAP", {
+			"N_PUMP_A": {"addr": 100, "type": "bool", "device": "north"},
+			"N_PUMP_B": {"addr": 101, "type": "bool", "device": "north"},
+			"N_VALVE": {"addr": 110, "type": "bool", "device": "north"},
+			"N2_FAN": {"addr": 100, "type": "bool", "device": "north_unit2"},
+			"S_FAN": {"addr": 100, "type": "bool", "device": "south"}
+		})
+		driver_module.greenhouse_sim.set_actuator.return_value = True
+		await driver.connect()
+
+		results = await driver.write_actuators({"N_PUMP_B": False, "N_PUMP_A": True, "N_VALVE": True, "N2_FAN": True, "S_FAN": True})
+
+		assert all(results.values())
+		assert clients[("10.0.0.1", 502, 1)].calls == [("many", 100, [1, 0], 1), (110, 1, 1)]
+		assert clients[("10.0.0.1", 502, 2)].calls == [(100, 1, 2)]
+		driver_module.greenhouse_sim.set_actuator.assert_called_once_with("S_FAN", True, source="agent")
+		assert driver.get_stats()["10.0.0.1:502/1"]["writes"] == 3
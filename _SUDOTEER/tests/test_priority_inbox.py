@@ -0,0 +1,200 @@
+"""
+TDD Test Suite: Priority-Aware Inboxes
+Tests URGENT dispatch, aging of LOW work, per-priority metrics, priority
+inheritance for nested requests and Supervisor escalation.
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from backend.core.bus import A2ABus
+from backend.core.protocol import A2AMessage, MessagePriority
+
+
+class RecordingAgent:
+	def __init__(self, delay=0.02):
+		self.delay = delay
+		self.order = []
+
+	async def handle_request(self, message):
+		self.order.append(message.content)
+		await asyncio.sleep(self.delay)
+		return message.content
+
+
+def _msg(to, content, priority=MessagePriority.NORMAL, sender="tester"):
+	return A2AMessage(from_agent=sender, to_agent=to, content=content, priority=priority)
+
+
+async def _queue_behind_busy_worker(bus, agent_id, messages):
+	"""Occupy the single worker, then queue `messages` behind it."""
+	tasks = [asyncio.create_task(bus.send_request(_msg(agent_id, "busy")))]
+	await asyncio.sleep(0.005)
+	for message in messages:
+		tasks.append(asyncio.create_task(bus.send_request(message)))
+		await asyncio.sleep(0)
+	return tasks
+
+
+class TestPriorityDispatch:
+
+	async def test_urgent_served_before_queued_work(self):
+		bus = A2ABus()
+		agent = RecordingAgent()
+		bus.register_agent("a", agent, workers=1)
+		inbox = bus.inboxes["a"]
+		inbox._idle = 1  # Pretend a worker is free so URGENT is queued, not burst
+
+		tasks = await _queue_behind_busy_worker(bus, "a", [
+			_msg("a", "low", MessagePriority.LOW),
+			_msg("a", "normal", MessagePriority.NORMAL),
+			_msg("a", "urgent", MessagePriority.URGENT)
+		])
+		inbox._idle = 0
+		await asyncio.gather(*tasks)
+
+		assert agent.order == ["busy", "urgent", "normal", "low"]
+
+	async def test_urgent_runs_immediately_when_all_workers_busy(self):
+		bus = A2ABus()
+		agent = RecordingAgent(delay=0.2)
+		bus.register_agent("a", agent, workers=1)
+
+		tasks = await _queue_behind_busy_worker(bus, "a", [_msg("a", "normal")])
+		result = await asyncio.wait_for(bus.send_request(_msg("a", "urgent", MessagePriority.URGENT)), 0.3)
+
+		assert result == "urgent"
+		assert agent.order[:2] == ["busy", "urgent"]  # Did not wait behind "normal"
+		assert bus.get_inbox_stats()["a"]["preempted"] == 1
+		await asyncio.gather(*tasks)
+
+	async def test_low_ages_ahead_of_newer_normal(self):
+		bus = A2ABus()
+		agent = RecordingAgent(delay=0.03)
+		bus.register_agent("a", agent, workers=1)
+		bus.inboxes["a"].aging_seconds = 0.01
+
+		tasks = await _queue_behind_busy_worker(bus, "a", [_msg("a", "low", MessagePriority.LOW)])
+		await asyncio.sleep(0.015)  # LOW has waited past one aging step
+		tasks.append(asyncio.create_task(bus.send_request(_msg("a", "normal"))))
+		await asyncio.gather(*tasks)
+
+		assert agent.order == ["busy", "low", "normal"]
+		assert bus.get_inbox_stats()["a"]["aged"] >= 1
+
+	async def test_depth_and_served_by_priority(self):
+		bus = A2ABus()
+		bus.register_agent("a", RecordingAgent(delay=0.05), workers=1)
+
+		tasks = await _queue_behind_busy_worker(bus, "a", [
+			_msg("a", "l1", MessagePriority.LOW),
+			_msg("a", "l2", MessagePriority.LOW),
+			_msg("a", "h", MessagePriority.HIGH)
+		])
+		stats = bus.get_inbox_stats()["a"]
+		assert stats["depth"] == 3
+		assert stats["depth_by_priority"]["low"] == 2
+		assert stats["depth_by_priority"]["high"] == 1
+
+		await asyncio.gather(*tasks)
+		served = bus.get_inbox_stats()["a"]["served_by_priority"]
+		assert served == {"urgent": 0, "high": 1, "normal": 1, "low": 2}
+
+	async def test_resize_keeps_queued_requests(self):
+		bus = A2ABus()
+		bus.register_agent("a", RecordingAgent(), workers=1)
+		tasks = await _queue_behind_busy_worker(bus, "a", [_msg("a", str(i)) for i in range(4)])
+
+		bus.set_workers("a", 3)
+		results = await asyncio.wait_for(asyncio.gather(*tasks), 1.0)
+
+		assert sorted(results) == ["0", "1", "2", "3", "busy"]
+
+
+class TestPriorityInheritance:
+
+	async def test_nested_request_inherits_higher_priority(self):
+		bus = A2ABus()
+		seen = {}
+
+		class Outer:
+			async def handle_request(self, message):
+				return await bus.send_request(_msg("inner", "nested", MessagePriority.LOW, sender="outer"))
+
+		class Inner:
+			async def handle_request(self, message):
+				seen["priority"] = message.priority
+				return "ok"
+
+		bus.register_agent("outer", Outer())
+		bus.register_agent("inner", Inner())
+
+		assert await bus.send_request(_msg("outer", "go", MessagePriority.HIGH)) == "ok"
+		assert seen["priority"] is MessagePriority.HIGH
+
+	async def test_nested_request_keeps_own_higher_priority(self):
+		bus = A2ABus()
+		seen = {}
+
+		class Outer:
+			async def handle_request(self, message):
+				return await bus.send_request(_msg("inner", "nested", MessagePriority.URGENT, sender="outer"))
+
+		class Inner:
+			async def handle_request(self, message):
+				seen["priority"] = message.priority
+				return "ok"
+
+		bus.register_agent("outer", Outer())
+		bus.register_agent("inner", Inner())
+
+		await bus.send_request(_msg("outer", "go", MessagePriority.LOW))
+		assert seen["priority"] is MessagePriority.URGENT
+
+
+class TestEscalation:
+
+	async def test_escalate_reaches_supervisor_as_urgent(self):
+		bus = A2ABus()
+		received = []
+
+		class Supervisor:
+			async def handle_request(self, message):
+				received.append(message)
+				return {"ack": True}
+
+		bus.register_agent("supervisor_01", Supervisor())
+
+		with patch('dspy.ChainOfThought'), \
+			 patch('backend.core.agent_base.DVRModule'), \
+			 patch('os.makedirs'), \
+			 patch('backend.core.bus.bus', bus):
+			from backend.core.agent_base import BaseAgent
+
+			class Worker(BaseAgent):
+				async def handle_request(self, message):
+					return None
+				async def forward(self, *args, **kwargs):
+					return None
+
+			result = await Worker("coder_01", "coder").escalate("Disk full", path="/tmp")
+
+		assert result == {"ack": True}
+		assert received[0].priority is MessagePriority.URGENT
+		assert received[0].content == {"escalation": {"reason": "Disk full", "path": "/tmp"}}
+
+	async def test_watchdog_trip_escalates(self):
+		from backend.core.hardware.safety import SafetyWatchdog
+		bus = A2ABus()
+		received = []
+
+		class Supervisor:
+			async def handle_request(self, message):
+				received.append(message)
+
+		bus.register_agent("supervisor_01", Supervisor())
+		with patch('backend.core.bus.bus', bus):
+			SafetyWatchdog().trigger_emergency_stop("Pump stuck")
+			await asyncio.sleep(0.01)
+
+		assert received[0].priority is MessagePriority.URGENT
+		assert received[0].content["escalation"]["reason"] == "Pump stuck"
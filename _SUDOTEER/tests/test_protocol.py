@@ -0,0 +1,96 @@
+"""
+TDD Test Suite: A2A Message Protocol
+Tests the slotted message type, lazy fields and the binary codec round-trip.
+"""
+import pytest
+from backend.core import protocol
+from backend.core.protocol import A2AMessage, MessageCodec, MessagePriority
+
+
+def _msg(**overrides):
+	fields = dict(
+		from_agent="coder_01", to_agent="tester_01",
+		content={"code": "print('hi')", "lines": [1, 2, 3], "ratio": 0.5},
+		message_type="request", priority=MessagePriority.HIGH,
+		requires_response=True, parent_id=7, metadata={"deadline": 123.5}
+	)
+	fields.update(overrides)
+	return A2AMessage(**fields)
+
+
+def _same(a, b):
+	assert a.to_dict() == b.to_dict()
+	assert a.created == b.created
+	assert a.priority is b.priority
+
+
+class TestMessage:
+
+	def test_ids_are_monotonic_integers(self):
+		first, second = _msg(), _msg()
+		assert isinstance(first.message_id, int)
+		assert second.message_id > first.message_id > 0
+
+	def test_slotted(self):
+		with pytest.raises(AttributeError):
+			_msg().unexpected = 1
+
+	def test_timestamp_formatted_lazily(self):
+		msg = _msg()
+		assert msg._timestamp is None
+		stamp = msg.timestamp
+		assert msg._timestamp == stamp
+		assert stamp[:4].isdigit() and "T" in stamp
+
+	def test_metadata_allocated_on_first_use(self):
+		msg = _msg(metadata=None)
+		assert msg._metadata is None
+		msg.metadata["attempt"] = 1
+		assert msg.to_dict()["metadata"] == {"attempt": 1}
+
+	def test_dict_round_trip_keeps_id_and_timestamp(self):
+		msg = _msg()
+		copy = A2AMessage.from_dict(msg.to_dict())
+		assert copy.to_dict() == msg.to_dict()
+
+
+class TestCodec:
+
+	@pytest.mark.parametrize("overrides", [
+		{},
+		{"metadata": None, "parent_id": None},
+		{"priority": MessagePriority.URGENT, "content": "plain text"},
+		{"message_type": "broadcast", "content": {"S02_TEMP": 24.5, "nested": {"a": [None, True]}}}
+	])
+	def test_json_round_trip(self, overrides):
+		msg = _msg(**overrides)
+		_same(msg, MessageCodec.decode(MessageCodec.encode(msg, use_msgpack=False)))
+
+	def test_msgpack_round_trip(self):
+		pytest.importorskip("msgpack")
+		msg = _msg()
+		frame = MessageCodec.encode(msg)
+		assert frame[1] == MessageCodec.MSGPACK
+		_same(msg, MessageCodec.decode(frame))
+
+	def test_falls_back_to_json_without_msgpack(self, monkeypatch):
+		monkeypatch.setattr(protocol, "msgpack", None)
+		frame = MessageCodec.encode(_msg())
+		assert frame[:2] == bytes((MessageCodec.SCHEMA_VERSION, MessageCodec.JSON))
+
+	def test_formatted_timestamp_survives(self):
+		msg = _msg()
+		stamp = msg.timestamp
+		assert MessageCodec.decode(MessageCodec.encode(msg, use_msgpack=False)).timestamp == stamp
+
+	def test_rejects_unknown_schema_version(self):
+		frame = bytearray(MessageCodec.encode(_msg(), use_msgpack=False))
+		frame[0] = MessageCodec.SCHEMA_VERSION + 1
+		with pytest.raises(ValueError, match="schema version"):
+			MessageCodec.decode(bytes(frame))
+
+	def test_rejects_garbage(self):
+		with pytest.raises(ValueError):
+			MessageCodec.decode(b"\x01")
+		with pytest.raises(ValueError):
+			MessageCodec.decode(bytes((MessageCodec.SCHEMA_VERSION, ord("?"))) + b"[]")
@@ -0,0 +1,127 @@
+"""
+TDD Test Suite: Safety Rule Engine
+Tests vectorized range / rate / stale rules, actuator conflicts and the
+event-driven subscription to high-frequency telemetry.
+"""
+import time
+import numpy as np
+from unittest.mock import patch
+from backend.core.bus import A2ABus
+from backend.core.hardware.safety import SafetyRuleEngine, SafetyWatchdog
+
+
+class TestRuleEngine:
+
+	def _engine(self):
+		engine = SafetyRuleEngine()
+		engine.ranges = {"T": (10.0, 40.0), "P": (4.0, 9.0)}
+		engine.rates = {"T": 2.0}
+		engine.stale = {"T": 5.0, "P": 5.0}
+		engine.compile()
+		return engine
+
+	def test_range_violation(self):
+		engine = self._engine()
+		assert engine.evaluate({"T": 25.0, "P": 6.0}, now=0.0) == []
+		assert engine.evaluate({"T": 25.0, "P": 9.5}, now=0.1) == [("P", "range", 9.5)]
+
+	def test_rate_of_change_violation(self):
+		engine = self._engine()
+		engine.evaluate({"T": 20.0}, now=0.0)
+		assert engine.evaluate({"T": 21.0}, now=1.0) == []
+		violations = engine.evaluate({"T": 25.0}, now=2.0)
+		assert violations == [("T", "rate", 4.0)]
+
+	def test_stale_channel_after_it_was_seen(self):
+		engine = self._engine()
+		engine.evaluate({"T": 20.0}, now=0.0)
+		assert engine.evaluate({"T": 20.0}, now=4.0) == []
+		assert engine.evaluate({"P": 6.0}, now=10.0) == [("T", "stale", 6.0)]
+
+	def test_missing_and_unknown_channels_are_ignored(self):
+		engine = self._engine()
+		assert engine.evaluate({"T": None, "X": 1e9, "P": "n/a"}, now=0.0) == []
+
+	def test_many_channels_within_budget(self):
+		engine = SafetyRuleEngine()
+		for i in range(500):
+			engine.ranges[f"C{i}"] = (0.0, 100.0)
+			engine.rates[f"C{i}"] = 1000.0
+		engine.compile()
+		frame = np.full(500, 50.0)
+		for n in range(200):
+			engine.evaluate_array(frame, now=n / 100)
+		assert engine.stats["mean_us"] < 1000  # Far below the 10 ms period of a 100 Hz stream
+
+
+class TestWatchdogRules:
+
+	def test_sensory_channel_names_hit_plc_ranges(self):
+		watchdog = SafetyWatchdog()
+		watchdog.check_telemetry({"temp_air": 25.0, "ph_nutrient": 6.2, "humidity_air": 60.0})
+		assert watchdog.emergency_lock is False
+		watchdog.check_telemetry({"temp_air": 25.0, "ph_nutrient": 2.5, "humidity_air": 60.0})
+		assert watchdog.emergency_lock is True
+
+	def test_sustained_temperature_runaway_trips_rate_rule(self):
+		watchdog = SafetyWatchdog()
+		now = time.time()
+		for i, temp in enumerate((22.0, 30.0, 38.0)):  # 80 C/s: failing sensor
+			watchdog.check_telemetry({"S02_TEMP": temp}, now=now + i * 0.1)
+		assert watchdog.emergency_lock is False
+		assert "S02_TEMP" in watchdog.alarms
+		watchdog.check_telemetry({"S02_TEMP": 44.0}, now=now + 0.3)
+		assert watchdog.emergency_lock is True
+
+	def test_single_glitched_sample_only_alarms(self):
+		watchdog = SafetyWatchdog()
+		now = time.time()
+		for i, temp in enumerate((22.0, 30.0, 22.0, 22.1)):  # Spike and back
+			watchdog.check_telemetry({"S02_TEMP": temp}, now=now + i * 0.1)
+		assert watchdog.emergency_lock is False
+		assert watchdog.alarms == {}  # Cleared once the channel is plausible again
+
+	def test_ph_pumps_conflict(self):
+		watchdog = SafetyWatchdog()
+		assert watchdog.validate_actuator_request("A03_PUMP_PH_UP", True) is True
+		assert watchdog.validate_actuator_request("A04_PUMP_PH_DOWN", True) is True  # PH_UP not written yet
+		watchdog.record_actuator("A03_PUMP_PH_UP", True)
+		assert watchdog.validate_actuator_request("A04_PUMP_PH_DOWN", True) is False
+		watchdog.record_actuator("A03_PUMP_PH_UP", False)
+		assert watchdog.validate_actuator_request("A04_PUMP_PH_DOWN", True) is True
+
+	def test_conflict_within_one_batch(self):
+		watchdog = SafetyWatchdog()
+		assert watchdog.validate_actuator_request("ph_down", True, pending={"ph_up": True}) is False
+
+	def test_slow_frames_are_logged(self, caplog):
+		engine = SafetyRuleEngine(budget_ms=0.0)
+		engine.ranges = {"T": (0.0, 1.0)}
+		engine.compile()
+		with caplog.at_level("WARNING", logger="_SUDOTEER"):
+			for _ in range(3):
+				engine.evaluate({"T": 0.5}, now=0.0)
+		assert engine.stats["over_budget"] == 3
+		assert len([r for r in caplog.records if "budget" in r.getMessage()]) == 2  # 1st and 2nd, next at 4th
+
+	def test_locked_watchdog_escalates_once(self):
+		watchdog = SafetyWatchdog()
+		with patch.object(watchdog, "_notify_supervisor") as notify:
+			for _ in range(5):
+				watchdog.check_telemetry({"S04_PH": 1.0})
+		assert notify.call_count == 1
+
+
+class TestEventDriven:
+
+	async def test_watchdog_checks_published_frames(self):
+		bus = A2ABus()
+		watchdog = SafetyWatchdog()
+		await watchdog.attach(bus)
+		await watchdog.attach(bus)  # Idempotent
+
+		await bus.publish("telemetry/high_freq", {"raw": {"temp_air": 24.0}, "latent": {}})
+		assert watchdog.emergency_lock is False
+		await bus.publish("telemetry/high_freq", {"raw": {"temp_air": 60.0}, "latent": {}})
+		assert watchdog.emergency_lock is True
+		assert len(bus.subscribers["telemetry/high_freq"]) == 1
@@ -0,0 +1,110 @@
+"""
+TDD Test Suite: Supervisor Delegation
+Tests batched routing with dependency hints, concurrent delegation,
+per-delegation timeouts and partial-result narration.
+"""
+import time
+import asyncio
+import pytest
+from types import SimpleNamespace
+from backend.agents.supervisor.agent import SupervisorAgent
+
+
+def _supervisor(**kwargs):
+	supervisor = SupervisorAgent(agent_id="supervisor_test", **kwargs)
+	supervisor.log_interaction = lambda *a, **k: supervisor.logged.append(a[0])
+	supervisor.logged = []
+	return supervisor
+
+
+class TestRouting:
+
+	async def test_all_subtasks_routed_in_one_call(self):
+		supervisor = _supervisor()
+		calls = []
+
+		def batch_router(subtasks, available_agents):
+			calls.append(subtasks)
+			return SimpleNamespace(agent_ids=["architect_01", "coder_01", "climate_agent"], depends_on=[[], [0], []])
+
+		supervisor.batch_router = batch_router
+		plan = await supervisor._dspy_route_tasks(["design", "implement", "check temp"])
+
+		assert len(calls) == 1
+		assert plan["architect_01"] == {"goals": ["design"]}
+		assert plan["coder_01"] == {"goals": ["implement"], "depends_on": ["architect_01"]}
+		assert "depends_on" not in plan["climate_agent"]
+
+	async def test_bad_batch_answer_falls_back_to_concurrent_routing(self):
+		supervisor = _supervisor()
+		supervisor.batch_router = lambda **kw: SimpleNamespace(agent_ids=["coder_01"], depends_on=[])
+
+		def router(subtask, available_agents):
+			time.sleep(0.1)
+			return SimpleNamespace(agent_id="nutrient_agent" if "water" in subtask else "climate_agent", reasoning="r")
+
+		supervisor.router = router
+		started = time.perf_counter()
+		plan = await supervisor._dspy_route_tasks(["water plants", "cool down", "water again"])
+
+		assert time.perf_counter() - started < 0.25
+		assert plan == {"nutrient_agent": {"goals": ["water plants", "water again"]}, "climate_agent": {"goals": ["cool down"]}}
+
+	async def test_dependency_cycles_are_dropped(self):
+		supervisor = _supervisor()
+		supervisor.batch_router = lambda **kw: SimpleNamespace(agent_ids=["a", "b", "a"], depends_on=[[], [0], [1]])
+		plan = await supervisor._dspy_route_tasks(["one", "two", "three"])
+		assert plan["b"]["depends_on"] == ["a"]
+		assert "depends_on" not in plan["a"]
+
+
+class TestDelegation:
+
+	async def test_independent_delegations_run_concurrently(self):
+		supervisor = _supervisor()
+
+		async def send(agent_id, payload, message_type="request"):
+			await asyncio.sleep(0.1)
+			return {"agent": agent_id}
+
+		supervisor.send_a2a = send
+		plan = {f"agent_{i}": {"goals": [str(i)]} for i in range(5)}
+		started = time.perf_counter()
+		results = await supervisor._execute_delegations(plan)
+
+		assert time.perf_counter() - started < 0.3
+		assert list(results) == list(plan)
+
+	async def test_dependent_delegation_waits_and_receives_upstream(self):
+		supervisor = _supervisor()
+		order, payloads = [], {}
+
+		async def send(agent_id, payload, message_type="request"):
+			payloads[agent_id] = payload
+			await asyncio.sleep(0.05)
+			order.append(agent_id)
+			return {"done": agent_id}
+
+		supervisor.send_a2a = send
+		await supervisor._execute_delegations({
+			"architect_01": {"goals": ["design"]},
+			"coder_01": {"goals": ["build"], "depends_on": ["architect_01"]}
+		})
+
+		assert order == ["architect_01", "coder_01"]
+		assert payloads["coder_01"]["upstream"] == {"architect_01": {"done": "architect_01"}}
+		assert "depends_on" not in payloads["coder_01"]
+
+	async def test_slow_agent_times_out_and_partial_results_are_narrated(self):
+		supervisor = _supervisor(delegation_timeout=0.3, partial_after=0.1)
+
+		async def send(agent_id, payload, message_type="request"):
+			await asyncio.sleep(1.0 if agent_id == "slow" else 0.01)
+			return "ok"
+
+		supervisor.send_a2a = send
+		results = await supervisor._execute_delegations({"fast": {"goals": ["a"]}, "slow": {"goals": ["b"]}})
+
+		assert results["fast"] == "ok"
+		assert results["slow"]["status"] == "timeout"
+		assert any("Still waiting on slow" in line for line in supervisor.logged)
@@ -0,0 +1,104 @@
+"""
+TDD Test Suite: Telemetry Fast Lane
+Tests per-topic recording policies and aggregated audit capture of
+high-rate telemetry on the A2A bus.
+"""
+import pytest
+from unittest.mock import patch, AsyncMock
+from backend.core.bus import A2ABus
+from backend.core.protocol import A2AMessage
+from backend.core.topics import TelemetryAggregator, TopicPolicy
+
+
+def _frame(temp, ph=6.0):
+	return {"raw": {"temp_air": temp, "ph_nutrient": ph, "lux": [1000, 2000]}, "latent": {"vpd": 1.1}, "mode": "simulation"}
+
+
+class TestTelemetryAggregator:
+
+	def test_min_max_mean_over_window(self):
+		agg = TelemetryAggregator("telemetry/x", window_s=1.0)
+		for i, temp in enumerate([20.0, 22.0, 24.0]):
+			agg.add(_frame(temp), now=100.0 + i * 0.1)
+
+		summary = agg.flush(now=100.3)
+		assert summary["frames"] == 3
+		assert summary["fields"]["raw.temp_air"] == {"min": 20.0, "max": 24.0, "mean": 22.0, "n": 3}
+		assert summary["fields"]["raw.lux"]["max"] == 2000  # Latest sample of a buffer
+		assert "mode" not in summary["fields"]
+
+	def test_due_and_reset(self):
+		agg = TelemetryAggregator("telemetry/x", window_s=1.0)
+		agg.add(_frame(20.0), now=10.0)
+		assert not agg.due(now=10.5)
+		assert agg.due(now=11.0)
+		agg.flush(now=11.0)
+		assert agg.flush() is None
+
+	def test_rejects_unknown_mode(self):
+		with pytest.raises(ValueError):
+			TopicPolicy("verbose")
+
+
+class TestPublishPolicies:
+
+	async def test_telemetry_is_summarised_not_recorded_per_frame(self):
+		bus = A2ABus()
+		received = []
+		await bus.subscribe("telemetry/high_freq", AsyncMock(side_effect=received.append))
+		clock = iter([100.0 + i * 0.1 for i in range(25)])
+
+		with patch("backend.core.bus.recorder") as recorder, \
+			 patch("backend.core.bus.time.time", side_effect=lambda: next(clock)):
+			for i in range(25):
+				await bus.publish("telemetry/high_freq", _frame(20.0 + i))
+
+		assert len(received) == 25
+		assert received[0] == _frame(20.0)  # Delivered raw, not wrapped
+		events = recorder.record_event.call_args_list
+		assert len(events) == 2  # Two full one-second windows of 10 Hz frames
+		assert events[0].kwargs["event_type"] == "telemetry_summary"
+		assert events[0].kwargs["metadata"]["frames"] == 11
+		assert events[0].kwargs["content"]["raw.temp_air"]["min"] == 20.0
+
+	async def test_flush_records_partial_window(self):
+		bus = A2ABus()
+		await bus.subscribe("telemetry/industrial", AsyncMock())
+		with patch("backend.core.bus.recorder") as recorder:
+			await bus.publish("telemetry/industrial", _frame(21.0))
+			assert recorder.record_event.call_count == 0
+			bus.flush_telemetry()
+		assert recorder.record_event.call_args.kwargs["metadata"]["frames"] == 1
+
+	async def test_other_topics_record_every_frame(self):
+		bus = A2ABus()
+		callback = AsyncMock()
+		await bus.subscribe("alerts", callback)
+		with patch("backend.core.bus.recorder") as recorder:
+			await bus.publish("alerts", {"level": "warn"})
+			await bus.publish("alerts", A2AMessage(from_agent="climate_01", to_agent="topic:alerts", content="fan stuck"))
+
+		assert recorder.record_event.call_count == 2
+		assert recorder.record_event.call_args.kwargs["agent_id"] == "climate_01"
+
+	async def test_sampled_and_off_policies(self):
+		bus = A2ABus()
+		bus.set_topic_policy("telemetry/industrial", "sampled", sample_every=5)
+		bus.set_topic_policy("telemetry/debug/", "off")
+		for topic in ("telemetry/industrial", "telemetry/debug/raw"):
+			await bus.subscribe(topic, AsyncMock())
+
+		with patch("backend.core.bus.recorder") as recorder:
+			for i in range(12):
+				await bus.publish("telemetry/industrial", _frame(i))
+				await bus.publish("telemetry/debug/raw", _frame(i))
+
+		assert recorder.record_event.call_count == 3  # Frames 0, 5 and 10
+		assert all(c.kwargs["metadata"]["topic"] == "telemetry/industrial" for c in recorder.record_event.call_args_list)
+
+	async def test_exact_topic_overrides_prefix(self):
+		bus = A2ABus()
+		bus.set_topic_policy("telemetry/audit", "full")
+		assert bus.topic_policy("telemetry/audit").recording == "full"
+		assert bus.topic_policy("telemetry/high_freq").recording == "summary"
+		assert bus.topic_policy("agents/status").recording == "full"
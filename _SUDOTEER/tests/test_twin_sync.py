@@ -0,0 +1,93 @@
+"""
+TDD Test Suite: Twin Sync Engine
+Tests the in-memory expectation table, incremental drift detection with
+hysteresis, and change-only graph writes.
+"""
+import pytest
+from unittest.mock import patch, AsyncMock
+from backend.core.bus import A2ABus
+
+
+@pytest.fixture
+def twin():
+	with patch("backend.core.twin_sync.memory_manager") as memory, \
+		 patch("backend.core.twin_sync.ui_bridge") as ui:
+		memory.remember = AsyncMock()
+		memory.recall = AsyncMock()
+		from backend.core.twin_sync import TwinSyncEngine
+		engine = TwinSyncEngine()
+		engine.memory, engine.ui = memory, ui
+		yield engine
+
+
+def _events(twin, kind):
+	return [c.args[2] for c in twin.ui.broadcast.call_args_list if c.args[0] == kind]
+
+
+class TestExpectations:
+
+	async def test_graph_written_only_on_change(self, twin):
+		twin.set_expectation("S02_TEMP", 24.0)
+		twin.set_expectation("S02_TEMP", 24.0)
+		twin.set_expectation("temp_air", 24.0)  # Alias of the same channel
+		twin.set_expectation("S02_TEMP", 26.0)
+
+		assert twin.stats["graph_writes"] == 2
+		assert list(twin.expectations) == ["S02_TEMP"]
+
+	def test_set_without_event_loop(self, twin):
+		twin.set_expectation("S02_TEMP", 24.0)  # Sync caller: no loop to schedule the graph write on
+		assert twin.expectations["S02_TEMP"].value == 24.0
+		assert twin.stats["graph_writes"] == 0
+		twin.memory.remember.assert_not_called()
+
+	async def test_per_key_tolerances(self, twin):
+		twin.set_expectation("S04_PH", 6.0)
+		twin.set_expectation("lights", True)
+		twin.set_expectation("co2", 800, tolerance=50)
+
+		assert twin.expectations["S04_PH"].tolerance == 0.3
+		twin.observe({"S04_PH": 6.2, "lights": True, "co2": 840})
+		assert _events(twin, "TWIN_DRIFT_ALERT") == []
+		twin.observe({"S04_PH": 6.4, "lights": False, "co2": 860})
+		assert {e["key"] for e in _events(twin, "TWIN_DRIFT_ALERT")} == {"S04_PH", "lights", "co2"}
+
+	async def test_no_memory_round_trip_on_check(self, twin):
+		twin.set_expectation("S02_TEMP", 24.0)
+		twin.observe({"temp_air": 30.0})
+		assert "S02_TEMP" in await twin.perform_sync_check()
+		twin.memory.recall.assert_not_called()
+
+
+class TestDriftHysteresis:
+
+	async def test_alert_once_then_resolve_below_band(self, twin):
+		twin.set_expectation("S02_TEMP", 24.0)  # tolerance 1.0, hysteresis 0.25
+
+		for temp in (24.5, 25.2, 25.5, 24.9, 24.8):
+			twin.observe({"temp_air": temp})
+		assert len(_events(twin, "TWIN_DRIFT_ALERT")) == 1
+		assert _events(twin, "TWIN_DRIFT_RESOLVED") == []  # 0.8/0.9 is inside the band
+
+		twin.observe({"temp_air": 24.7})
+		assert len(_events(twin, "TWIN_DRIFT_RESOLVED")) == 1
+		assert await twin.perform_sync_check() == {}
+
+	async def test_new_expectation_matching_reality_clears_drift(self, twin):
+		twin.set_expectation("S02_TEMP", 24.0)
+		twin.observe({"S02_TEMP": 28.0})
+		twin.set_expectation("S02_TEMP", 28.0)
+		assert twin.expectations["S02_TEMP"].drifting is False
+
+
+class TestEventDriven:
+
+	async def test_drift_evaluated_as_frames_are_published(self, twin):
+		bus = A2ABus()
+		with patch("backend.core.twin_sync.bus", bus):
+			await twin.start()
+			twin.set_expectation("S02_TEMP", 24.0)
+			await bus.publish("telemetry/high_freq", {"raw": {"temp_air": 27.0}, "latent": {}})
+
+		assert _events(twin, "TWIN_DRIFT_ALERT")[0]["physical"] == 27.0
+		assert twin.stats["frames"] == 1
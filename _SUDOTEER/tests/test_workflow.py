@@ -0,0 +1,246 @@
+"""
+TDD Test Suite: Workflow DAG Executor
+Tests fan-out, joins, bounded parallelism, branch namespaces, conditions and retry loops.
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import patch
+from backend.core.workflow import WorkflowOrchestrator, WorkflowDefinition, WorkflowNode
+
+
+@pytest.fixture(autouse=True)
+def quiet_ui():
+	with patch('backend.core.workflow.ui_bridge') as mock_ui:
+		yield mock_ui
+
+
+def _writer(key, value, delay=0.0, log=None):
+	async def step(state):
+		if log is not None: log.append(("start", key))
+		await asyncio.sleep(delay)
+		state["data"][key] = value
+		if log is not None: log.append(("end", key))
+		return state
+	return step
+
+
+def _run(nodes, entry, **kwargs):
+	orch = WorkflowOrchestrator(**kwargs)
+	orch.register_workflow(WorkflowDefinition("wf", "test", nodes, entry))
+	return orch.execute_workflow("wf", {"goal": "g"})
+
+
+class TestDagExecution:
+
+	async def test_linear_chain_still_runs_in_order(self):
+		log = []
+		state = await _run([
+			WorkflowNode("a", "x", _writer("a", 1, log=log), ["b"]),
+			WorkflowNode("b", "x", _writer("b", 2, log=log), [])
+		], "a")
+		assert state["status"] == "completed"
+		assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+		assert state["data"] == {"goal": "g", "a": 1, "b": 2}
+
+	async def test_fan_out_runs_branches_in_parallel_and_join_waits(self):
+		seen = {}
+
+		async def join(state):
+			seen.update(state["data"])
+			return state
+
+		started = time.perf_counter()
+		state = await _run([
+			WorkflowNode("tester", "t", _writer("tests", "ok"), ["docs", "review"]),
+			WorkflowNode("docs", "d", _writer("docs", "md", delay=0.1), ["final"]),
+			WorkflowNode("review", "v", _writer("review", "lgtm", delay=0.1), ["final"]),
+			WorkflowNode("final", "v", join, [])
+		], "tester")
+
+		assert time.perf_counter() - started < 0.18
+		assert seen["docs"] == "md" and seen["review"] == "lgtm"
+		assert state["branches"]["docs"] == {"docs": "md"}
+		assert state["branches"]["review"] == {"review": "lgtm"}
+		assert set(state["timings"]) == {"tester", "docs", "review", "final"}
+
+	async def test_parallelism_is_bounded(self):
+		active, peak = [0], [0]
+
+		def counting(key):
+			async def step(state):
+				active[0] += 1
+				peak[0] = max(peak[0], active[0])
+				await asyncio.sleep(0.02)
+				active[0] -= 1
+				state["data"][key] = True
+				return state
+			return step
+
+		branches = [f"b{i}" for i in range(6)]
+		nodes = [WorkflowNode("root", "x", _writer("root", 1), branches)]
+		nodes += [WorkflowNode(b, "x", counting(b), []) for b in branches]
+		state = await _run(nodes, "root", max_parallel=2)
+
+		assert peak[0] == 2
+		assert all(state["data"][b] for b in branches)
+
+	async def test_condition_skips_untaken_branch_but_join_still_runs(self):
+		state = await _run([
+			WorkflowNode("check", "x", _writer("ok", True), ["fix", "ship"], condition=lambda s: "ship"),
+			WorkflowNode("fix", "x", _writer("fixed", True), ["done"]),
+			WorkflowNode("ship", "x", _writer("shipped", True), ["done"]),
+			WorkflowNode("done", "x", _writer("done", True), [])
+		], "check")
+		assert state["status"] == "completed"
+		assert "fixed" not in state["data"]
+		assert state["data"]["shipped"] and state["data"]["done"]
+
+	async def test_retry_loop_reruns_nodes(self):
+		attempts = []
+
+		async def code(state):
+			assert state["attempt"] == len(attempts)  # Retries know they are retries
+			attempts.append(1)
+			state["data"]["attempt"] = len(attempts)
+			return state
+
+		state = await _run([
+			WorkflowNode("coder", "c", code, ["tester"]),
+			WorkflowNode("tester", "t", _writer("tested", True), ["coder", "end"],
+				condition=lambda s: "coder" if s["data"]["attempt"] < 3 else "end"),
+			WorkflowNode("end", "x", _writer("end", True), [])
+		], "coder")
+		assert len(attempts) == 3
+		assert state["data"]["end"] is True
+
+	async def test_node_failure_marks_workflow_failed(self):
+		async def boom(state):
+			raise RuntimeError("agent crashed")
+
+		state = await _run([WorkflowNode("a", "x", boom, [])], "a")
+		assert state["status"] == "failed"
+		assert "agent crashed" in state["errors"]
+
+	async def test_missing_node_fails_workflow(self):
+		state = await _run([WorkflowNode("a", "x", _writer("a", 1), ["ghost"])], "a")
+		assert state["status"] == "failed"
+		assert "Node ghost not found" in state["errors"]
+
+
+class TestCheckpoints:
+
+	def _chain(self, calls, fail_tester=False, cacheable=False):
+		def step(name, key):
+			async def run(state):
+				calls.append(name)
+				if name == "tester" and fail_tester:
+					raise RuntimeError("process died")
+				state["data"][key] = f"{name}:{state['data'].get('goal')}"
+				return state
+			return run
+
+		return [
+			WorkflowNode("coder", "c", step("coder", "code"), ["tester"], cacheable=cacheable),
+			WorkflowNode("tester", "t", step("tester", "tests"), [], cacheable=cacheable)
+		]
+
+	async def test_resume_skips_completed_nodes(self, tmp_path):
+		from backend.core.checkpoints import WorkflowCheckpointStore
+		store = WorkflowCheckpointStore(str(tmp_path / "cp.sqlite"))
+		calls = []
+
+		orch = WorkflowOrchestrator(store=store)
+		orch.register_workflow(WorkflowDefinition("chain", "t", self._chain(calls, fail_tester=True), "coder"))
+		crashed = await orch.execute_workflow("chain", {"goal": "g"})
+		assert crashed["status"] == "failed"
+		assert store.list_incomplete()[0]["workflow_id"] == crashed["workflow_id"]
+
+		# "Restarted" process: fresh orchestrator, same store
+		calls.clear()
+		orch = WorkflowOrchestrator(store=WorkflowCheckpointStore(store.path))
+		orch.register_workflow(WorkflowDefinition("chain", "t", self._chain(calls), "coder"))
+		resumed = await orch.resume_workflow(crashed["workflow_id"])
+
+		assert calls == ["tester"]
+		assert resumed["status"] == "completed"
+		assert resumed["data"]["code"] == "coder:g" and resumed["data"]["tests"] == "tester:g"
+		assert resumed["timings"]["coder"]["source"] == "checkpoint"
+		assert store.list_incomplete() == []
+
+	async def test_cacheable_nodes_reuse_outputs_for_identical_inputs(self, tmp_path):
+		from backend.core.checkpoints import WorkflowCheckpointStore
+		store = WorkflowCheckpointStore(str(tmp_path / "cp.sqlite"))
+		calls = []
+		orch = WorkflowOrchestrator(store=store)
+		orch.register_workflow(WorkflowDefinition("chain", "t", self._chain(calls, cacheable=True), "coder"))
+
+		await orch.execute_workflow("chain", {"goal": "g"})
+		again = await orch.execute_workflow("chain", {"goal": "g"})
+		assert calls == ["coder", "tester"]
+		assert again["data"]["tests"] == "tester:g"
+		assert again["timings"]["tester"]["source"] == "cache"
+
+		await orch.execute_workflow("chain", {"goal": "other"})
+		assert calls == ["coder", "tester", "coder", "tester"]
+
+	async def test_non_cacheable_nodes_always_run(self, tmp_path):
+		from backend.core.checkpoints import WorkflowCheckpointStore
+		calls = []
+		orch = WorkflowOrchestrator(store=WorkflowCheckpointStore(str(tmp_path / "cp.sqlite")))
+		orch.register_workflow(WorkflowDefinition("chain", "t", self._chain(calls), "coder"))
+
+		await orch.execute_workflow("chain", {"goal": "g"})
+		await orch.execute_workflow("chain", {"goal": "g"})
+		assert calls == ["coder", "tester", "coder", "tester"]
+
+	async def test_failed_or_empty_outputs_are_not_cached(self, tmp_path):
+		from backend.core.checkpoints import WorkflowCheckpointStore
+		calls = []
+
+		def step(name, payload):
+			async def run(state):
+				calls.append(name)
+				if payload is not None:
+					state["data"][name] = payload
+				return state
+			return run
+
+		orch = WorkflowOrchestrator(store=WorkflowCheckpointStore(str(tmp_path / "cp.sqlite")))
+		orch.register_workflow(WorkflowDefinition("chain", "t", [
+			WorkflowNode("noop", "x", step("noop", None), ["review"], cacheable=True),
+			WorkflowNode("review", "x", step("review", {"status": "needs_review"}), ["audit"], cacheable=True),
+			WorkflowNode("audit", "x", step("audit", {"is_valid": False, "status": "flagged"}), ["docs"], cacheable=True),
+			WorkflowNode("docs", "x", step("docs", {"status": "completed"}), [], cacheable=True)
+		], "noop"))
+
+		await orch.execute_workflow("chain", {"goal": "g"})
+		again = await orch.execute_workflow("chain", {"goal": "g"})
+		assert calls == ["noop", "review", "audit", "docs", "noop", "review", "audit"]
+		assert again["timings"]["docs"]["source"] == "cache"
+
+	async def test_cache_key_covers_declared_inputs_only(self, tmp_path):
+		from backend.core.checkpoints import WorkflowCheckpointStore
+		calls = []
+
+		async def review(state):
+			calls.append(state["data"]["code"])
+			state["data"]["review"] = "lgtm"
+			return state
+
+		orch = WorkflowOrchestrator(store=WorkflowCheckpointStore(str(tmp_path / "cp.sqlite")))
+		orch.register_workflow(WorkflowDefinition("chain", "t", [
+			WorkflowNode("review", "v", review, [], cacheable=True, inputs=["code"])
+		], "review"))
+
+		await orch.execute_workflow("chain", {"code": "x = 1", "docs": "first"})
+		again = await orch.execute_workflow("chain", {"code": "x = 1", "docs": "rewritten"})
+		await orch.execute_workflow("chain", {"code": "x = 2", "docs": "first"})
+		assert calls == ["x = 1", "x = 2"]
+		assert again["timings"]["review"]["source"] == "cache"
+
+	async def test_resume_unknown_workflow_raises(self, tmp_path):
+		from backend.core.checkpoints import WorkflowCheckpointStore
+		orch = WorkflowOrchestrator(store=WorkflowCheckpointStore(str(tmp_path / "cp.sqlite")))
+		with pytest.raises(ValueError):
+			await orch.resume_workflow("missing")